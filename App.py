@@ -1,15 +1,39 @@
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-
-df = pd.read_csv("nekretnine_ns_final.csv")
-
-# Primer 1: Histogram cena po kvadratu
-plt.figure(figsize=(10, 6))
-sns.histplot(df['Cena_po_m2'], bins=30, kde=True)
-plt.title("Distribucija cena kvadrata u Novom Sadu")
-plt.show()
-
-# Primer 2: Koja lokacija je najskuplja?
-top_lokacije = df.groupby('Deo_Grada')['Cena_po_m2'].mean().sort_values(ascending=False).head(10)
-print(top_lokacije)
\ No newline at end of file
+import matplotlib.pyplot as plt
+
+from agregati import KORAK_HISTOGRAMA, azuriraj_kocku, histogram, sazmi
+
+
+def nacrtaj_histogram(ax, h):
+    """Histogram cena po kvadratu iz kocke (samo opseg gde ima oglasa)."""
+    h = h[(h.index >= h[h > 0].index.min()) & (h.index <= h[h > 0].index.max())]
+    ax.bar(h.index, h.values, width=KORAK_HISTOGRAMA, align='edge', edgecolor='white')
+    ax.set_title("Distribucija cena kvadrata u Novom Sadu")
+
+
+def top_lokacije(kocka, n=10):
+    return sazmi(kocka)['Prosek_Cena_po_m2'].sort_values(ascending=False).head(n)
+
+
+def nacrtaj_top_lokacije(ax, top):
+    """Najskuplji delovi grada po prosečnoj ceni kvadrata."""
+    top = top.sort_values()
+    ax.barh(top.index.astype(str), top.values, color='indianred')
+    ax.set_xlabel("Prosečna cena po m² (EUR)")
+    ax.set_title("Najskuplje lokacije")
+
+
+def main():
+    # Kocka agregata (agregati.py): preračunavaju se samo novi datumi, ostalo se čita iz male tabele
+    kocka = azuriraj_kocku()
+
+    # Primer 1: Histogram cena po kvadratu
+    fig, ax = plt.subplots(figsize=(10, 6))
+    nacrtaj_histogram(ax, histogram(kocka))
+    plt.show()
+
+    # Primer 2: Koja lokacija je najskuplja?
+    print(top_lokacije(kocka))
+
+
+if __name__ == "__main__":
+    main()
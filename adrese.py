@@ -0,0 +1,151 @@
+import re
+
+import pandas as pd
+
+from geokoderi import normalizuj_naziv
+
+# --- KONFIGURACIJA ---
+GRAD = "Novi Sad"
+
+# Nivoi preciznosti koordinata, od najfinijeg ka najgrubljem
+PRECIZNOST_ULICA = "ulica"
+PRECIZNOST_DEO_GRADA = "deo_grada"
+PRECIZNOST_GRAD = "grad"
+
+# "ul. Narodnog fronta 12", "Ulica Maksima Gorkog 5a", "Bulevar Evrope 25", "Bul. oslobođenja 76"
+RE_ULICA = re.compile(
+    r'\b(?P<tip>ul\.|ulica|ulici|bul\.|bulevar|bulevaru)\s+'
+    r'(?P<naziv>[A-Za-zČĆŽŠĐčćžšđ.]+(?:\s+[A-Za-zČĆŽŠĐčćžšđ.]+){0,3})'
+    r'(?:\s+(?P<broj>\d{1,3}[a-zA-Z]?))?\b',
+    re.IGNORECASE,
+)
+RE_BR = re.compile(r'\bbr\.?\s*(?=\d)', re.IGNORECASE)  # "br. 12" -> "12"
+# Reči posle kojih naziv ulice sigurno ne ide dalje ("ul. Gogoljeva u centru" -> "Gogoljeva")
+STOP_RECI = {'u', 'na', 'kod', 'sa', 'i', 'od', 'do', 'blizu', 'pored', 'stan', 'prodaja', 'prodajem', 'novi'}
+# Struktuirani naslovi agencija: "Stan,NOVI SAD,BULEVAR EVROPE,kv: 54.00, € 144200, ID: 1003610"
+RE_STRUKTUIRAN_NASLOV = re.compile(r'^[^,]+,\s*NOVI SAD,\s*(?P<mesto>[^,]+),\s*kv:', re.IGNORECASE)
+
+
+def je_ceo_grad(naziv):
+    # Deo grada može da nedostaje (NaN posle ciscenje.normalizuj_delove_grada za praznu lokaciju)
+    if not isinstance(naziv, str):
+        return False
+    return normalizuj_naziv(naziv) in ("novi sad", "novi sad srbija", "ns")
+
+
+def izvuci_ulicu(tekst):
+    """Vraća npr. 'Bulevar Evrope 25' ili 'Narodnog fronta' iz slobodnog teksta, ili None."""
+    if not isinstance(tekst, str):
+        return None
+    m = RE_ULICA.search(RE_BR.sub('', tekst))
+    if not m:
+        return None
+    reci = []
+    for rec in m.group('naziv').split():
+        if rec.lower() in STOP_RECI:
+            break
+        reci.append(rec)
+    if not reci:
+        return None
+    naziv = ' '.join(reci).strip(' .').title()
+    if m.group('tip').lower().startswith('bul'):
+        naziv = f"Bulevar {naziv}"
+    return f"{naziv} {m.group('broj')}" if m.group('broj') else naziv
+
+
+def napravi_obrasce(gazetir):
+    """
+    Regex za svaki naziv iz gazetira koji toleriše padežne nastavke
+    ("detelinara" -> "na Detelinari", "lipov gaj" -> "kod Lipovog Gaja").
+    """
+    obrasci = []
+    for kljuc, naziv in gazetir.kanonski.items():
+        if je_ceo_grad(kljuc) or len(kljuc) < 3:
+            continue
+        reci = [rec[:-1] + r'\w{0,3}' if len(rec) >= 5 else rec + r'\w{0,2}' for rec in kljuc.split(' ')]
+        obrasci.append((re.compile(r'\b' + ' '.join(reci) + r'\b'), naziv, len(kljuc)))
+    # Duži nazivi prvi, da "Liman 4" ima prednost nad "Liman"
+    return sorted(obrasci, key=lambda o: -o[2])
+
+
+def izvuci_deo_grada(naslov, gazetir, obrasci):
+    """Najprecizniji deo grada pomenut u naslovu (npr. 'CENTAR NS', 'na Detelinari'), ili None."""
+    if not isinstance(naslov, str):
+        return None
+
+    m = RE_STRUKTUIRAN_NASLOV.match(naslov)
+    if m:
+        naziv = gazetir.pronadji_naziv(m.group('mesto'))
+        if naziv:
+            return naziv
+
+    tekst = normalizuj_naziv(naslov)
+    for obrazac, naziv, _ in obrasci:
+        if obrazac.search(tekst):
+            return naziv
+    return None
+
+
+def dodaj_nagovestaje(df, gazetir, detalji=None):
+    """
+    Dodaje kolone 'Ulica' i 'Deo_Grada_Nagovestaj' izvučene iz naslova
+    (i iz stranice oglasa, ako je prosleđen rečnik `detalji` {Link: tekst}).
+    """
+    izvori = df['Naslov']
+    if detalji:
+        izvori = izvori.fillna('') + ' ' + df['Link'].map(detalji).fillna('')
+
+    df['Ulica'] = izvori.map(izvuci_ulicu)
+    obrasci = napravi_obrasce(gazetir)
+    df['Deo_Grada_Nagovestaj'] = df['Naslov'].map(lambda naslov: izvuci_deo_grada(naslov, gazetir, obrasci))
+    return df
+
+
+def tekst_stranice_oglasa(html):
+    """Naslov i opis (h1 + meta description) sa stranice oglasa, tu se najčešće pominje ulica."""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer(['h1', 'meta']))
+    delovi = [h1.get_text(' ', strip=True) for h1 in soup.find_all('h1')]
+    opis = soup.find('meta', attrs={'name': 'description'})
+    if opis and opis.get('content'):
+        delovi.append(opis['content'])
+    return ' '.join(delovi)
+
+
+def adrese_oglasa(df):
+    """
+    Dve adrese za pretragu po oglasu: ulica (ako je nađena) i deo grada.
+    Deo grada iz naslova ima prednost kad je oglas na sajtu označen kao ceo "Novi Sad" ili nema deo grada,
+    ili kad dolazi iz struktuiranog naslova agencije (npr. 'Bulevar' -> 'Bulevar Evrope').
+    """
+    adresa_ulice = df['Ulica'].where(df['Ulica'].isna(), df['Ulica'] + ', ' + GRAD + ', Srbija')
+    pouzdan = (df['Deo_Grada'].isna() | df['Deo_Grada'].map(je_ceo_grad).fillna(False).astype(bool)
+               | df['Naslov'].str.match(RE_STRUKTUIRAN_NASLOV, na=False))
+    deo = df['Deo_Grada_Nagovestaj'].astype('string').where(
+        df['Deo_Grada_Nagovestaj'].notna() & pouzdan, df['Deo_Grada'].astype('string'))
+    return adresa_ulice, deo + ', ' + GRAD + ', Srbija'
+
+
+def izaberi_lokaciju(df, koordinate_ulica, koordinate_delova):
+    """
+    Za svaki oglas bira najprecizniju dostupnu lokaciju: ulica > deo grada > grad.
+    Oba rečnika su {adresa: (lat, lon)}; popunjava Puna_Adresa, Latitude, Longitude, Preciznost_Lokacije.
+    """
+    adresa_ulice, adresa_dela = adrese_oglasa(df)
+
+    ulice = pd.DataFrame.from_dict(koordinate_ulica, orient='index', columns=['lat', 'lon'])
+    delovi = pd.DataFrame.from_dict(koordinate_delova, orient='index', columns=['lat', 'lon'])
+    lat_ulica = adresa_ulice.map(ulice['lat']) if len(ulice) else pd.Series(float('nan'), index=df.index)
+    lon_ulica = adresa_ulice.map(ulice['lon']) if len(ulice) else pd.Series(float('nan'), index=df.index)
+    ima_ulicu = lat_ulica.notna()
+
+    df['Puna_Adresa'] = adresa_ulice.where(ima_ulicu, adresa_dela)
+    df['Latitude'] = lat_ulica.where(ima_ulicu, adresa_dela.map(delovi['lat']))
+    df['Longitude'] = lon_ulica.where(ima_ulicu, adresa_dela.map(delovi['lon']))
+
+    df['Preciznost_Lokacije'] = PRECIZNOST_DEO_GRADA
+    df.loc[adresa_dela.str.split(',').str[0].map(je_ceo_grad), 'Preciznost_Lokacije'] = PRECIZNOST_GRAD
+    df.loc[ima_ulicu, 'Preciznost_Lokacije'] = PRECIZNOST_ULICA
+    df.loc[df['Latitude'].isna(), 'Preciznost_Lokacije'] = None
+    return df
@@ -0,0 +1,252 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import metrike
+from ciscenje import maska_validnih, normalizuj_delove_grada
+from dataset_io import KOLONA_PARTICIJE, citaj_delove, sacuvaj_dataset, ucitaj_dataset
+
+# --- KONFIGURACIJA ---
+ULAZNI_DATASET = "nekretnine_ns_final"
+KOCKA_DATASET = "nekretnine_ns_agregati"  # Mala tabela: deo grada x datum x veličina
+KOLONE = ['Deo_Grada', 'Cena_EUR', 'Kvadratura_m2', 'Cena_po_m2', KOLONA_PARTICIJE]
+BEZ_DATUMA = "nepoznat"  # Stari CSV-ovi nemaju datum skrapinga
+
+# Kategorije veličine stana (m²)
+GRANICE_VELICINE = [0, 35, 50, 65, 80, 100, np.inf]
+VELICINE = ["<35", "35-50", "50-65", "65-80", "80-100", "100+"]
+
+# Histogram cene po m² sa fiksnim korpama: dve ćelije se spajaju prostim sabiranjem,
+# pa se medijana i kvantili mogu izračunati za bilo koji zbir ćelija bez sirovih podataka
+KORAK_HISTOGRAMA = 100  # EUR/m²
+MAX_HISTOGRAMA = 8000  # Sve skuplje ide u poslednju korpu
+KORPE = np.arange(0, MAX_HISTOGRAMA + KORAK_HISTOGRAMA, KORAK_HISTOGRAMA)
+KOLONE_HISTOGRAMA = [f"h_{donja}" for donja in KORPE]
+
+KLJUC = ['Deo_Grada', KOLONA_PARTICIJE, 'Velicina']
+
+
+def _datumi(df):
+    if KOLONA_PARTICIJE not in df.columns:
+        return pd.Series(BEZ_DATUMA, index=df.index, dtype='string')
+    return df[KOLONA_PARTICIJE].astype('string').fillna(BEZ_DATUMA)
+
+
+def _validni(df):
+    """
+    Oglasi koji ulaze u kocku: cena i kvadratura u mogućem opsegu (ciscenje.py).
+    Odstupanja po delu grada se ne izbacuju: zavise od svih datuma, a kocka se preračunava po datumu.
+    """
+    return maska_validnih(df)
+
+
+def izracunaj_kocku(df):
+    """Agregati po (deo grada, datum, veličina): broj, zbirovi, min/max i histogram cene po m²."""
+    df = df[_validni(df)].reset_index(drop=True)
+    cena_m2 = df['Cena_EUR'] / df['Kvadratura_m2']
+    if 'Cena_po_m2' in df.columns:
+        cena_m2 = df['Cena_po_m2'].fillna(cena_m2)
+
+    osnova = pd.DataFrame({
+        'Deo_Grada': normalizuj_delove_grada(df['Deo_Grada']).astype('string').fillna('Nepoznato'),
+        KOLONA_PARTICIJE: _datumi(df),
+        'Velicina': pd.cut(df['Kvadratura_m2'], GRANICE_VELICINE, labels=VELICINE, right=False).astype('string'),
+        'Cena_EUR': df['Cena_EUR'].astype(float),
+        'Kvadratura_m2': df['Kvadratura_m2'].astype(float),
+        'Cena_po_m2': cena_m2.astype(float),
+    })
+    grupe = osnova.groupby(KLJUC, observed=True, sort=True)
+    kocka = grupe.agg(
+        Broj=('Cena_po_m2', 'size'),
+        Suma_Cena_EUR=('Cena_EUR', 'sum'),
+        Suma_Kvadratura_m2=('Kvadratura_m2', 'sum'),
+        Suma_Cena_po_m2=('Cena_po_m2', 'sum'),
+        Min_Cena_po_m2=('Cena_po_m2', 'min'),
+        Max_Cena_po_m2=('Cena_po_m2', 'max'),
+    )
+
+    korpa = np.minimum(osnova['Cena_po_m2'].to_numpy() // KORAK_HISTOGRAMA, len(KORPE) - 1).astype(int)
+    histogram = pd.crosstab([osnova[k] for k in KLJUC], korpa)
+    histogram = histogram.reindex(columns=range(len(KORPE)), fill_value=0)
+    histogram.columns = KOLONE_HISTOGRAMA
+    return kocka.join(histogram).reset_index()
+
+
+def spoji_kocke(kocke):
+    """
+    Kocke delova izvora -> jedna kocka: ista ćelija iz više delova se sabira (min/max se uzima),
+    pa je rezultat isti kao izracunaj_kocku nad svim oglasima odjednom.
+    """
+    kocke = [k for k in kocke if len(k)]
+    if not kocke:
+        return izracunaj_kocku(pd.DataFrame(columns=KOLONE))
+    if len(kocke) == 1:
+        return kocke[0]
+    zbirne = {k: 'sum' for k in ['Broj', 'Suma_Cena_EUR', 'Suma_Kvadratura_m2', 'Suma_Cena_po_m2'] + KOLONE_HISTOGRAMA}
+    return (pd.concat(kocke, ignore_index=True).groupby(KLJUC, sort=True)
+            .agg({**zbirne, 'Min_Cena_po_m2': 'min', 'Max_Cena_po_m2': 'max'})
+            [kocke[0].columns.drop(KLJUC)].reset_index())
+
+
+def kvantil_iz_histograma(histogram, q):
+    """Kvantil q (0-1) za svaki red matrice histograma, linearnom interpolacijom unutar korpe."""
+    histogram = np.asarray(histogram, dtype=float)
+    ukupno = histogram.sum(axis=1)
+    kumulativ = histogram.cumsum(axis=1)
+    cilj = q * ukupno
+    korpa = (kumulativ < cilj[:, None]).sum(axis=1).clip(max=histogram.shape[1] - 1)
+    pre = np.take_along_axis(kumulativ, korpa[:, None], axis=1)[:, 0] - histogram[np.arange(len(korpa)), korpa]
+    u_korpi = histogram[np.arange(len(korpa)), korpa]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        udeo = np.where(u_korpi > 0, (cilj - pre) / u_korpi, 0.0)
+    vrednost = (korpa + np.clip(udeo, 0, 1)) * KORAK_HISTOGRAMA
+    return np.where(ukupno > 0, vrednost, np.nan)
+
+
+def sazmi(kocka, po=('Deo_Grada',), kvantili=(0.25, 0.5, 0.75)):
+    """
+    Spaja ćelije kocke po kolonama `po` (npr. samo deo grada, ili deo grada i datum).
+    Vraća broj oglasa, prosečnu cenu, prosečnu cenu po m², min/max i kvantile (iz histograma).
+    """
+    po = list(po)
+    zbir = kocka.groupby(po, observed=True).agg(
+        {'Broj': 'sum', 'Suma_Cena_EUR': 'sum', 'Suma_Kvadratura_m2': 'sum', 'Suma_Cena_po_m2': 'sum',
+         'Min_Cena_po_m2': 'min', 'Max_Cena_po_m2': 'max', **{k: 'sum' for k in KOLONE_HISTOGRAMA}})
+
+    rezultat = pd.DataFrame(index=zbir.index)
+    rezultat['Broj'] = zbir['Broj']
+    rezultat['Prosek_Cena_EUR'] = zbir['Suma_Cena_EUR'] / zbir['Broj']
+    rezultat['Prosek_Cena_po_m2'] = zbir['Suma_Cena_po_m2'] / zbir['Broj']
+    # Ukupna cena / ukupna kvadratura: prosek tržišta, manje osetljiv na male stanove
+    rezultat['Cena_po_m2_Ponderisano'] = zbir['Suma_Cena_EUR'] / zbir['Suma_Kvadratura_m2']
+    for q in kvantili:
+        ime = 'Medijana_Cena_po_m2' if q == 0.5 else f"P{round(q * 100)}_Cena_po_m2"
+        # Korpa je široka KORAK_HISTOGRAMA, stvarni min/max su tačni pa njima ograničavamo procenu
+        rezultat[ime] = np.clip(kvantil_iz_histograma(zbir[KOLONE_HISTOGRAMA], q),
+                                zbir['Min_Cena_po_m2'], zbir['Max_Cena_po_m2'])
+    rezultat['Min_Cena_po_m2'] = zbir['Min_Cena_po_m2']
+    rezultat['Max_Cena_po_m2'] = zbir['Max_Cena_po_m2']
+    return rezultat
+
+
+def histogram(kocka):
+    """Zbirni histogram cene po m² (Series: donja granica korpe -> broj oglasa) za ceo grad."""
+    return pd.Series(kocka[KOLONE_HISTOGRAMA].sum().to_numpy(), index=KORPE)
+
+
+def ucitaj_kocku(ime=KOCKA_DATASET, filteri=None):
+    return ucitaj_dataset(ime, filteri=filteri)
+
+
+def _hash_redova(df):
+    """64-bitni hash sadržaja oglasa (datum, link i kolone koje ulaze u kocku), nezavisno od tipova kolona."""
+    kolone = {KOLONA_PARTICIJE: _datumi(df)}
+    for kolona in ['Link', 'Deo_Grada']:
+        if kolona in df.columns:
+            kolone[kolona] = df[kolona].astype('string')
+    for kolona in ['Cena_EUR', 'Kvadratura_m2', 'Cena_po_m2']:
+        if kolona in df.columns:
+            kolone[kolona] = df[kolona].astype(float)
+    return pd.util.hash_pandas_object(pd.DataFrame(kolone), index=False).to_numpy()
+
+
+def potpisi_izvora(izvor=ULAZNI_DATASET):
+    """
+    Oglasi koji ulaze u kocku i potpis svakog datuma. Isti oglas (Link) dopisan više puta istog dana
+    (npr. inkrementalni skraping posle promene cene) broji se jednom, poslednja verzija.
+    Vraća (hash-evi zadržanih oglasa po datumu, potpis datuma = XOR tih hash-eva); menja se sa svakom
+    promenom cene ili kvadrature, ne samo sa brojem oglasa. Čita se deo po deo, 8 bajtova po hash-u.
+    """
+    datumi, linkovi, hashevi, validni = [], [], [], []
+    for deo in citaj_delove(izvor, kolone=KOLONE + ['Link']):
+        datumi.append(_datumi(deo))
+        # Bez kolone Link (stari CSV-ovi) svaki red je poseban oglas
+        link = deo['Link'] if 'Link' in deo.columns else pd.Series(np.arange(len(deo)) + sum(map(len, hashevi)))
+        linkovi.append(pd.util.hash_pandas_object(link, index=False).to_numpy())
+        hashevi.append(_hash_redova(deo))
+        validni.append(_validni(deo).to_numpy())
+    if not hashevi:
+        return pd.Series(dtype='uint64'), pd.Series(dtype='int64')
+
+    oglasi = pd.DataFrame({'datum': pd.concat(datumi, ignore_index=True).astype('object'),
+                           'link': np.concatenate(linkovi), 'hash': np.concatenate(hashevi)})
+    zadrzani = ~oglasi.duplicated(['datum', 'link'], keep='last').to_numpy() & np.concatenate(validni)
+    oglasi = oglasi[zadrzani]
+    potpisi = oglasi.groupby('datum')['hash'].agg(np.bitwise_xor.reduce)
+    return oglasi.set_index('datum')['hash'], potpisi.astype('uint64').astype('int64')
+
+
+def azuriraj_kocku(izvor=ULAZNI_DATASET, ime=KOCKA_DATASET, iznova=False):
+    """
+    Preračunava samo datume čiji se sadržaj u izvoru promenio (npr. dopisani današnji oglasi
+    ili nova cena), ostatak kocke ostaje kakav jeste. Vraća ažuriranu kocku.
+    """
+    hashevi, potpisi = potpisi_izvora(izvor)
+
+    stara = None
+    if not iznova:
+        try:
+            stara = ucitaj_kocku(ime)
+        except FileNotFoundError:
+            pass
+    if stara is not None and 'Potpis_Datuma' not in stara.columns:
+        stara = None  # Kocka iz vremena kad se poredio samo broj oglasa
+
+    if stara is None:
+        zastareli = set(potpisi.index)
+    else:
+        stara[KOLONA_PARTICIJE] = _datumi(stara).astype('object')
+        stari_potpisi = stara.groupby(KOLONA_PARTICIJE)['Potpis_Datuma'].first()
+        datumi = potpisi.index.union(stari_potpisi.index)
+        zastareli = set(datumi[potpisi.reindex(datumi).ne(stari_potpisi.reindex(datumi)).to_numpy()])
+
+    if not zastareli:
+        print("Kocka je ažurna.")
+        return stara
+
+    # Kocka je zbir kocki delova, pa se izvor čita deo po deo i u memoriji je samo jedan deo.
+    # Iz izvora se uzimaju tačno oglasi zadržani u potpisi_izvora (poslednja verzija, svaki jednom)
+    trazeni = pd.Index(pd.unique(hashevi[hashevi.index.isin(zastareli)].to_numpy()))
+    uzeti = np.zeros(len(trazeni), dtype=bool)
+    filteri = None if BEZ_DATUMA in zastareli else [(KOLONA_PARTICIJE, 'in', sorted(zastareli))]
+    kocke, oglasa = [], 0
+    for novi in citaj_delove(izvor, kolone=KOLONE + ['Link'], filteri=filteri):
+        pozicije = trazeni.get_indexer(_hash_redova(novi))
+        uzmi = (pozicije >= 0) & ~pd.Series(pozicije).duplicated().to_numpy()
+        uzmi[uzmi] = ~uzeti[pozicije[uzmi]]
+        uzeti[pozicije[uzmi]] = True
+        novi = novi[uzmi]
+        kocke.append(izracunaj_kocku(novi))
+        oglasa += len(novi)
+    print(f"Preračunato {len(zastareli)} datum(a) iz {oglasa} oglasa.")
+
+    kocka = spoji_kocke(kocke)
+    kocka['Potpis_Datuma'] = kocka[KOLONA_PARTICIJE].map(potpisi).astype('int64')
+    if stara is not None:
+        kocka = pd.concat([stara[~stara[KOLONA_PARTICIJE].isin(zastareli)], kocka], ignore_index=True)
+    # Tabela je mala, pa se uvek piše cela; skupo je samo čitanje izvora, a ono je ograničeno na nove datume
+    sacuvaj_dataset(kocka, ime, rezim="zameni")
+    # Ponovno čitanje male tabele: isti tipovi kolona kao kad je kocka ažurna
+    return ucitaj_kocku(ime)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agregati cena po delu grada, datumu i veličini stana")
+    parser.add_argument("--iznova", action="store_true", help="Preračunaj celu kocku iz izvora")
+    parser.add_argument("--po", nargs="+", default=['Deo_Grada'], choices=KLJUC,
+                        help="Po kojim kolonama se prikazuje sažetak")
+    args = parser.parse_args()
+
+    try:
+        kocka = azuriraj_kocku(iznova=args.iznova)
+    except FileNotFoundError:
+        print(f"Nema dataset-a {ULAZNI_DATASET}! Prvo pokreni scraper.py.")
+        return
+    print(f"Kocka ima {len(kocka)} ćelija.\n")
+    print(sazmi(kocka, args.po).sort_values('Prosek_Cena_po_m2', ascending=False).round(0).to_string())
+
+
+if __name__ == "__main__":
+    with metrike.faza("agregati"):
+        main()
@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# zstd je brži i bolje pakuje; ako nije instaliran, koristimo gzip
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# --- KONFIGURACIJA ---
+ARHIVA_FOLDER = "arhiva"
+
+
+class ArhivaStranica:
+    """
+    Arhiva sirovih stranica: sadržaj se čuva kompresovan i adresiran svojim SHA-256 hešom
+    (ista stranica se čuva samo jednom), a indeks beleži svako preuzimanje (URL, vreme, heš, ETag...).
+    U `replay` režimu arhiva zamenjuje mrežu.
+    """
+
+    def __init__(self, folder=ARHIVA_FOLDER, replay=False):
+        self.folder = folder
+        self.replay = replay
+        os.makedirs(os.path.join(folder, "objekti"), exist_ok=True)
+        # Više niti za preuzimanje deli istu konekciju, pa upise serijalizujemo
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(folder, "indeks.db"), check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS preuzimanja (
+                url TEXT NOT NULL,
+                vreme TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_url ON preuzimanja (url, vreme)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.conn.close()
+
+    def _putanja(self, sha, ekstenzija):
+        return os.path.join(self.folder, "objekti", sha[:2], f"{sha}.html.{ekstenzija}")
+
+    def _upisi_objekat(self, sha, sadrzaj):
+        for ekstenzija in ("zst", "gz"):
+            if os.path.exists(self._putanja(sha, ekstenzija)):
+                return
+
+        if zstandard is not None:
+            putanja = self._putanja(sha, "zst")
+            podaci = zstandard.ZstdCompressor(level=10).compress(sadrzaj)
+        else:
+            putanja = self._putanja(sha, "gz")
+            podaci = gzip.compress(sadrzaj, compresslevel=6)
+
+        os.makedirs(os.path.dirname(putanja), exist_ok=True)
+        # Upis preko privremenog fajla, da prekid ne ostavi polovičan objekat
+        privremeni = f"{putanja}.{threading.get_ident()}.tmp"
+        with open(privremeni, "wb") as f:
+            f.write(podaci)
+        os.replace(privremeni, putanja)
+
+    def ucitaj_objekat(self, sha):
+        putanja = self._putanja(sha, "zst")
+        if os.path.exists(putanja):
+            if zstandard is None:
+                raise RuntimeError(f"Objekat {sha} je zstd, a paket 'zstandard' nije instaliran.")
+            with open(putanja, "rb") as f:
+                return zstandard.ZstdDecompressor().decompress(f.read()).decode("utf-8")
+        with gzip.open(self._putanja(sha, "gz"), "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def sacuvaj(self, url, html, etag=None, last_modified=None):
+        sadrzaj = html.encode("utf-8")
+        sha = hashlib.sha256(sadrzaj).hexdigest()
+        self._upisi_objekat(sha, sadrzaj)
+        self.zabelezi(url, sha, etag, last_modified)
+        return sha
+
+    def zabelezi(self, url, sha, etag=None, last_modified=None):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT INTO preuzimanja VALUES (?, ?, ?, ?, ?)",
+                              (url, datetime.now().isoformat(timespec="seconds"), sha, etag, last_modified))
+
+    def poslednje(self, url):
+        """Poslednje preuzimanje URL-a kao (sha256, etag, last_modified) ili None."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT sha256, etag, last_modified FROM preuzimanja WHERE url = ? ORDER BY vreme DESC, rowid DESC",
+                (url,)).fetchone()
+
+    def uslovna_zaglavlja(self, url):
+        """If-None-Match / If-Modified-Since za poslednju arhiviranu verziju, ako ih je sajt poslao."""
+        red = self.poslednje(url)
+        zaglavlja = {}
+        if red:
+            if red[1]:
+                zaglavlja["If-None-Match"] = red[1]
+            if red[2]:
+                zaglavlja["If-Modified-Since"] = red[2]
+        return zaglavlja
+
+    def ucitaj(self, url):
+        red = self.poslednje(url)
+        return self.ucitaj_objekat(red[0]) if red else None
+
+    def urls(self, prefiks=""):
+        """Svi arhivirani URL-ovi sa datim prefiksom, redom kojim su prvi put preuzeti."""
+        with self._lock:
+            redovi = self.conn.execute(
+                "SELECT url FROM preuzimanja WHERE substr(url, 1, ?) = ? GROUP BY url ORDER BY MIN(rowid)",
+                (len(prefiks), prefiks)).fetchall()
+        return [r[0] for r in redovi]
@@ -0,0 +1,107 @@
+import argparse
+import copy
+
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error
+
+import ml_model
+from ml_model import napravi_X_y, podeli, ucitaj_podatke
+from model_artefakt import MODELI_FOLDER, poznati_linkovi, sacuvaj_artefakt, ucitaj_artefakt
+
+# --- KONFIGURACIJA ---
+PRAG_DRIFTA = 1.5  # Pun refit ako je MAE na novim oglasima veći od PRAG_DRIFTA x MAE sa treninga
+PRAG_NEPOZNATIH = 0.2  # ... ili ako je više od 20% novih oglasa iz delova grada koje koder ne zna
+MIN_NOVIH_STABALA = 10
+MAX_STABALA = 500  # Posle ovoga šuma postaje spora za predviđanje, bolje je sve istrenirati iznova
+MIN_ZA_PROVERU = 20  # Sa manje novih oglasa ne odvajamo deo za proveru, sva nova stabla uče na svima
+
+
+def broj_novih_stabala(model, broj_novih, broj_poznatih):
+    """Stabala srazmerno novim podacima, da trošak ažuriranja zavisi od broja novih oglasa, a ne od istorije."""
+    udeo = broj_novih / max(broj_poznatih, 1)
+    return max(MIN_NOVIH_STABALA, round(model.n_estimators * udeo))
+
+
+def proveri_drift(model, meta, X_novi, y_novi):
+    """Ocenjuje trenutni model na novim (neviđenim) oglasima; vraća (mae, razlog za pun refit ili None)."""
+    mae = mean_absolute_error(y_novi, model.predict(X_novi))
+    mae_trening = meta['metrike']['mae']
+    if mae > PRAG_DRIFTA * mae_trening:
+        return mae, f"MAE na novim oglasima {mae:,.0f} EUR > {PRAG_DRIFTA} x {mae_trening:,.0f} EUR"
+
+    vokabular = set(meta.get('vokabular_delova', []))
+    nepoznati = (~X_novi['Deo_Grada'].astype(str).isin(vokabular)).mean()
+    if nepoznati > PRAG_NEPOZNATIH:
+        return mae, f"{nepoznati:.0%} novih oglasa je iz delova grada kojih nije bilo u treningu"
+    return mae, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dopunjava sačuvani model stablima istreniranim na novim oglasima")
+    parser.add_argument("--bez-refita", action="store_true", help="Kad drift traži pun refit, samo prijavi")
+    args = parser.parse_args()
+
+    df = ucitaj_podatke()
+    if df is None:
+        return
+    model, _, meta = ucitaj_artefakt()
+    poznati = poznati_linkovi()
+
+    novi = df[~df['Link'].isin(poznati)]
+    if novi.empty:
+        print("Nema novih oglasa od poslednjeg treninga, model je ažuran.")
+        return
+    print(f"Novih oglasa: {novi['Link'].nunique()} (model '{meta['verzija']}' je video {len(poznati)}).")
+
+    X_novi, y_novi = napravi_X_y(novi)
+    mae_pre, razlog = proveri_drift(model, meta, X_novi, y_novi)
+    print(f"MAE trenutnog modela na novim oglasima: {mae_pre:,.0f} EUR")
+
+    suma = model['model']
+    if razlog is None and not isinstance(suma, RandomForestRegressor):
+        razlog = f"{type(suma).__name__} se ne dopunjuje stablima"
+    dodatnih = broj_novih_stabala(suma, len(novi), len(df) - len(novi))
+    if razlog is None and suma.n_estimators + dodatnih > MAX_STABALA:
+        razlog = f"šuma bi imala više od {MAX_STABALA} stabala"
+
+    if razlog is not None:
+        print(f"Potreban je pun refit: {razlog}.")
+        if not args.bez_refita:
+            ml_model.main()
+        return
+
+    # Deo novih oglasa se ne koristi za nova stabla, da se model pre i posle poredi na neviđenim oglasima
+    if len(novi) >= MIN_ZA_PROVERU:
+        X_uci, X_provera, y_uci, y_provera = podeli(X_novi, y_novi)
+    else:
+        X_uci, y_uci, X_provera = X_novi, y_novi, None
+        print(f"Manje od {MIN_ZA_PROVERU} novih oglasa, preskačem proveru posle dopune.")
+
+    # Koder ostaje isti (vokabular sa treninga); nova stabla uče samo na novim oglasima
+    mae_pre = None if X_provera is None else mean_absolute_error(y_provera, model.predict(X_provera))
+    model = copy.deepcopy(model)  # Keširan artefakt je memorijski mapiran, ne menjamo ga u mestu
+    suma = model['model']
+    suma.set_params(warm_start=True, n_estimators=suma.n_estimators + dodatnih)
+    suma.fit(model['koder'].transform(X_uci), y_uci)
+    suma.set_params(warm_start=False)
+    print(f"Dodato {dodatnih} stabala (ukupno {suma.n_estimators}).")
+
+    mae_posle = None if X_provera is None else mean_absolute_error(y_provera, model.predict(X_provera))
+    if mae_posle is not None:
+        print(f"MAE na {len(X_provera)} izdvojenih novih oglasa: {mae_pre:,.0f} EUR pre, {mae_posle:,.0f} EUR posle.")
+    # mae/r2 su i dalje sa poslednjeg punog treninga (metrike_od), pa im je osnova proveri_drift;
+    # broj_redova ostaje njegov, da vizualizacija zna da test set tog treninga više nije isti
+    metrike = {'mae': meta['metrike']['mae'], 'r2': meta['metrike']['r2'],
+               'mae_novi_pre': mae_pre, 'mae_novi_posle': mae_posle,
+               'broj_za_proveru': 0 if X_provera is None else len(X_provera)}
+    dodatno = {k: v for k, v in meta.items()
+               if k in ('broj_redova', 'broj_za_trening', 'konfiguracija', 'parametri')}
+    verzija = sacuvaj_artefakt(model, metrike,
+                               meta={**dodatno, 'azurirano_od': meta['verzija'], 'broj_novih': novi['Link'].nunique(),
+                                     'metrike_od': meta.get('metrike_od', meta['verzija'])},
+                               linkovi=poznati | set(novi['Link']))
+    print(f"Model sačuvan kao verzija {verzija} (folder '{MODELI_FOLDER}').")
+
+
+if __name__ == "__main__":
+    main()
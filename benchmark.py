@@ -0,0 +1,581 @@
+import argparse
+import html
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.metadata import PackageNotFoundError, version
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+import parseri
+from ciscenje import GEO_KOLONE, ocisti, ocisti_oglase
+from dataset_io import postavi_tipove, sacuvaj_dataset
+from geokoderi import GAZETIR_FAJL, Geokoder, normalizuj_naziv
+
+# --- KONFIGURACIJA ---
+REZULTATI_FAJL = "benchmark_rezultati.jsonl"  # Jedan JSON red po benchmark-u i veličini, sa commit-om
+SEME = 42  # Isti podaci pri svakom pokretanju, pa su rezultati uporedivi između commit-ova
+VELICINE = [1000, 10000]  # Broj redova sintetičkog dataset-a (čišćenje, geokodiranje, trening, mapa); do 1_000_000
+OGLASA_PO_STRANICI = 20  # Kao na sajtu (i u debug_page.html)
+STRANICA_ZA_PARSIRANJE = 20
+PONAVLJANJA_PARSIRANJA = 5
+STRANICA_ZA_SKRAPOVANJE = 50
+PARALELNO_SKRAPOVANJE = 4
+PORT_SERVERA = 8765  # Za --server; benchmark sam bira slobodan port
+KASNJENJE_GEOKODERA = 0.001  # s po upitu lažnom geokoderu (Nominatim je ~1 s, ovde merimo samo naš kod)
+UDEO_NENADJENIH = 0.1  # Toliko ulica lažni geokoder "ne nađe"
+UDEO_SA_ULICOM = 0.3  # Deo sintetičkih naslova koji pominje ulicu
+# Prljavi redovi u sintetičkom dataset-u, da čišćenje ima šta da izbaci i normalizuje kao na pravim podacima
+UDEO_NEVALIDNIH = 0.02  # Bez cene, cena po m² umesto cene, nemoguća kvadratura ili koordinate van grada
+UDEO_ODSTUPANJA = 0.01  # Cena više puta veća ili manja od uobičajene za deo grada (IQR ih izbacuje)
+UDEO_DRUGIH_NAZIVA = 0.05  # Deo grada napisan drugačije: velika/mala slova, dupli razmaci, bez dijakritika
+STABALA = 100  # Isto kao ml_model.py
+PRAG_REGRESIJE = 0.10  # --uporedi označava pogoršanje veće od 10%
+BENCHMARKI = ['parsiranje', 'skrapovanje', 'ciscenje', 'geokodiranje', 'trening', 'mapa']
+FOLDER_SKRIPTI = os.path.dirname(os.path.abspath(__file__))
+FIKSTURA = os.path.join(FOLDER_SKRIPTI, parseri.FIKSTURA)  # Pravi primer stranice, osnova za šablon
+
+ULICE = ["Narodnog fronta", "Maksima Gorkog", "Cara Dušana", "Janka Čmelika", "Kisačka", "Temerinska",
+         "Šafarikova", "Gogoljeva", "Vojvode Bojovića", "Jovana Subotića", "Braće Ribnikar", "Fruškogorska"]
+BULEVARI = ["oslobođenja", "Evrope", "cara Lazara", "kralja Petra I", "Jaše Tomića", "patrijarha Pavla"]
+
+
+# --- GENERATORI ---
+
+@lru_cache(maxsize=1)
+def gazetir():
+    """Delovi grada iz gazetira sa centroidima; redosled je i redosled popularnosti."""
+    return pd.read_csv(GAZETIR_FAJL, usecols=['Deo_Grada', 'Latitude', 'Longitude'])
+
+
+@lru_cache(maxsize=1)
+def sablon_stranice(putanja=FIKSTURA):
+    """
+    Deli sačuvanu stranicu na (zaglavlje, šablon jednog oglasa, podnožje).
+    U šablonu su vrednosti prvog oglasa zamenjene oznakama @@NASLOV@@, @@HREF@@ itd,
+    pa sintetički oglas ima isti (teški) markup kao pravi: tracking skripte, slike, klase.
+    """
+    with open(putanja, encoding='utf-8') as f:
+        stranica = f.read()
+    pocetak_oglasa = '<div class="row offer">'
+    delovi = stranica.split(pocetak_oglasa)
+    zaglavlje, oglas, poslednji = delovi[0], delovi[1], delovi[-1]
+    # Poslednji oglas se zatvara sa "</div>" na početku reda, posle toga je podnožje stranice
+    kraj = poslednji.find('\n</div>', poslednji.find('offer-price--invert')) + len('\n</div>')
+    podnozje = poslednji[kraj:]
+
+    prvi = parseri.parsiraj_html(pocetak_oglasa + oglas, 'bs4')[0]
+    href = prvi['Link'][len(parseri.SAJT):]
+    prvi_oglas = ocisti_oglase(pd.DataFrame([prvi], columns=parseri.KOLONE)).iloc[0]
+    zamene = [
+        (href, '@@HREF@@'),
+        (prvi['Naslov'], '@@NASLOV@@'),
+        (f"<span>{prvi['Cena_Tekst']}</span>", '<span>@@CENA@@</span>'),
+        (f"{_hiljade(round(prvi_oglas['Cena_po_m2']))} €/m²", '@@CENA_M2@@'),
+        (f"<span>{prvi['Kvadratura_Tekst']}</span>", '<span>@@KVADRATURA@@</span>'),
+        (prvi['Lokacija'], '@@LOKACIJA@@'),
+        (href.rstrip('/').rsplit('/', 1)[1], '@@KOD@@'),  # Šifra oglasa u tracking skriptama
+    ]
+    for staro, oznaka in zamene:
+        if staro not in oglas:
+            raise ValueError(f"'{staro}' nije nađeno u prvom oglasu iz '{putanja}', šablon se ne može napraviti.")
+        oglas = oglas.replace(staro, oznaka)
+    return zaglavlje, pocetak_oglasa + oglas, podnozje
+
+
+def _hiljade(broj):
+    """66950 -> '66 950', kao na sajtu."""
+    return f"{broj:,}".replace(",", " ")
+
+
+def _slug(naziv):
+    zamene = str.maketrans({'č': 'c', 'ć': 'c', 'ž': 'z', 'š': 's', 'đ': 'dj', ' ': '-'})
+    return naziv.lower().translate(zamene)
+
+
+def slucajni_oglasi(n, rng, prvi_id=1_000_000):
+    """
+    n oglasa kao DataFrame kolona koje daje scraper (Naslov, Lokacija, Cena_EUR, Kvadratura_m2, Link, Deo_Grada).
+    Sve je vektorsko, pa i milion redova nastaje za nekoliko sekundi.
+    """
+    delovi = gazetir()['Deo_Grada'].to_numpy()
+    # Popularni delovi grada imaju mnogo više oglasa (otprilike Zipf)
+    verovatnoce = 1.0 / np.arange(1, len(delovi) + 1)
+    deo = rng.choice(len(delovi), size=n, p=verovatnoce / verovatnoce.sum())
+    cena_m2_dela = np.random.default_rng(SEME).uniform(1400, 3200, len(delovi))  # Ista za sve stranice
+
+    kvadratura = np.round(rng.lognormal(np.log(55), 0.35, n).clip(18, 250))
+    kvadratura += np.where(rng.random(n) < 0.1, 0.5, 0.0)
+    cena = (np.round(kvadratura * cena_m2_dela[deo] * rng.lognormal(0, 0.15, n), -2)).astype('int64')
+    ids = prvi_id + np.arange(n)
+
+    naziv = pd.Series(delovi[deo])
+    kv = pd.Series(kvadratura).map('{:.2f}'.format)
+    cena_s = pd.Series(cena).astype(str)
+    id_s = pd.Series(ids).astype(str)
+
+    strukturisan = "Stan,NOVI SAD," + naziv.str.upper() + ",kv: " + kv + ", € " + cena_s + ", ID: " + id_s
+    ulica = pd.Series(np.where(rng.random(n) < 0.5,
+                               "ul. " + np.array(ULICE, dtype=object)[rng.integers(len(ULICE), size=n)],
+                               "Bulevar " + np.array(BULEVARI, dtype=object)[rng.integers(len(BULEVARI), size=n)]))
+    slobodan = "Prodajem stan, " + ulica + " " + pd.Series(rng.integers(1, 150, n)).astype(str) + ", " + naziv
+    naslov = strukturisan.where(rng.random(n) >= UDEO_SA_ULICOM, slobodan)
+
+    slugovi = np.array([_slug(d) for d in delovi], dtype=object)[deo]
+    kodovi = pd.Series(ids).map("B{:010X}".format)
+    link = (parseri.SAJT + "/stambeni-objekti/stanovi/stan-novi-sad-" + pd.Series(slugovi)
+            + "-kv-" + pd.Series((kvadratura * 100).astype('int64')).astype(str) + "-eur-" + cena_s
+            + "-id-" + id_s + "/" + kodovi + "/")
+    lokacija = naziv.where(naziv == "Novi Sad", naziv + ", Novi Sad") + ", Srbija"
+    return pd.DataFrame({'Naslov': naslov, 'Lokacija': lokacija, 'Cena_EUR': cena, 'Kvadratura_m2': kvadratura,
+                         'Link': link, 'Deo_Grada': naziv, 'Kod': kodovi})
+
+
+def sinteticka_stranica(broj, oglasa=OGLASA_PO_STRANICI, seme=SEME):
+    """HTML stranice pretrage `broj` (1, 2, ...), uvek isti za isto seme; broj 0 je prazna stranica (kraj)."""
+    zaglavlje, sablon, podnozje = sablon_stranice()
+    if broj < 1:
+        return zaglavlje + podnozje
+    oglasi = slucajni_oglasi(oglasa, np.random.default_rng([seme, broj]), prvi_id=1_000_000 + broj * oglasa)
+    delovi = [zaglavlje]
+    for oglas in oglasi.itertuples(index=False):
+        kvadratura = f"{oglas.Kvadratura_m2:g}".replace('.', ',')
+        zamene = {
+            '@@HREF@@': oglas.Link[len(parseri.SAJT):],
+            '@@NASLOV@@': html.escape(oglas.Naslov),
+            '@@CENA@@': f"{_hiljade(int(oglas.Cena_EUR))} €",
+            '@@CENA_M2@@': f"{_hiljade(round(oglas.Cena_EUR / oglas.Kvadratura_m2))} €/m²",
+            '@@KVADRATURA@@': f"{kvadratura} m²",
+            '@@LOKACIJA@@': oglas.Lokacija,
+            '@@KOD@@': oglas.Kod,
+        }
+        tekst = sablon
+        for oznaka, vrednost in zamene.items():
+            tekst = tekst.replace(oznaka, vrednost)
+        delovi.append(tekst)
+    delovi.append(podnozje)
+    return ''.join(delovi)
+
+
+def sinteticki_dataset(n, seme=SEME):
+    """
+    Geokodiran dataset (kolone kao nekretnine_ns_geo) sa n redova: koordinate su centroid dela grada
+    iz gazetira plus šum, datumi su raspoređeni na poslednjih 30 dana.
+    """
+    rng = np.random.default_rng(seme)
+    df = slucajni_oglasi(n, rng).drop(columns='Kod')
+    centroidi = gazetir().set_index('Deo_Grada')
+    df['Cena_po_m2'] = (df['Cena_EUR'] / df['Kvadratura_m2']).round(2)
+    df['Datum_Preuzimanja'] = (pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 30, n), unit='D')
+                               ).strftime("%Y-%m-%d")
+    df['Latitude'] = df['Deo_Grada'].map(centroidi['Latitude']).to_numpy() + rng.normal(0, 0.006, n)
+    df['Longitude'] = df['Deo_Grada'].map(centroidi['Longitude']).to_numpy() + rng.normal(0, 0.008, n)
+    df['Preciznost_Lokacije'] = np.where(df['Deo_Grada'] == "Novi Sad", "grad", "deo_grada")
+    return postavi_tipove(zaprljaj(df, rng))
+
+
+def zaprljaj(df, rng):
+    """
+    Greške kakve ima i pravi dataset (vidi UDEO_*): nevalidne cene, kvadrature i koordinate,
+    cene van IQR granica svog dela grada i isti deo grada napisan na više načina.
+    """
+    n = len(df)
+    cena = df['Cena_EUR'].to_numpy(dtype=float, copy=True)
+    kvadratura = df['Kvadratura_m2'].to_numpy(dtype=float, copy=True)
+    lat = df['Latitude'].to_numpy(dtype=float, copy=True)
+
+    nevalidni = np.flatnonzero(rng.random(n) < UDEO_NEVALIDNIH)
+    vrsta = rng.integers(0, 4, len(nevalidni))
+    cena[nevalidni[vrsta == 0]] = np.nan
+    cena[nevalidni[vrsta == 1]] = np.round(cena / kvadratura)[nevalidni[vrsta == 1]]  # Cena po m² umesto cene
+    kvadratura[nevalidni[vrsta == 2]] = rng.choice([0.0, 5.0, 5000.0], (vrsta == 2).sum())
+    lat[nevalidni[vrsta == 3]] = 44.8  # Beograd
+
+    odstupanja = np.flatnonzero(rng.random(n) < UDEO_ODSTUPANJA)
+    cena[odstupanja] = np.round(cena[odstupanja] * rng.choice([0.25, 5.0], len(odstupanja)), -2)
+
+    deo = df['Deo_Grada'].astype(str).to_numpy(dtype=object)
+    drugi = np.flatnonzero(rng.random(n) < UDEO_DRUGIH_NAZIVA)
+    nacin = rng.integers(0, 3, len(drugi))
+    deo[drugi[nacin == 0]] = [d.upper() for d in deo[drugi[nacin == 0]]]
+    deo[drugi[nacin == 1]] = [" " + d.lower().replace(" ", "  ") for d in deo[drugi[nacin == 1]]]
+    deo[drugi[nacin == 2]] = [normalizuj_naziv(d).title() for d in deo[drugi[nacin == 2]]]
+
+    return df.assign(Cena_EUR=cena, Kvadratura_m2=kvadratura, Latitude=lat, Deo_Grada=deo,
+                     Cena_po_m2=np.round(cena / np.where(kvadratura > 0, kvadratura, np.nan), 2))
+
+
+# --- LOKALNI SERVER I LAŽNI GEOKODER ---
+
+class _StranicaHandler(BaseHTTPRequestHandler):
+    """Odgovara na ?p=N (ili ?page=N) sintetičkom stranicom; posle poslednje stranice vraća praznu."""
+
+    def do_GET(self):
+        upit = parse_qs(urlparse(self.path).query)
+        broj = (upit.get('p') or upit.get('page') or ['1'])[0]
+        if not broj.isdigit():
+            self.send_error(400, "Broj stranice nije broj")
+            return
+        broj = int(broj)
+        telo = self.server.stranica(broj if broj <= self.server.broj_stranica else 0)
+        if self.server.kasnjenje:
+            time.sleep(self.server.kasnjenje)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(telo)))
+        self.end_headers()
+        self.wfile.write(telo)
+
+    def log_message(self, format, *args):
+        pass  # Bez reda po zahtevu na konzoli
+
+
+class LokalniServer(ThreadingHTTPServer):
+    """Zamena za nekretnine.rs: sintetičke stranice se prave jednom i drže u memoriji."""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, broj_stranica=STRANICA_ZA_SKRAPOVANJE, kasnjenje=0.0, seme=SEME):
+        super().__init__(("127.0.0.1", port), _StranicaHandler)
+        self.broj_stranica = broj_stranica
+        self.kasnjenje = kasnjenje  # s po odgovoru, za simulaciju spore mreže
+        self.stranica = lru_cache(maxsize=None)(lambda broj: sinteticka_stranica(broj, seme=seme).encode('utf-8'))
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+
+@contextmanager
+def lokalni_server(broj_stranica=STRANICA_ZA_SKRAPOVANJE, kasnjenje=0.0, port=0):
+    """Server u pozadinskoj niti; vraća base URL za scraper (npr. http://127.0.0.1:PORT/)."""
+    server = LokalniServer(port, broj_stranica, kasnjenje)
+    for broj in range(broj_stranica + 1):
+        server.stranica(broj)  # Pravljenje stranica ne ulazi u merenje
+    nit = threading.Thread(target=server.serve_forever, daemon=True)
+    nit.start()
+    try:
+        yield server.base_url
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class LazniGeokoder(Geokoder):
+    """Zamena za Nominatim: bez mreže, fiksno kašnjenje po upitu, isti rezultat za istu adresu."""
+
+    ime = "lazni"
+
+    def __init__(self, kasnjenje=KASNJENJE_GEOKODERA, udeo_nenadjenih=UDEO_NENADJENIH):
+        self.kasnjenje = kasnjenje
+        self.udeo_nenadjenih = udeo_nenadjenih
+        self.upita = 0
+
+    def geokodiraj(self, adresa):
+        self.upita += 1
+        if self.kasnjenje:
+            time.sleep(self.kasnjenje)
+        h = zlib.crc32(adresa.encode('utf-8'))  # Za razliku od hash() isti u svakom procesu
+        if h % 1000 < self.udeo_nenadjenih * 1000:
+            return None
+        # Tačka unutar ~4 km od centra grada
+        return 45.2517 + ((h >> 10) % 1000 - 500) * 7e-5, 19.8369 + ((h >> 20) % 1000 - 500) * 1e-4
+
+
+# --- BENCHMARK-I ---
+
+def _stopa(broj, sekunde):
+    return round(broj / sekunde, 1) if sekunde > 0 else None
+
+
+def bench_parsiranje(broj_stranica=STRANICA_ZA_PARSIRANJE, ponavljanja=PONAVLJANJA_PARSIRANJA):
+    """Stranica/s i oglasa/s za svaki dostupni parser; svi moraju dati iste zapise kao 'bs4'."""
+    stranice = [sinteticka_stranica(broj) for broj in range(1, broj_stranica + 1)]
+    referenca = [parseri.parsiraj_html(s, 'bs4') for s in stranice]
+    oglasa = sum(len(r) for r in referenca)
+    rezultat = {'oglasa': oglasa, 'kb_po_stranici': round(sum(len(s) for s in stranice) / broj_stranica / 1024, 1),
+                'paritet': all(len(r) == OGLASA_PO_STRANICI for r in referenca)}
+
+    for ime in parseri.BACKENDI:
+        if [parseri.parsiraj_html(s, ime) for s in stranice] != referenca:
+            print(f"[GREŠKA] Parser '{ime}' vraća drugačije zapise od 'bs4'!")
+            rezultat['paritet'] = False
+        pocetak = time.perf_counter()
+        for _ in range(ponavljanja):
+            for s in stranice:
+                parseri.parsiraj_html(s, ime)
+        trajanje = time.perf_counter() - pocetak
+        rezultat[f"{ime}_stranica_po_s"] = _stopa(broj_stranica * ponavljanja, trajanje)
+        rezultat[f"{ime}_oglasa_po_s"] = _stopa(oglasa * ponavljanja, trajanje)
+    return rezultat
+
+
+def bench_skrapovanje(broj_stranica=STRANICA_ZA_SKRAPOVANJE, paralelno=PARALELNO_SKRAPOVANJE):
+    """Ceo put od HTTP zahteva do tabele (scraper.preuzmi_stranice + napravi_tabelu), bez ograničenja brzine."""
+    import scraper
+
+    with lokalni_server(broj_stranica) as base_url:
+        urls = [f"{base_url}?p={i}" for i in range(1, broj_stranica + 1)]
+        pocetak = time.perf_counter()
+        rezultati = scraper.preuzmi_stranice(urls, paralelno, po_sekundi=1e9)
+        df = scraper.napravi_tabelu([zapis for stranica in rezultati for zapis in stranica or []])
+        trajanje = time.perf_counter() - pocetak
+    return {'trajanje_s': round(trajanje, 3), 'stranica_po_s': _stopa(broj_stranica, trajanje),
+            'oglasa': len(df), 'oglasa_po_s': _stopa(len(df), trajanje), 'paralelno': paralelno}
+
+
+def bench_ciscenje(df):
+    """ciscenje.ocisti nad celim dataset-om (shema, opsezi, nazivi delova grada, IQR po delu grada)."""
+    pocetak = time.perf_counter()
+    ocisceni = ocisti(df, GEO_KOLONE)
+    trajanje = time.perf_counter() - pocetak
+    return {'trajanje_s': round(trajanje, 3), 'redova_po_s': _stopa(len(df), trajanje),
+            'udeo_zadrzanih': round(len(ocisceni) / len(df), 4),
+            'delova_grada_pre': df['Deo_Grada'].nunique(), 'delova_grada_posle': ocisceni['Deo_Grada'].nunique()}
+
+
+def bench_geokodiranje(df, kasnjenje=KASNJENJE_GEOKODERA):
+    """Faza geokodiranja kao u geocoder.py, sa lažnim geokoderom umesto Nominatim-a."""
+    from adrese import adrese_oglasa, dodaj_nagovestaje, izaberi_lokaciju
+    from geocoder import geokodiraj_adrese
+    from geokoderi import GazetirGeokoder, LancaniGeokoder
+
+    df = df.drop(columns=['Latitude', 'Longitude', 'Preciznost_Lokacije'])
+    pocetak = time.perf_counter()
+    gazetir_geokoder = GazetirGeokoder()
+    lazni = LazniGeokoder(kasnjenje)
+    df = dodaj_nagovestaje(df, gazetir_geokoder)
+    posle_nagovestaja = time.perf_counter()
+
+    adrese_ulica, adrese_delova = adrese_oglasa(df)
+    koordinate_delova = geokodiraj_adrese(adrese_delova.dropna().unique(), LancaniGeokoder([gazetir_geokoder, lazni]))
+    koordinate_ulica = {adresa: koordinate for adresa, koordinate
+                        in geokodiraj_adrese(adrese_ulica.dropna().unique(), lazni).items() if koordinate[0] is not None}
+    posle_geokodiranja = time.perf_counter()
+
+    df = izaberi_lokaciju(df, koordinate_ulica, koordinate_delova)
+    kraj = time.perf_counter()
+    return {'trajanje_s': round(kraj - pocetak, 3), 'oglasa_po_s': _stopa(len(df), kraj - pocetak),
+            'nagovestaji_s': round(posle_nagovestaja - pocetak, 3),
+            'geokodiranje_s': round(posle_geokodiranja - posle_nagovestaja, 3),
+            'izbor_lokacije_s': round(kraj - posle_geokodiranja, 3),
+            'upita_geokoderu': lazni.upita, 'udeo_lociranih': round(df['Latitude'].notna().mean(), 3)}
+
+
+def bench_trening(df, stabala=STABALA):
+    """Trening i predviđanje istim pipeline-om kao ml_model.py; i kašnjenje predviđanja za jedan oglas."""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    from ml_model import napravi_pipeline, napravi_X_y, podeli
+
+    X_train, X_test, y_train, y_test = podeli(*napravi_X_y(df))
+    model = napravi_pipeline(RandomForestRegressor(n_estimators=stabala, random_state=42))
+    pocetak = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_s = time.perf_counter() - pocetak
+
+    pocetak = time.perf_counter()
+    predikcije = model.predict(X_test)
+    predict_s = time.perf_counter() - pocetak
+
+    jedan = X_test.iloc[:1]
+    vremena = []
+    for _ in range(20):
+        pocetak = time.perf_counter()
+        model.predict(jedan)
+        vremena.append(time.perf_counter() - pocetak)
+    return {'fit_s': round(fit_s, 3), 'redova_za_trening': len(X_train),
+            'predict_s': round(predict_s, 4), 'predikcija_po_s': _stopa(len(X_test), predict_s),
+            'jedna_predikcija_ms': round(float(np.median(vremena)) * 1000, 3),
+            'mae': round(mean_absolute_error(y_test, predikcije)), 'r2': round(r2_score(y_test, predikcije), 4)}
+
+
+def bench_mapa(df):
+    """Pravljenje i čuvanje mape kao u map_viz.py (režim se bira kao "auto"); vreme i veličina HTML-a."""
+    import folium
+
+    import map_viz
+
+    procene = df['Cena_EUR'] * 1.0  # Umesto modela, da i kolona procene uđe u veličinu fajla
+    with tempfile.TemporaryDirectory() as folder:
+        putanja = os.path.join(folder, map_viz.IZLAZNI_FAJL)
+        pocetak = time.perf_counter()
+        mapa = folium.Map(location=map_viz.NS_KOORDINATE, zoom_start=13, tiles="OpenStreetMap")
+        slojevi = map_viz.SlojeviMape()
+        slojevi.dodaj(df, procene)
+        rezim = slojevi.nacrtaj(mapa)
+        mapa.save(putanja)
+        trajanje = time.perf_counter() - pocetak
+        velicina = os.path.getsize(putanja)
+    return {'rezim': rezim, 'trajanje_s': round(trajanje, 3), 'velicina_mb': round(velicina / 2 ** 20, 3),
+            'bajtova_po_oglasu': round(velicina / len(df), 1)}
+
+
+# --- REZULTATI ---
+
+def okruzenje():
+    """Commit (sa oznakom -dirty ako ima nesačuvanih izmena), verzije Python-a i paketa."""
+    try:
+        commit = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=FOLDER_SKRIPTI,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "nepoznat"
+    paketi = {}
+    for paket in ("pandas", "numpy", "scikit-learn", "folium", "beautifulsoup4", "lxml", "selectolax"):
+        try:
+            paketi[paket] = version(paket)
+        except PackageNotFoundError:
+            pass
+    return {'commit': commit, 'vreme': time.strftime("%Y-%m-%dT%H:%M:%S"), 'masina': platform.node(),
+            'python': platform.python_version(), 'paketi': paketi, 'seme': SEME}
+
+
+def upisi_rezultat(zapis, putanja=REZULTATI_FAJL):
+    with open(putanja, "a", encoding="utf-8") as f:
+        f.write(json.dumps(zapis, ensure_ascii=False) + "\n")
+
+
+def ucitaj_rezultate(putanja=REZULTATI_FAJL):
+    if not os.path.exists(putanja):
+        return []
+    with open(putanja, encoding="utf-8") as f:
+        return [json.loads(red) for red in f if red.strip()]
+
+
+def _smer(metrika):
+    """+1 ako je veće bolje, -1 ako je manje bolje, 0 ako je metrika samo informativna."""
+    if metrika.endswith("_po_s") or metrika == "r2":
+        return 1
+    if metrika.endswith(("_s", "_ms", "_mb")) or metrika in ("mae", "bajtova_po_oglasu"):
+        return -1
+    return 0
+
+
+def uporedi(putanja=REZULTATI_FAJL, commit=None, sa_commitom=None, prag=PRAG_REGRESIJE):
+    """
+    Poslednji rezultati za `commit` (podrazumevano poslednji izmeren) naspram `sa_commitom`
+    (podrazumevano prethodni izmeren commit). Vraća broj regresija većih od `prag`.
+    """
+    rezultati = ucitaj_rezultate(putanja)
+    commitovi = list(dict.fromkeys(r['commit'] for r in rezultati))
+    commit = commit or (commitovi[-1] if commitovi else None)
+    if sa_commitom is None:
+        prethodni = [c for c in commitovi if c != commit]
+        sa_commitom = prethodni[-1] if prethodni else None
+    if commit is None or sa_commitom is None:
+        print("Nema rezultata za dva različita commit-a, nema šta da se uporedi.")
+        return 0
+
+    def poslednji(c):
+        return {(r['benchmark'], r['velicina']): r['metrike'] for r in rezultati if r['commit'] == c}
+
+    novi, stari = poslednji(commit), poslednji(sa_commitom)
+    print(f"\nPoređenje {commit} sa {sa_commitom} (pogoršanje preko {prag:.0%} je REGRESIJA):")
+    regresija = 0
+    for kljuc in novi:
+        if kljuc not in stari:
+            continue
+        for metrika, vrednost in novi[kljuc].items():
+            stara = stari[kljuc].get(metrika)
+            smer = _smer(metrika)
+            if not smer or not isinstance(vrednost, (int, float)) or not isinstance(stara, (int, float)) or not stara:
+                continue
+            promena = (vrednost - stara) / abs(stara)
+            oznaka = ""
+            if promena * smer < -prag:
+                oznaka = "  REGRESIJA"
+                regresija += 1
+            elif promena * smer > prag:
+                oznaka = "  bolje"
+            print(f"  {kljuc[0]:>12} {kljuc[1]:>8} {metrika:<28} {stara:>12,.4g} -> {vrednost:>12,.4g} "
+                  f"({promena:+.1%}){oznaka}")
+    return regresija
+
+
+def pokreni(benchmarki=BENCHMARKI, velicine=VELICINE, putanja=REZULTATI_FAJL, stabala=STABALA):
+    """Pokreće izabrane benchmark-e i upisuje svaki rezultat u `putanja` zajedno sa okruženjem."""
+    osnova = okruzenje()
+    print(f"Commit {osnova['commit']}, Python {osnova['python']}, seme {SEME}.")
+
+    def zabelezi(ime, velicina, metrike):
+        upisi_rezultat({**osnova, 'benchmark': ime, 'velicina': velicina, 'metrike': metrike}, putanja)
+        print(f"[{ime} / {velicina}] " + ", ".join(f"{k}={v}" for k, v in metrike.items()))
+
+    if 'parsiranje' in benchmarki:
+        zabelezi('parsiranje', STRANICA_ZA_PARSIRANJE, bench_parsiranje())
+    if 'skrapovanje' in benchmarki:
+        zabelezi('skrapovanje', STRANICA_ZA_SKRAPOVANJE, bench_skrapovanje())
+
+    po_velicini = [b for b in ('ciscenje', 'geokodiranje', 'trening', 'mapa') if b in benchmarki]
+    for n in velicine if po_velicini else []:
+        pocetak = time.perf_counter()
+        df = sinteticki_dataset(n)
+        print(f"Sintetički dataset sa {n} redova napravljen za {time.perf_counter() - pocetak:.1f} s.")
+        if 'ciscenje' in po_velicini:
+            zabelezi('ciscenje', n, bench_ciscenje(df))
+        if 'geokodiranje' in po_velicini:
+            zabelezi('geokodiranje', n, bench_geokodiranje(df.copy()))
+        # Trening i mapa, kao ml_model.py i map_viz.py, dobijaju očišćene oglase
+        ocisceni = ocisti(df, GEO_KOLONE) if {'trening', 'mapa'} & set(po_velicini) else None
+        if 'trening' in po_velicini:
+            zabelezi('trening', n, bench_trening(ocisceni, stabala))
+        if 'mapa' in po_velicini:
+            zabelezi('mapa', n, bench_mapa(ocisceni))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ponovljivi benchmark-i nad sintetičkim stranicama i podacima")
+    parser.add_argument("benchmarki", nargs="*", metavar="BENCHMARK",
+                        help=f"Koje pokrenuti: {', '.join(BENCHMARKI)}. Podrazumevano svi.")
+    parser.add_argument("--velicine", type=int, nargs="+", default=VELICINE,
+                        help="Broj redova sintetičkog dataset-a, npr. --velicine 1000 100000 1000000")
+    parser.add_argument("--stabala", type=int, default=STABALA, help="Broj stabala za trening")
+    parser.add_argument("--rezultati", default=REZULTATI_FAJL)
+    parser.add_argument("--uporedi", nargs="?", const="", default=None, metavar="COMMIT",
+                        help="Samo uporedi poslednji izmeren commit sa prethodnim (ili sa zadatim)")
+    parser.add_argument("--server", action="store_true", help="Samo pokreni lokalni server, za ručno testiranje scraper.py")
+    parser.add_argument("--port", type=int, default=PORT_SERVERA, help="Port za --server")
+    parser.add_argument("--stranice", type=int, default=STRANICA_ZA_SKRAPOVANJE, help="Broj stranica za --server")
+    parser.add_argument("--kasnjenje", type=float, default=0.0, help="Kašnjenje servera po odgovoru (s)")
+    parser.add_argument("--generisi", type=int, metavar="N", help="Samo sačuvaj sintetički dataset sa N redova")
+    parser.add_argument("--ime", default="nekretnine_ns_sinteticki", help="Ime dataset-a za --generisi")
+    args = parser.parse_args()
+    nepoznati = set(args.benchmarki) - set(BENCHMARKI)
+    if nepoznati:
+        parser.error(f"nepoznati benchmark-i: {', '.join(sorted(nepoznati))}")
+
+    if args.server:
+        with lokalni_server(args.stranice, args.kasnjenje, args.port) as base_url:
+            print(f"Server radi na {base_url} ({args.stranice} stranica). "
+                  f"Npr: python scraper.py --base-url {base_url}. Ctrl+C za kraj.")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
+        return
+
+    if args.generisi:
+        putanja = sacuvaj_dataset(sinteticki_dataset(args.generisi), args.ime)
+        print(f"Sintetički dataset sa {args.generisi} redova sačuvan u '{putanja}'.")
+        return
+
+    if args.uporedi is None:
+        pokreni(args.benchmarki or BENCHMARKI, args.velicine, args.rezultati, args.stabala)
+    sys.exit(1 if uporedi(args.rezultati, sa_commitom=args.uporedi or None) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import metrike
+from dataset_io import BROJCANI_TIPOVI, SHEMA, ucitaj_dataset
+from geokoderi import GazetirGeokoder, normalizuj_naziv
+
+# --- KONFIGURACIJA ---
+KURS_RSD = 117.2  # Dinara za 1 EUR; retki oglasi sa cenom u dinarima se preračunavaju u evre
+MIN_CENA_EUR = 10000  # Ispod ovoga su greške u unosu (npr. cena po m² umesto cene) ili izdavanje
+MIN_KVADRATURA = 10  # m²
+MAX_KVADRATURA = 1000
+# Šire okolina Novog Sada (sva mesta iz gazetira); koordinate van toga su greška geokodiranja
+OKVIR_LAT = (45.0, 45.5)
+OKVIR_LON = (19.4, 20.2)
+IQR_FAKTOR = 3.0  # Tukey "daleke" granice: izbacuju se samo očigledno pogrešne cene po m², ne i luksuzni stanovi
+MIN_OGLASA_ZA_IQR = 10  # Delovi grada sa manje oglasa koriste granice izračunate na celom gradu
+CEO_GRAD = "*"  # Red u tabeli granica odstupanja koji važi za ceo grad
+
+# Kolone tabele oglasa posle ocisti_oglase (parseri daju cenu i kvadraturu kao tekst, vidi parseri.KOLONE)
+KOLONE_OGLASA = ['Naslov', 'Lokacija', 'Cena_EUR', 'Kvadratura_m2', 'Link', 'Deo_Grada', 'Cena_po_m2']
+OSNOVNE_KOLONE = ['Cena_EUR', 'Kvadratura_m2']
+GEO_KOLONE = OSNOVNE_KOLONE + ['Latitude', 'Longitude']
+
+
+def tekst_u_cenu(tekst):
+    """'66 950 €' / '1.200.000 €' / '7.800.000 din' -> cena u EUR (float, NaN ako nema cifara)."""
+    tekst = tekst.astype('string').str.lower()
+    # Sajt cene piše bez decimala, pa su tačke, razmaci i zarezi samo razdvajači hiljada
+    cena = pd.to_numeric(tekst.str.replace(r'\D', '', regex=True).replace('', pd.NA), errors='coerce')
+    cena = cena.astype(float)
+    return cena.where(~tekst.str.contains(r'din|rsd', na=False), cena / KURS_RSD)
+
+
+def tekst_u_kvadraturu(tekst):
+    """'54 m²' / '54,5m2' / '5 ari' -> kvadratura u m² (float, NaN ako nema broja)."""
+    tekst = tekst.astype('string').str.lower().str.replace(r'\s', '', regex=True)
+    broj = tekst.str.extract(r'(\d+(?:[.,]\d+)?)', expand=False).str.replace(',', '.', regex=False)
+    kvadratura = pd.to_numeric(broj, errors='coerce').astype(float)
+    return kvadratura.where(~tekst.str.contains(r'\d(?:ar|ari)$', na=False), kvadratura * 100)
+
+
+def deo_grada_iz_lokacije(lokacija):
+    """'Deo Grada, Novi Sad, Srbija' -> 'Deo Grada' (prvi deo pre zareza)."""
+    return lokacija.astype('string').str.split(',', n=1).str[0].str.strip()
+
+
+@lru_cache(maxsize=1)
+def _nazivi_gazetira():
+    """Normalizovan naziv ili alijas -> naziv dela grada iz gazetira."""
+    return GazetirGeokoder().kanonski
+
+
+def normalizuj_delove_grada(delovi):
+    """
+    Jedno pisanje po delu grada: 'LIMAN  4', 'liman 4' i 'Liman 4' postaju isto, kao i 'Zeleznicka stanica'
+    i 'Železnička stanica'. Delovi iz gazetira (i njihovi alijasi) dobijaju naziv iz gazetira,
+    ostali najčešće pisanje među nazivima koji se razlikuju samo po dijakriticima, veličini slova i razmacima.
+    Normalizuju se samo jedinstveni nazivi, pa je i za milion redova brzo.
+    """
+    sifre, jedinstveni = pd.factorize(delovi.astype('string'))
+    jedinstveni = pd.Series(jedinstveni, dtype='string').str.strip().str.replace(r'\s+', ' ', regex=True)
+    kljucevi = jedinstveni.map(normalizuj_naziv)
+    kanonski = kljucevi.map(_nazivi_gazetira())
+
+    broj = np.bincount(sifre[sifre >= 0], minlength=len(jedinstveni))
+    najcesci = (pd.DataFrame({'kljuc': kljucevi, 'naziv': jedinstveni, 'broj': broj})
+                .sort_values('broj', ascending=False, kind='stable').drop_duplicates('kljuc')
+                .set_index('kljuc')['naziv'])
+    kanonski = kanonski.fillna(kljucevi.map(najcesci)).where(kljucevi != '')
+
+    nazivi = np.append(kanonski.to_numpy(dtype=object, na_value=None), None)  # Šifra -1 (NaN) -> None
+    return pd.Series(nazivi[sifre], index=delovi.index, dtype='category')
+
+
+def proveri_shemu(df, potrebne=OSNOVNE_KOLONE):
+    """
+    Proverava da tabela ima potrebne kolone i da su brojčane kolone zaista brojevi.
+    Tekst u brojčanoj koloni (npr. ručno uređen CSV) postaje NaN, pa ga maska_validnih izbacuje.
+    """
+    nedostaju = [k for k in potrebne if k not in df.columns]
+    if nedostaju:
+        raise ValueError(f"Nedostaju kolone: {', '.join(nedostaju)}.")
+    brojcane = [k for k, tip in SHEMA.items() if tip in BROJCANI_TIPOVI and k in df.columns]
+    pogresne = [k for k in brojcane if not pd.api.types.is_numeric_dtype(df[k])]
+    if pogresne:
+        df = df.assign(**{k: pd.to_numeric(df[k], errors='coerce') for k in pogresne})
+    return df
+
+
+def maska_validnih(df, potrebne=OSNOVNE_KOLONE):
+    """True za redove sa svim potrebnim vrednostima u mogućem opsegu (cena, kvadratura, koordinate)."""
+    maska = df[list(potrebne)].notna().all(axis=1)
+    maska &= df['Cena_EUR'] >= MIN_CENA_EUR
+    maska &= df['Kvadratura_m2'].between(MIN_KVADRATURA, MAX_KVADRATURA)
+    if 'Latitude' in potrebne:
+        maska &= df['Latitude'].between(*OKVIR_LAT) & df['Longitude'].between(*OKVIR_LON)
+    return maska.fillna(False).astype(bool)
+
+
+def granice_odstupanja(cena_m2, grupe, faktor=IQR_FAKTOR, min_oglasa=MIN_OGLASA_ZA_IQR):
+    """
+    Granice [Q1 - faktor*IQR, Q3 + faktor*IQR] cene po m² po grupi (delu grada): DataFrame sa kolonama
+    donja/gornja. Red CEO_GRAD važi za ceo grad; njega dobijaju male i nepoznate grupe.
+    """
+    cena_m2 = pd.Series(np.asarray(cena_m2, dtype=float))
+    grupe = pd.Series(grupe).astype('string').fillna('').to_numpy(dtype=object)
+    q1_grad, q3_grad = np.quantile(cena_m2, [0.25, 0.75])
+
+    po_grupi = cena_m2.groupby(grupe)
+    kvartili = po_grupi.quantile([0.25, 0.75]).unstack()
+    mali = po_grupi.size().reindex(kvartili.index) < min_oglasa
+    q1 = kvartili[0.25].where(~mali, q1_grad)
+    q3 = kvartili[0.75].where(~mali, q3_grad)
+    granice = pd.DataFrame({'donja': q1 - faktor * (q3 - q1), 'gornja': q3 + faktor * (q3 - q1)})
+    granice.loc[CEO_GRAD] = [q1_grad - faktor * (q3_grad - q1_grad), q3_grad + faktor * (q3_grad - q1_grad)]
+    return granice
+
+
+def maska_odstupanja(df, po='Deo_Grada', faktor=IQR_FAKTOR, min_oglasa=MIN_OGLASA_ZA_IQR, granice=None):
+    """
+    True za oglase čija je cena po m² van granica svog dela grada (vidi granice_odstupanja).
+    Granice se računaju na samom `df`, osim ako nisu date (npr. izračunate ranije na celom dataset-u
+    kad se čisti deo po deo). Raspoređuju se na redove preko šifri grupa.
+    """
+    cena_m2 = (df['Cena_EUR'] / df['Kvadratura_m2']).to_numpy(dtype=float)
+    if not len(cena_m2):
+        return pd.Series(False, index=df.index)
+    grupe = df[po].astype('string').fillna('') if po in df.columns else pd.Series('', index=df.index)
+    if granice is None:
+        granice = granice_odstupanja(cena_m2, grupe, faktor, min_oglasa)
+
+    sifre, jedinstveni = pd.factorize(grupe)
+    po_grupi = granice.reindex(jedinstveni).fillna(granice.loc[CEO_GRAD])
+    donja = po_grupi['donja'].to_numpy()[sifre]
+    gornja = po_grupi['gornja'].to_numpy()[sifre]
+    return pd.Series((cena_m2 < donja) | (cena_m2 > gornja), index=df.index)
+
+
+def _validni(df, potrebne):
+    """Validni redovi sa jedinstvenim nazivima delova grada, i broj odbačenih."""
+    df = proveri_shemu(df, potrebne)
+    validni = maska_validnih(df, potrebne)
+    df = df[validni.to_numpy()].copy()
+    if 'Deo_Grada' in df.columns:
+        df['Deo_Grada'] = normalizuj_delove_grada(df['Deo_Grada'])
+    return df, int((~validni).sum())
+
+
+def ocisti(df, potrebne=OSNOVNE_KOLONE, odstupanja=True, faktor=IQR_FAKTOR, granice=None):
+    """
+    Zajedničko čišćenje za model, mapu, indeks uporedivih oglasa...: shema, nemoguće vrednosti,
+    jedinstveni nazivi delova grada i (opciono) odstupanja cene po m² unutar dela grada.
+    """
+    df, odbaceno = _validni(df, potrebne)
+    metrike.uvecaj("odbaceno_nevalidnih", odbaceno)
+    if odstupanja:
+        van = maska_odstupanja(df, faktor=faktor, granice=granice)
+        df = df[~van.to_numpy()]
+        metrike.uvecaj("odbaceno_odstupanja", int(van.sum()))
+    return df
+
+
+def ocisti_delove(citaj, potrebne=OSNOVNE_KOLONE, odstupanja=True, faktor=IQR_FAKTOR):
+    """
+    ocisti() za dataset koji se čita deo po deo; `citaj()` svaki put vraća nov iterator delova.
+    Kvartili zavise od celog dataset-a, pa prvi prolaz pamti samo deo grada (šifru) i cenu po m²
+    validnih redova (~12 bajtova po redu), a drugi čisti i vraća deo po deo.
+    """
+    granice = None
+    if odstupanja:
+        nazivi, sifre, cene = {}, [], []
+        for deo in citaj():
+            deo, _ = _validni(deo, potrebne)
+            grupe = deo['Deo_Grada'] if 'Deo_Grada' in deo.columns else pd.Series('', index=deo.index)
+            kodovi, jedinstveni = pd.factorize(grupe.astype('string').fillna(''))
+            mapa = np.array([nazivi.setdefault(naziv, len(nazivi)) for naziv in jedinstveni], dtype=np.int32)
+            sifre.append(mapa[kodovi])
+            cene.append((deo['Cena_EUR'] / deo['Kvadratura_m2']).to_numpy(dtype=np.float64))
+        cene = np.concatenate(cene) if cene else np.empty(0)
+        if len(cene):
+            grupe = pd.Categorical.from_codes(np.concatenate(sifre), categories=list(nazivi))
+            granice = granice_odstupanja(cene, grupe, faktor)
+
+    for deo in citaj():
+        yield ocisti(deo, potrebne, odstupanja and granice is not None, faktor, granice)
+
+
+def ocisti_oglase(df):
+    """
+    Sirovi zapisi parsera -> tabela oglasa: cena i kvadratura kao brojevi, Deo_Grada i Cena_po_m2.
+    Oglasi bez cene ili kvadrature se odbacuju; ostali opsezi se ne proveravaju, to radi ocisti() kasnije.
+    """
+    cena = tekst_u_cenu(df['Cena_Tekst'])
+    kvadratura = tekst_u_kvadraturu(df['Kvadratura_Tekst'])
+    imaju = (cena > 0) & (kvadratura > 0)
+    metrike.uvecaj("odbaceno_bez_cene_kvadrature", int((~imaju).sum()))
+
+    df = df[imaju.to_numpy()].assign(Cena_EUR=cena[imaju].round().astype('int64'), Kvadratura_m2=kvadratura[imaju])
+    df['Deo_Grada'] = normalizuj_delove_grada(deo_grada_iz_lokacije(df['Lokacija']))
+    df['Cena_po_m2'] = (df['Cena_EUR'] / df['Kvadratura_m2']).round(2)
+    return df[KOLONE_OGLASA].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Provera koliko bi oglasa čišćenje izbacilo iz dataset-a")
+    parser.add_argument("ime", nargs="?", default="nekretnine_ns_geo")
+    parser.add_argument("--bez-koordinata", action="store_true", help="Ne traži Latitude/Longitude")
+    parser.add_argument("--faktor", type=float, default=IQR_FAKTOR, help="Koliko IQR-ova je odstupanje")
+    args = parser.parse_args()
+
+    try:
+        df = ucitaj_dataset(args.ime)
+    except FileNotFoundError:
+        print(f"Nema dataset-a {args.ime}!")
+        return
+
+    potrebne = OSNOVNE_KOLONE if args.bez_koordinata else GEO_KOLONE
+    pocetak = time.perf_counter()
+    validni = maska_validnih(proveri_shemu(df, potrebne), potrebne)
+    ocisceni = ocisti(df, potrebne, faktor=args.faktor)
+    trajanje = time.perf_counter() - pocetak
+
+    print(f"Redova: {len(df)}; nevalidnih: {(~validni).sum()}; "
+          f"odstupanja: {validni.sum() - len(ocisceni)}; ostaje: {len(ocisceni)} ({trajanje:.2f} s).")
+    if 'Deo_Grada' in df.columns:
+        print(f"Delova grada: {df['Deo_Grada'].nunique()} -> {ocisceni['Deo_Grada'].nunique()} posle normalizacije.")
+
+
+if __name__ == "__main__":
+    main()
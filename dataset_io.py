@@ -0,0 +1,236 @@
+import argparse
+import os
+import shutil
+import time
+from datetime import date
+
+import pandas as pd
+
+# pyarrow je opcion; bez njega sve ide preko CSV-a kao ranije
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# --- KONFIGURACIJA ---
+KOLONA_PARTICIJE = "Datum_Preuzimanja"  # Jedna particija po danu skrapinga
+FORMAT = "parquet" if pa is not None else "csv"
+VELICINA_DELA = 100_000  # Redova po delu kad se dataset čita deo po deo (citaj_delove)
+
+# Tipovi kolona, da se ne pogađaju pri svakom čitanju; cena je nullable ('Int64'),
+# pa oglas bez cene ne obara učitavanje nego ga čišćenje (ciscenje.py) izbaci i prebroji
+SHEMA = {
+    'Naslov': 'string',
+    'Lokacija': 'string',
+    'Cena_EUR': 'Int64',
+    'Kvadratura_m2': 'float64',
+    'Link': 'string',
+    'Deo_Grada': 'category',
+    'Cena_po_m2': 'float64',
+    'Ulica': 'string',
+    'Deo_Grada_Nagovestaj': 'string',
+    'Puna_Adresa': 'string',
+    'Latitude': 'float64',
+    'Longitude': 'float64',
+    'Preciznost_Lokacije': 'category',
+}
+BROJCANI_TIPOVI = ('Int64', 'int64', 'float64')
+
+
+def putanja_parquet(ime):
+    return f"{ime}.parquet"
+
+
+def putanja_csv(ime):
+    return f"{ime}.csv"
+
+
+def postavi_tipove(df):
+    tipovi = {kolona: tip for kolona, tip in SHEMA.items() if kolona in df.columns}
+    # Tekst u brojčanoj koloni (npr. ručno uređen CSV) postaje NA umesto da obori astype
+    brojcane = [k for k, tip in tipovi.items() if tip in BROJCANI_TIPOVI and not pd.api.types.is_numeric_dtype(df[k])]
+    if brojcane:
+        df = df.assign(**{k: pd.to_numeric(df[k], errors='coerce') for k in brojcane})
+    celobrojne = [k for k, tip in tipovi.items() if tip == 'Int64' and pd.api.types.is_float_dtype(df[k])]
+    if celobrojne:
+        df = df.assign(**{k: df[k].round() for k in celobrojne})
+    df = df.astype(tipovi)
+    for kolona in df.select_dtypes('category').columns:
+        df[kolona] = df[kolona].cat.remove_unused_categories()
+    return df
+
+
+def _primeni_filtere(df, filteri):
+    """Isti filteri kao za Parquet ([(kolona, op, vrednost), ...]), ali nad već učitanim CSV-om."""
+    operacije = {
+        '==': lambda k, v: k == v, '=': lambda k, v: k == v, '!=': lambda k, v: k != v,
+        '<': lambda k, v: k < v, '<=': lambda k, v: k <= v, '>': lambda k, v: k > v, '>=': lambda k, v: k >= v,
+        'in': lambda k, v: k.isin(v), 'not in': lambda k, v: ~k.isin(v),
+    }
+    for kolona, op, vrednost in filteri:
+        df = df[operacije[op](df[kolona], vrednost)]
+    return df
+
+
+def _parquet_dataset(ime):
+    particije = ds.partitioning(pa.schema([(KOLONA_PARTICIJE, pa.string())]), flavor="hive")
+    return ds.dataset(putanja_parquet(ime), format="parquet", partitioning=particije)
+
+
+def _csv_kolone(ime, kolone, filteri):
+    """Kolone koje treba pročitati iz CSV-a: tražene plus one po kojima se filtrira (ako postoje u fajlu)."""
+    if kolone is None:
+        return None
+    zaglavlje = pd.read_csv(putanja_csv(ime), nrows=0).columns
+    potrebne = list(dict.fromkeys(list(kolone) + [k for k, _, _ in filteri or []]))
+    return [k for k in potrebne if k in zaglavlje]
+
+
+def ucitaj_dataset(ime, kolone=None, filteri=None):
+    """
+    Učitava dataset `ime` (npr. "nekretnine_ns_geo"): Parquet ako postoji, inače CSV.
+    `kolone` čita samo navedene kolone, `filteri` se kod Parquet-a guraju do particija i row grupa.
+    """
+    if pa is not None and os.path.exists(putanja_parquet(ime)):
+        dataset = _parquet_dataset(ime)
+        izraz = pq.filters_to_expression(filteri) if filteri else None
+        tabela = dataset.to_table(columns=kolone, filter=izraz)
+        df = tabela.to_pandas()
+        if KOLONA_PARTICIJE in df.columns:
+            # Redosled fajlova nije garantovan; stariji dani prvo, da "keep='last'" znači najnovije
+            df = df.sort_values(KOLONA_PARTICIJE, kind='stable', na_position='first')
+        return postavi_tipove(df.reset_index(drop=True))
+
+    if not os.path.exists(putanja_csv(ime)):
+        raise FileNotFoundError(f"Nema ni '{putanja_parquet(ime)}' ni '{putanja_csv(ime)}'.")
+
+    df = pd.read_csv(putanja_csv(ime), usecols=_csv_kolone(ime, kolone, filteri))
+    if filteri:
+        df = _primeni_filtere(df, filteri)
+    if kolone is not None:
+        df = df[[k for k in kolone if k in df.columns]]
+    return postavi_tipove(df.reset_index(drop=True))
+
+
+def citaj_delove(ime, kolone=None, filteri=None, velicina=VELICINA_DELA):
+    """
+    Isto što i ucitaj_dataset, ali kao niz DataFrame-ova od najviše `velicina` redova,
+    pa memorija ne raste sa istorijom. Parquet se čita dan po dan, stariji dani prvo
+    (isti redosled kao ucitaj_dataset); CSV redom kojim je pisan.
+    """
+    if pa is not None and os.path.exists(putanja_parquet(ime)):
+        dataset = _parquet_dataset(ime)
+        izraz = pq.filters_to_expression(filteri) if filteri else None
+        dani = {ds.get_partition_keys(fragment.partition_expression).get(KOLONA_PARTICIJE)
+                for fragment in dataset.get_fragments(filter=izraz)}
+        polje = ds.field(KOLONA_PARTICIJE)
+        batchevi, redova = [], 0
+        for dan in sorted(dani, key=lambda d: (d is not None, d or "")):
+            izraz_dana = polje.is_null() if dan is None else polje == dan
+            if izraz is not None:
+                izraz_dana = izraz & izraz_dana
+            # Arrow daje male batch-eve (po fajlu/row grupi); spajaju se u delove od `velicina` redova
+            for batch in dataset.to_batches(columns=kolone, filter=izraz_dana, batch_size=velicina):
+                batchevi.append(batch)
+                redova += batch.num_rows
+                if redova >= velicina:
+                    yield postavi_tipove(pa.Table.from_batches(batchevi).to_pandas())
+                    batchevi, redova = [], 0
+        if redova:
+            yield postavi_tipove(pa.Table.from_batches(batchevi).to_pandas())
+        return
+
+    if not os.path.exists(putanja_csv(ime)):
+        raise FileNotFoundError(f"Nema ni '{putanja_parquet(ime)}' ni '{putanja_csv(ime)}'.")
+
+    for df in pd.read_csv(putanja_csv(ime), usecols=_csv_kolone(ime, kolone, filteri), chunksize=velicina):
+        if filteri:
+            df = _primeni_filtere(df, filteri)
+        if kolone is not None:
+            df = df[[k for k in kolone if k in df.columns]]
+        if len(df):
+            yield postavi_tipove(df.reset_index(drop=True))
+
+
+def potpis_dataseta(ime):
+    """Fajlovi dataset-a (putanja, veličina, vreme izmene); jeftino poređenje da li se dataset menjao."""
+    fajlovi = []
+    for putanja in (putanja_parquet(ime), putanja_csv(ime)):
+        if os.path.isdir(putanja):
+            fajlovi += [os.path.join(koren, f) for koren, _, imena in os.walk(putanja) for f in imena]
+        elif os.path.isfile(putanja):
+            fajlovi.append(putanja)
+    return [[f, os.path.getsize(f), os.stat(f).st_mtime_ns] for f in sorted(fajlovi)]
+
+
+def sacuvaj_dataset(df, ime, rezim="zameni", format=None):
+    """
+    Čuva dataset kao Parquet particionisan po datumu skrapinga (ili CSV ako pyarrow nije tu).
+    rezim: "zameni"  - ceo dataset se piše iz početka,
+           "dan"     - zamenjuju se samo particije (dani) koje `df` sadrži, stariji dani ostaju,
+           "dopuni"  - novi redovi se dodaju postojećim.
+    """
+    format = format or FORMAT
+    if format == "csv":
+        # CSV nema particije: "dopuni" dopisuje, sve ostalo piše fajl iz početka (kao ranije)
+        if rezim == "dopuni" and os.path.exists(putanja_csv(ime)):
+            dopisi_csv(df, putanja_csv(ime))
+        else:
+            df.to_csv(putanja_csv(ime), index=False, encoding='utf-8')
+        return putanja_csv(ime)
+
+    putanja = putanja_parquet(ime)
+    if rezim == "zameni" and os.path.exists(putanja):
+        shutil.rmtree(putanja)
+
+    df = postavi_tipove(df)
+    if KOLONA_PARTICIJE not in df.columns:
+        df[KOLONA_PARTICIJE] = None
+    df[KOLONA_PARTICIJE] = df[KOLONA_PARTICIJE].astype('string')
+
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    particije = ds.partitioning(pa.schema([(KOLONA_PARTICIJE, pa.string())]), flavor="hive")
+    ds.write_dataset(
+        tabela, putanja, format="parquet", partitioning=particije,
+        # Jedinstveno ime fajla po upisu, da dopisivanje ne pregazi ranije fajlove istog dana
+        basename_template=f"deo-{time.time_ns()}-{{i}}.parquet",
+        existing_data_behavior="delete_matching" if rezim == "dan" else "overwrite_or_ignore",
+    )
+    return putanja
+
+
+def dopisi_csv(df, putanja):
+    """Dopisuje na postojeći CSV poravnato sa njegovim zaglavljem (nove kolone se ne upisuju)."""
+    zaglavlje = pd.read_csv(putanja, nrows=0).columns
+    df.reindex(columns=zaglavlje).to_csv(putanja, index=False, encoding='utf-8', mode='a', header=False)
+
+
+def danasnji_datum():
+    return date.today().isoformat()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Konverzija dataset-a između CSV-a i Parquet-a")
+    parser.add_argument("smer", choices=["izvoz-csv", "uvoz-csv"],
+                        help="izvoz-csv: Parquet -> CSV, uvoz-csv: postojeći CSV -> Parquet")
+    parser.add_argument("ime", help="Npr. nekretnine_ns_geo")
+    args = parser.parse_args()
+
+    # Deo po deo, da konverzija radi i za dataset veći od memorije
+    ukupno, putanja = 0, putanja_parquet(args.ime)
+    if args.smer == "izvoz-csv":
+        for i, df in enumerate(citaj_delove(args.ime)):
+            df.to_csv(putanja_csv(args.ime), index=False, encoding='utf-8', mode='w' if i == 0 else 'a', header=i == 0)
+            ukupno += len(df)
+        print(f"Izvezeno {ukupno} redova u '{putanja_csv(args.ime)}'.")
+    else:
+        for i, df in enumerate(pd.read_csv(putanja_csv(args.ime), chunksize=VELICINA_DELA)):
+            putanja = sacuvaj_dataset(df, args.ime, rezim="zameni" if i == 0 else "dopuni", format="parquet")
+            ukupno += len(df)
+        print(f"Uvezeno {ukupno} redova u '{putanja}'.")
+
+
+if __name__ == "__main__":
+    main()
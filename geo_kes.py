@@ -0,0 +1,49 @@
+import sqlite3
+import time
+
+# --- KONFIGURACIJA ---
+KES_FAJL = "geokod_kes.db"
+TTL_DANA = 180  # Koliko dugo verujemo pronađenim koordinatama
+TTL_NEUSPEH_DANA = 7  # "Nije nađeno" pamtimo kraće, možda servis kasnije nađe adresu
+
+NEMA = object()  # Adresa nije u kešu (ili je zapis istekao)
+
+
+class GeoKes:
+    """Trajni keš geokodiranja: adresa -> (lat, lon), uključujući i neuspešne pretrage (None, None)."""
+
+    def __init__(self, putanja=KES_FAJL, ttl_dana=TTL_DANA, ttl_neuspeh_dana=TTL_NEUSPEH_DANA):
+        self.ttl = ttl_dana * 86400
+        self.ttl_neuspeh = ttl_neuspeh_dana * 86400
+        self.pogoci = 0
+        self.promasaji = 0
+        self.conn = sqlite3.connect(putanja)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS adrese (
+                adresa TEXT PRIMARY KEY,
+                lat REAL,
+                lon REAL,
+                vreme REAL NOT NULL
+            )
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.conn.close()
+
+    def uzmi(self, adresa):
+        red = self.conn.execute("SELECT lat, lon, vreme FROM adrese WHERE adresa = ?", (adresa,)).fetchone()
+        if red is not None:
+            lat, lon, vreme = red
+            ttl = self.ttl if lat is not None else self.ttl_neuspeh
+            if time.time() - vreme < ttl:
+                self.pogoci += 1
+                return lat, lon
+        self.promasaji += 1
+        return NEMA
+
+    def sacuvaj(self, adresa, lat, lon):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO adrese VALUES (?, ?, ?, ?)", (adresa, lat, lon, time.time()))
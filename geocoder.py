@@ -1,71 +1,248 @@
-import pandas as pd
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
-import time
-
-# --- KONFIGURACIJA ---
-ULAZNI_FAJL = "nekretnine_ns_final.csv"
-IZLAZNI_FAJL = "nekretnine_ns_geo.csv"
-GRAD = "Novi Sad"
-
-
-def main():
-    print(f"Učitavam podatke iz {ULAZNI_FAJL}...")
-    try:
-        df = pd.read_csv(ULAZNI_FAJL)
-    except FileNotFoundError:
-        print(f"GREŠKA: Nije pronađen fajl '{ULAZNI_FAJL}'. Proveri da li je u istom folderu.")
-        return
-
-    print(f"Učitano {len(df)} redova.")
-
-    # Inicijalizacija geolokatora (Moraš staviti svoj user_agent, bilo šta jedinstveno)
-    geolocator = Nominatim(user_agent="moj_nekretnine_projekt_v1")
-
-    # RateLimiter je bitan da nas servis ne blokira (min 1 sekunda pauze)
-    geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1.1)
-
-    # Pravimo punu adresu za pretragu kako bi bila preciznija
-    # Ako u koloni 'Deo_Grada' piše samo 'Grbavica', dodajemo ', Novi Sad, Srbija'
-    df['Puna_Adresa'] = df['Deo_Grada'] + ', ' + GRAD + ', Srbija'
-
-    print("Počinjem geokodiranje... Ovo može potrajati (oko 1-2 sekunde po oglasu).")
-
-    # --- GLAVNA MAGIJA ---
-    # Kreiramo novu kolonu 'location' koja sadrži ceo objekat sa koordinatama
-    # Koristimo progress bar ako je moguće, ili samo ispisujemo
-
-    locations = []
-    total = len(df)
-
-    for index, row in df.iterrows():
-        address = row['Puna_Adresa']
-        try:
-            loc = geocode(address)
-            if loc:
-                locations.append((loc.latitude, loc.longitude))
-                print(f"[{index + 1}/{total}] Nađeno: {address} -> {loc.latitude}, {loc.longitude}")
-            else:
-                locations.append((None, None))
-                print(f"[{index + 1}/{total}] Nije nađeno: {address}")
-        except Exception as e:
-            print(f"Greška na {address}: {e}")
-            locations.append((None, None))
-
-    # Dodavanje koordinata u DataFrame
-    df['Latitude'], df['Longitude'] = zip(*locations)
-
-    # Čišćenje: brišemo one gde nismo našli koordinate (opciono)
-    broj_bez_lokacije = df['Latitude'].isna().sum()
-    print(f"\nZavršeno! Nisam uspeo da lociram {broj_bez_lokacije} stanova.")
-
-    # Čuvamo samo validne ili sve (ovde čuvamo sve)
-    df.to_csv(IZLAZNI_FAJL, index=False)
-    print(f"Geokodirani podaci sačuvani u '{IZLAZNI_FAJL}'.")
-
-    # Prikaz prvih nekoliko redova
-    print(df[['Deo_Grada', 'Latitude', 'Longitude']].head())
-
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import argparse
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+import metrike
+from ciscenje import ocisti
+from adrese import adrese_oglasa, dodaj_nagovestaje, izaberi_lokaciju, tekst_stranice_oglasa
+from dataset_io import VELICINA_DELA, citaj_delove, potpis_dataseta, putanja_csv, putanja_parquet, sacuvaj_dataset
+from geo_kes import NEMA, GeoKes
+from geokoderi import GazetirGeokoder, LancaniGeokoder, NominatimGeokoder
+
+# --- KONFIGURACIJA ---
+ULAZNI_DATASET = "nekretnine_ns_final"  # .parquet ili .csv, vidi dataset_io.py
+IZLAZNI_DATASET = "nekretnine_ns_geo"
+MAX_NOVIH_ULICA = 200  # Najviše novih upita za ulice po pokretanju (~1 s po upitu)
+MAX_DETALJA = 100  # Podrazumevan broj stranica oglasa za --detalji
+# Ulaz se obrađuje deo po deo; gotovi delovi i napredak se čuvaju, pa prekinuto geokodiranje nastavlja
+# od prvog nezavršenog dela. Izlazni dataset se piše tek kad su svi delovi gotovi.
+NAPREDAK_FAJL = "geokodiranje_napredak.json"
+DELOVI_FOLDER = "geokodiranje_delovi"
+
+
+def geokodiraj_adrese(adrese, geokoder):
+    """Vraća {adresa: (lat, lon)}; adrese koje nijedan backend ne nađe dobijaju (None, None)."""
+    koordinate = {}
+    for adresa in adrese:
+        rezultat = geokoder.geokodiraj(adresa)
+        koordinate[adresa] = rezultat if rezultat is not None else (None, None)
+        metrike.uvecaj("adrese_nadjene" if rezultat is not None else "adrese_nisu_nadjene")
+    nije_nadjeno = [a for a, k in koordinate.items() if k[0] is None]
+    if nije_nadjeno:
+        print(f"Nije nađeno {len(nije_nadjeno)} adresa, npr. {', '.join(nije_nadjeno[:5])}")
+    return koordinate
+
+
+def geokodiraj_ulice(adrese, kes, offline=False, max_novih=MAX_NOVIH_ULICA):
+    """
+    Vraća ({adresa: (lat, lon)} samo za pronađene ulice, broj novih upita);
+    najviše `max_novih` upita ka servisu.
+    """
+    koordinate = {}
+    nominatim = NominatimGeokoder(kes)
+    novih = 0
+
+    for adresa in adrese:
+        rezultat = kes.uzmi(adresa)
+        if rezultat is NEMA:
+            if offline or novih >= max_novih:
+                continue
+            novih += 1
+            try:
+                # Keš je upravo proveren; geokodiraj() bi ga pitao ponovo i duplo brojao promašaj
+                rezultat = nominatim.pitaj_servis(adresa)
+            except Exception as e:
+                print(f"Greška na {adresa}: {e}")
+                continue
+        if rezultat is not None and rezultat[0] is not None:
+            koordinate[adresa] = rezultat
+
+    return koordinate, novih
+
+
+def preuzmi_detalje(linkovi, max_stranica):
+    """{Link: tekst} sa stranica oglasa, preko istog rate limitera i sesije kao scraper."""
+    import scraper
+
+    linkovi = [link for link in linkovi.dropna().unique() if link != "N/A"][:max_stranica]
+    sesija = scraper.napravi_sesiju(1)
+    ogranicivac = scraper.OgranicivacBrzine()
+    detalji = {}
+    with sesija:
+        for link in linkovi:
+            html = scraper.preuzmi_html(link, sesija, ogranicivac)
+            if html:
+                detalji[link] = tekst_stranice_oglasa(html)
+    print(f"Preuzeto {len(detalji)} stranica oglasa za nagoveštaje adrese.")
+    return detalji
+
+
+def potpis_ulaza(ime, *podesavanja):
+    """Fajlovi dataset-a (putanja, veličina, vreme izmene) i podešavanja; ako se išta promeni, napredak ne važi."""
+    return potpis_dataseta(ime) + [list(podesavanja)]
+
+
+def ucitaj_napredak(potpis, putanja=NAPREDAK_FAJL):
+    """Napredak prekinutog geokodiranja istog ulaza, ili nov (i prazan folder delova)."""
+    if os.path.exists(putanja):
+        with open(putanja, encoding="utf-8") as f:
+            napredak = json.load(f)
+        if napredak.get('potpis') == potpis:
+            return napredak
+    if os.path.exists(DELOVI_FOLDER):
+        shutil.rmtree(DELOVI_FOLDER)
+    os.makedirs(DELOVI_FOLDER)
+    return {'potpis': potpis, 'zavrseno_delova': 0, 'gotovo': False, 'oglasa': 0, 'novih_ulica': 0,
+            'detalja': 0, 'preciznost': {}}
+
+
+def sacuvaj_napredak(napredak, putanja=NAPREDAK_FAJL):
+    privremeni = putanja + ".tmp"
+    with open(privremeni, "w", encoding="utf-8") as f:
+        json.dump(napredak, f, indent=2)
+    os.replace(privremeni, putanja)  # Prekid usred upisa ne ostavlja polovičan fajl
+
+
+def poslednje_verzije(ime):
+    """
+    True za red koji je poslednja verzija svog oglasa (po Link-u) u celom dataset-u.
+    Čita se samo kolona Link, deo po deo, i pamti kao 64-bitni hash (8 bajtova po redu).
+    """
+    hashevi = [pd.util.hash_pandas_object(deo['Link'], index=False).to_numpy()
+               for deo in citaj_delove(ime, kolone=['Link'])]
+    if not hashevi:
+        return np.zeros(0, dtype=bool)
+    return ~pd.Series(np.concatenate(hashevi)).duplicated(keep='last').to_numpy()
+
+
+def geokodiraj_deo(df, gazetir, geokoder, kes, args, napredak):
+    """Nagoveštaji, geokodiranje i izbor lokacije za jedan deo oglasa; troši zajednički budžet upita."""
+    # Nagoveštaji ulice i dela grada iz naslova (i, po želji, sa stranica oglasa)
+    detalji = None
+    if args.detalji > napredak['detalja']:
+        detalji = preuzmi_detalje(df['Link'], args.detalji - napredak['detalja'])
+        napredak['detalja'] += len(detalji)
+    df = dodaj_nagovestaje(df, gazetir, detalji)
+    adrese_ulica, adrese_delova = adrese_oglasa(df)
+
+    # Ista adresa se ponavlja u mnogo oglasa, pa svaku tražimo samo jednom
+    delovi = adrese_delova.dropna().unique()
+    ulice = adrese_ulica.dropna().unique()
+    print(f"Geokodiram {len(delovi)} delova grada i {len(ulice)} ulica (za {len(df)} oglasa)...")
+
+    # Prvo lokalni gazetir delova grada, Nominatim (preko keša) samo za ono što gazetir ne zna
+    with metrike.izmeri("geokodiranje_delova"):
+        koordinate_delova = geokodiraj_adrese(delovi, geokoder)
+
+    # Ulice zna samo Nominatim; broj novih upita po pokretanju je ograničen, ostalo čeka sledeći put
+    with metrike.izmeri("geokodiranje_ulica"):
+        koordinate_ulica, novih = geokodiraj_ulice(ulice, kes, args.offline,
+                                                   MAX_NOVIH_ULICA - napredak['novih_ulica'])
+    napredak['novih_ulica'] += novih
+
+    # Za svaki oglas najpreciznija lokacija koju imamo (ulica > deo grada > grad)
+    return izaberi_lokaciju(df, koordinate_ulica, koordinate_delova)
+
+
+def geokodiraj_delove(args, napredak):
+    """Geokodira ulaz deo po deo, od prvog nezavršenog dela; posle svakog dela čuva deo i napredak."""
+    # Inkrementalni scraper dopisuje oglas ponovo kad mu se promeni cena; zadržavamo najnoviju verziju
+    poslednji = poslednje_verzije(ULAZNI_DATASET)
+    gazetir = GazetirGeokoder()
+    pocetak = 0
+    with GeoKes() as kes:
+        backendi = [gazetir]
+        if not args.offline:
+            backendi.append(NominatimGeokoder(kes))
+        geokoder = LancaniGeokoder(backendi)
+
+        for i, deo in enumerate(citaj_delove(ULAZNI_DATASET)):
+            maska, pocetak = poslednji[pocetak:pocetak + len(deo)], pocetak + len(deo)
+            if i < napredak['zavrseno_delova']:
+                continue
+            # Nemoguće cene i kvadrature ne vredi geokodirati; odstupanja po delu grada izbacuju tek model i mapa
+            deo = ocisti(deo[maska], odstupanja=False).reset_index(drop=True)
+            print(f"Deo {i + 1}: {len(deo)} oglasa.")
+            if len(deo):
+                deo = geokodiraj_deo(deo, gazetir, geokoder, kes, args, napredak)
+                sacuvaj_dataset(deo, os.path.join(DELOVI_FOLDER, f"deo_{i:05d}"))
+                preciznost = deo['Preciznost_Lokacije'].astype('string').fillna('nema').value_counts()
+                for naziv, broj in preciznost.items():
+                    napredak['preciznost'][naziv] = napredak['preciznost'].get(naziv, 0) + int(broj)
+                napredak['oglasa'] += len(deo)
+                metrike.uvecaj("oglasi", len(deo))
+            napredak['zavrseno_delova'] = i + 1
+            sacuvaj_napredak(napredak)
+        napredak['gotovo'] = True
+        sacuvaj_napredak(napredak)
+
+        print(f"Pogoci po izvoru: {geokoder.pogoci}; novih upita za ulice: {napredak['novih_ulica']}; "
+              f"Nominatim keš: {kes.pogoci} pogodaka, {kes.promasaji} promašaja.")
+        for backend, pogoci in geokoder.pogoci.items():
+            metrike.zabelezi(f"pogoci_{backend}", pogoci)
+        metrike.zabelezi("kes_pogoci", kes.pogoci)
+        metrike.zabelezi("kes_promasaji", kes.promasaji)
+        if kes.pogoci + kes.promasaji:
+            metrike.zabelezi("kes_stopa_pogodaka", round(kes.pogoci / (kes.pogoci + kes.promasaji), 3))
+
+
+def obrisi_izlaz(ime):
+    """Briše dataset `ime` u oba formata (parquet folder ili fajl, csv), ako postoji."""
+    for putanja in (putanja_parquet(ime), putanja_csv(ime)):
+        if os.path.isdir(putanja):
+            shutil.rmtree(putanja)
+        elif os.path.exists(putanja):
+            os.remove(putanja)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geokodiranje oglasa")
+    parser.add_argument("--offline", action="store_true", help="Samo lokalni gazetir, bez Nominatim servisa")
+    parser.add_argument("--detalji", type=int, nargs="?", const=MAX_DETALJA, default=0,
+                        help="Preuzmi do N stranica oglasa i traži ulicu i u njihovom opisu")
+    parser.add_argument("--iznova", action="store_true", help="Zanemari napredak prekinutog geokodiranja")
+    args = parser.parse_args()
+
+    print(f"Učitavam podatke iz {ULAZNI_DATASET}...")
+    if not (os.path.exists(putanja_parquet(ULAZNI_DATASET)) or os.path.exists(putanja_csv(ULAZNI_DATASET))):
+        print(f"GREŠKA: Nije pronađen dataset '{ULAZNI_DATASET}'. Proveri da li je u istom folderu.")
+        return
+
+    if args.iznova and os.path.exists(NAPREDAK_FAJL):
+        os.remove(NAPREDAK_FAJL)
+    napredak = ucitaj_napredak(potpis_ulaza(ULAZNI_DATASET, VELICINA_DELA, args.offline, args.detalji))
+    if napredak['zavrseno_delova']:
+        print(f"Nastavljam prekinuto geokodiranje od dela {napredak['zavrseno_delova'] + 1}.")
+
+    if not napredak['gotovo']:
+        geokodiraj_delove(args, napredak)
+
+    print(pd.Series(napredak['preciznost'], dtype='int64').sort_values(ascending=False).to_string())
+    print(f"\nZavršeno! Nisam uspeo da lociram {napredak['preciznost'].get('nema', 0)} stanova "
+          f"(od {napredak['oglasa']}).")
+
+    # Delovi se spajaju u izlazni dataset tek sad, pa prekid ne ostavlja polovičan nekretnine_ns_geo
+    rezim = "zameni"
+    for ime in sorted(os.listdir(DELOVI_FOLDER)):
+        ime = os.path.join(DELOVI_FOLDER, os.path.splitext(ime)[0])
+        for deo in citaj_delove(ime):
+            putanja = sacuvaj_dataset(deo, IZLAZNI_DATASET, rezim=rezim)
+            rezim = "dopuni"
+    shutil.rmtree(DELOVI_FOLDER)
+    os.remove(NAPREDAK_FAJL)
+    if rezim == "zameni":
+        # Stari izlaz ne sme da ostane: sledeće faze bi ga uzele kao geokodiran ovaj ulaz
+        obrisi_izlaz(IZLAZNI_DATASET)
+        print("GREŠKA: Nema oglasa za geokodiranje (posle čišćenja nije ostao nijedan).")
+        sys.exit(1)
+    print(f"Geokodirani podaci sačuvani u '{putanja}'.")
+
+
+if __name__ == "__main__":
+    with metrike.faza("geokodiranje"):
+        main()
@@ -0,0 +1,135 @@
+import csv
+import difflib
+import os
+import re
+import unicodedata
+
+from geo_kes import NEMA
+
+# --- KONFIGURACIJA ---
+# Gazetir se isporučuje uz kod: Deo_Grada, Alijasi (odvojeni sa '|'), Latitude, Longitude
+GAZETIR_FAJL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetir_ns.csv")
+PRAG_SLICNOSTI = 0.85  # Minimalna sličnost za fuzzy pogodak (0-1)
+USER_AGENT = "moj_nekretnine_projekt_v1"
+
+RE_NE_SLOVA = re.compile(r'[^a-z0-9 ]+')
+RE_RAZMACI = re.compile(r'\s+')
+RE_BROJ = re.compile(r'\d+')
+
+
+def normalizuj_naziv(tekst):
+    """'Avijatičarsko  Naselje' -> 'avijaticarsko naselje' (bez dijakritika, malim slovima, sređeni razmaci)."""
+    tekst = tekst.lower().replace('đ', 'dj')
+    tekst = unicodedata.normalize('NFKD', tekst)
+    tekst = ''.join(c for c in tekst if not unicodedata.combining(c))
+    tekst = RE_NE_SLOVA.sub(' ', tekst)
+    return RE_RAZMACI.sub(' ', tekst).strip()
+
+
+class Geokoder:
+    """Zajednički interfejs: geokodiraj(adresa) vraća (lat, lon) ili None ako adresa nije nađena."""
+
+    ime = "geokoder"
+
+    def geokodiraj(self, adresa):
+        raise NotImplementedError
+
+
+class GazetirGeokoder(Geokoder):
+    """Offline geokoder nad spiskom delova Novog Sada (nazivi, alijasi i centroidi)."""
+
+    ime = "gazetir"
+
+    def __init__(self, putanja=GAZETIR_FAJL, prag=PRAG_SLICNOSTI):
+        self.prag = prag
+        self.indeks = {}  # normalizovan naziv/alijas -> (lat, lon)
+        self.kanonski = {}  # normalizovan naziv/alijas -> naziv dela grada iz gazetira
+        with open(putanja, encoding='utf-8', newline='') as f:
+            for red in csv.DictReader(f):
+                koordinate = (float(red['Latitude']), float(red['Longitude']))
+                nazivi = [red['Deo_Grada']] + [a for a in red['Alijasi'].split('|') if a]
+                for naziv in nazivi:
+                    self.indeks.setdefault(normalizuj_naziv(naziv), koordinate)
+                    self.kanonski.setdefault(normalizuj_naziv(naziv), red['Deo_Grada'])
+        # Fuzzy pogodak mora imati iste brojeve: "Liman 5" nije "Liman 1", ma koliko slova bilo isto
+        self._po_brojevima = {}
+        for kljuc in self.indeks:
+            self._po_brojevima.setdefault(tuple(RE_BROJ.findall(kljuc)), []).append(kljuc)
+
+    def _kljuc(self, naziv):
+        kljuc = normalizuj_naziv(naziv)
+        if kljuc in self.indeks:
+            return kljuc
+        kandidati = self._po_brojevima.get(tuple(RE_BROJ.findall(kljuc)), [])
+        slicni = difflib.get_close_matches(kljuc, kandidati, n=1, cutoff=self.prag)
+        return slicni[0] if slicni else None
+
+    def pronadji(self, naziv):
+        kljuc = self._kljuc(naziv)
+        return self.indeks[kljuc] if kljuc else None
+
+    def pronadji_naziv(self, naziv):
+        """'CENTAR NS' -> 'Centar'; None ako deo grada nije u gazetiru."""
+        kljuc = self._kljuc(naziv)
+        return self.kanonski[kljuc] if kljuc else None
+
+    def geokodiraj(self, adresa):
+        # Adresa je "Deo grada, Novi Sad, Srbija"; gazetir zna samo delove grada
+        return self.pronadji(adresa.split(',')[0])
+
+
+class NominatimGeokoder(Geokoder):
+    """Javni Nominatim servis (1 zahtev/s), sa trajnim kešom iz geo_kes.py."""
+
+    ime = "nominatim"
+
+    def __init__(self, kes=None, min_delay_seconds=1.1):
+        self.kes = kes
+        self.min_delay_seconds = min_delay_seconds
+        self._geocode = None
+
+    def geokodiraj(self, adresa):
+        if self.kes is not None:
+            rezultat = self.kes.uzmi(adresa)
+            if rezultat is not NEMA:
+                return None if rezultat[0] is None else rezultat
+        return self.pitaj_servis(adresa)
+
+    def pitaj_servis(self, adresa):
+        """Upit ka servisu bez provere keša (pozivalac ga je već proverio); odgovor se upisuje u keš."""
+        if self._geocode is None:
+            from geopy.geocoders import Nominatim
+            from geopy.extra.rate_limiter import RateLimiter
+
+            # RateLimiter je bitan da nas servis ne blokira (min 1 sekunda pauze)
+            self._geocode = RateLimiter(Nominatim(user_agent=USER_AGENT).geocode,
+                                        min_delay_seconds=self.min_delay_seconds)
+
+        # Greške servisa (mreža, timeout) propuštamo dalje i ne keširamo ih
+        loc = self._geocode(adresa)
+        koordinate = (loc.latitude, loc.longitude) if loc else (None, None)
+        if self.kes is not None:
+            self.kes.sacuvaj(adresa, *koordinate)
+        return koordinate if loc else None
+
+
+class LancaniGeokoder(Geokoder):
+    """Pita backend-e redom; prvi koji nađe adresu pobeđuje (npr. gazetir pa Nominatim za promašaje)."""
+
+    ime = "lanac"
+
+    def __init__(self, backendi):
+        self.backendi = backendi
+        self.pogoci = {b.ime: 0 for b in backendi}
+
+    def geokodiraj(self, adresa):
+        for backend in self.backendi:
+            try:
+                koordinate = backend.geokodiraj(adresa)
+            except Exception as e:
+                print(f"Greška ({backend.ime}) na {adresa}: {e}")
+                continue
+            if koordinate is not None:
+                self.pogoci[backend.ime] += 1
+                return koordinate
+        return None
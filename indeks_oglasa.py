@@ -0,0 +1,90 @@
+import sqlite3
+from datetime import date
+
+# --- KONFIGURACIJA ---
+INDEKS_FAJL = "nekretnine_ns_indeks.db"
+
+
+def id_oglasa(link):
+    """Link se završava stabilnim ID-jem oglasa, npr. '.../NkZ0QOFTZ6G/' -> 'NkZ0QOFTZ6G'."""
+    if not link or link == "N/A":
+        return None
+    return link.rstrip('/').rsplit('/', 1)[-1]
+
+
+class IndeksOglasa:
+    """Trajni indeks viđenih oglasa (ID -> poslednja cena) sa istorijom promena cena."""
+
+    def __init__(self, putanja=INDEKS_FAJL):
+        self.conn = sqlite3.connect(putanja)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS oglasi (
+                id TEXT PRIMARY KEY,
+                cena INTEGER NOT NULL,
+                prvi_put TEXT NOT NULL,
+                poslednji_put TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS istorija_cena (
+                id TEXT NOT NULL,
+                datum TEXT NOT NULL,
+                stara_cena INTEGER NOT NULL,
+                nova_cena INTEGER NOT NULL
+            );
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.conn.close()
+
+    def uporedi(self, zapisi):
+        """
+        Poredi zapise sa indeksom bez upisa: vraća (novi_ili_promenjeni, nepromenjeni).
+        Inkrementalni skraping ovako bira šta da upiše, a indeks menja tek kad su zapisi u dataset-u.
+        """
+        za_upis, nepromenjeni = [], []
+        for zapis in zapisi:
+            oid = id_oglasa(zapis['Link'])
+            red = None if oid is None else self.conn.execute(
+                "SELECT cena FROM oglasi WHERE id = ?", (oid,)).fetchone()
+            if red is not None and red[0] == zapis['Cena_EUR']:
+                nepromenjeni.append(zapis)
+            else:
+                za_upis.append(zapis)
+        return za_upis, nepromenjeni
+
+    def obradi(self, zapisi, datum=None):
+        """
+        Upisuje zapise u indeks (tek pošto su sačuvani u dataset-u).
+        Vraća (novi_ili_promenjeni, svi_vec_vidjeni): prvo ide u dataset, drugo je signal za prekid.
+        """
+        datum = datum or date.today().isoformat()
+        za_upis = []
+
+        with self.conn:
+            for zapis in zapisi:
+                oid = id_oglasa(zapis['Link'])
+                if oid is None:
+                    za_upis.append(zapis)
+                    continue
+
+                red = self.conn.execute("SELECT cena FROM oglasi WHERE id = ?", (oid,)).fetchone()
+                if red is None:
+                    self.conn.execute("INSERT INTO oglasi VALUES (?, ?, ?, ?)",
+                                      (oid, zapis['Cena_EUR'], datum, datum))
+                    za_upis.append(zapis)
+                elif red[0] != zapis['Cena_EUR']:
+                    self.conn.execute("INSERT INTO istorija_cena VALUES (?, ?, ?, ?)",
+                                      (oid, datum, red[0], zapis['Cena_EUR']))
+                    self.conn.execute("UPDATE oglasi SET cena = ?, poslednji_put = ? WHERE id = ?",
+                                      (zapis['Cena_EUR'], datum, oid))
+                    za_upis.append(zapis)
+                else:
+                    self.conn.execute("UPDATE oglasi SET poslednji_put = ? WHERE id = ?", (datum, oid))
+
+        svi_vec_vidjeni = bool(zapisi) and not za_upis
+        return za_upis, svi_vec_vidjeni
+
+    def istorija(self):
+        return self.conn.execute("SELECT * FROM istorija_cena ORDER BY datum").fetchall()
@@ -0,0 +1,131 @@
+import argparse
+import html
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import matplotlib
+
+matplotlib.use("Agg")  # Bez prozora: izveštaj se pravi i na serveru bez ekrana (noćni posao)
+
+import joblib
+import matplotlib.pyplot as plt
+
+import App
+import metrike
+import vizualizacija
+from agregati import azuriraj_kocku, histogram
+
+# --- KONFIGURACIJA ---
+IZVESTAJ_FOLDER = "izvestaj"
+HASHEVI_FAJL = "hashevi.json"  # Hash ulaznih podataka za svaki grafik iz prethodnog pokretanja
+PARALELNO = 4
+DPI = 110
+
+# ime grafika -> (naslov u izveštaju, funkcija crtanja, veličina slike)
+GRAFICI = {
+    'preciznost': ("Stvarna vs predviđena cena", vizualizacija.nacrtaj_preciznost, (8, 6)),
+    'faktori': ("Šta najviše utiče na cenu", vizualizacija.nacrtaj_faktore, (8, 6)),
+    'histogram_cena_m2': ("Distribucija cena kvadrata", App.nacrtaj_histogram, (10, 5)),
+    'top_lokacije': ("Najskuplje lokacije", App.nacrtaj_top_lokacije, (8, 5)),
+}
+
+
+def prikupi_podatke():
+    """Ulazni podaci za svaki grafik (ime -> tuple argumenata); grafici bez podataka se izostavljaju."""
+    podaci = {}
+    try:
+        model = vizualizacija.podaci_modela()
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Grafici modela se preskaču: {e}")
+        model = None
+    if model is not None:
+        y_test, predikcije, r2, uticaji = model
+        podaci['preciznost'] = (y_test, predikcije, r2)
+        podaci['faktori'] = (uticaji,)
+
+    try:
+        kocka = azuriraj_kocku()
+    except FileNotFoundError as e:
+        print(f"Grafici cena se preskaču: {e}")
+        kocka = None
+    if kocka is not None:
+        podaci['histogram_cena_m2'] = (histogram(kocka),)
+        podaci['top_lokacije'] = (App.top_lokacije(kocka),)
+    return podaci
+
+
+def nacrtaj(ime, argumenti, putanja):
+    """Crta jedan grafik u PNG; radi u zasebnom procesu."""
+    _, funkcija, velicina = GRAFICI[ime]
+    fig, ax = plt.subplots(figsize=velicina)
+    funkcija(ax, *argumenti)
+    fig.tight_layout()
+    fig.savefig(putanja, dpi=DPI)
+    plt.close(fig)
+    return ime
+
+
+def napisi_html(folder, slike, top):
+    """index.html sa svim graficima i tabelom najskupljih lokacija; slike su relativne, pa se folder može kopirati."""
+    delovi = [f"<h2>{html.escape(GRAFICI[ime][0])}</h2><img src='{ime}.png' alt='{ime}'>" for ime in slike]
+    if top is not None:
+        redovi = "".join(f"<tr><td>{html.escape(str(deo))}</td><td>{cena:,.0f} EUR</td></tr>"
+                         for deo, cena in top.items())
+        delovi.append(f"<h2>Prosečna cena po m²</h2><table>{redovi}</table>")
+    stranica = f"""<!DOCTYPE html>
+<html lang="sr"><head><meta charset="utf-8"><title>Nekretnine Novi Sad - izveštaj</title>
+<style>body {{ font-family: sans-serif; max-width: 960px; margin: auto; }} img {{ max-width: 100%; }}
+td {{ padding: 2px 12px; }}</style></head>
+<body><h1>Nekretnine Novi Sad</h1><p>Napravljeno: {datetime.now():%Y-%m-%d %H:%M}</p>
+{''.join(delovi)}
+</body></html>"""
+    with open(os.path.join(folder, "index.html"), "w", encoding="utf-8") as f:
+        f.write(stranica)
+
+
+def napravi_izvestaj(folder=IZVESTAJ_FOLDER, paralelno=PARALELNO, sve=False):
+    os.makedirs(folder, exist_ok=True)
+    putanja_hasheva = os.path.join(folder, HASHEVI_FAJL)
+    stari = {}
+    if os.path.exists(putanja_hasheva) and not sve:
+        with open(putanja_hasheva, encoding="utf-8") as f:
+            stari = json.load(f)
+
+    podaci = prikupi_podatke()
+    hashevi = {ime: joblib.hash(argumenti) for ime, argumenti in podaci.items()}
+    za_crtanje = [ime for ime in podaci
+                  if stari.get(ime) != hashevi[ime] or not os.path.exists(os.path.join(folder, f"{ime}.png"))]
+    print(f"Grafika: {len(podaci)}, ponovo se crta {len(za_crtanje)}, nepromenjeno {len(podaci) - len(za_crtanje)}.")
+
+    if za_crtanje:
+        with ProcessPoolExecutor(max_workers=min(paralelno, len(za_crtanje))) as izvrsilac:
+            poslovi = [izvrsilac.submit(nacrtaj, ime, podaci[ime], os.path.join(folder, f"{ime}.png"))
+                       for ime in za_crtanje]
+            for posao in poslovi:
+                print(f"  {posao.result()}.png")
+
+    top = podaci['top_lokacije'][0] if 'top_lokacije' in podaci else None
+    napisi_html(folder, [ime for ime in GRAFICI if ime in podaci], top)
+    with open(putanja_hasheva, "w", encoding="utf-8") as f:
+        json.dump(hashevi, f, indent=2)
+    return os.path.join(folder, "index.html")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statički izveštaj (PNG + HTML) bez prozora, za noćni posao")
+    parser.add_argument("--folder", default=IZVESTAJ_FOLDER)
+    parser.add_argument("--paralelno", type=int, default=PARALELNO, help="Broj procesa za crtanje")
+    parser.add_argument("--sve", action="store_true", help="Nacrtaj sve grafike i ako im se podaci nisu menjali")
+    args = parser.parse_args()
+
+    pocetak = time.perf_counter()
+    putanja = napravi_izvestaj(args.folder, args.paralelno, args.sve)
+    print(f"Izveštaj je sačuvan u '{putanja}' ({time.perf_counter() - pocetak:.1f} s).")
+
+
+if __name__ == "__main__":
+    with metrike.faza("izvestaj"):
+        main()
@@ -0,0 +1,234 @@
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+from ciscenje import GEO_KOLONE, ocisti
+from dataset_io import potpis_dataseta, ucitaj_dataset
+
+# --- KONFIGURACIJA ---
+ULAZNI_DATASET = "nekretnine_ns_geo"  # .parquet ili .csv, vidi dataset_io.py
+KOLONE = ['Link', 'Deo_Grada', 'Cena_EUR', 'Kvadratura_m2', 'Latitude', 'Longitude']
+INDEKS_FAJL = "komparabilni.joblib"
+K = 10  # Koliko uporedivih oglasa vraćamo
+TOLERANCIJA_KVADRATURE = 0.25  # Uporedivi su stanovi do ±25% kvadrature
+PREKOBROJ = 5  # Iz stabla uzimamo K * PREKOBROJ najbližih, pa tek onda filtriramo po kvadraturi
+MAX_DELTA = 1000  # Novi oglasi se drže van stabla dok ih ne bude ovoliko, onda se stablo gradi iznova
+ZEMLJA_KM = 6371.0
+MIN_UDALJENOST_KM = 0.05  # Da isti ulaz (udaljenost 0) ne dobije beskonačnu težinu
+
+
+def _radijani(lat, lon):
+    return np.radians(np.column_stack([np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)]))
+
+
+def _haversine_km(tacke, druge):
+    """Udaljenosti (km) svake tačke iz `tacke` do svake iz `druge`; obe su nizovi (lat, lon) u radijanima."""
+    dlat = druge[None, :, 0] - tacke[:, None, 0]
+    dlon = druge[None, :, 1] - tacke[:, None, 1]
+    a = np.sin(dlat / 2) ** 2 + np.cos(tacke[:, None, 0]) * np.cos(druge[None, :, 0]) * np.sin(dlon / 2) ** 2
+    return 2 * ZEMLJA_KM * np.arcsin(np.sqrt(a))
+
+
+class IndeksKomparabilnih:
+    """
+    Prostorni indeks oglasa (BallTree, haversine) za pitanje
+    "za koliko se prodaju slični stanovi u blizini?".
+    Novi oglasi idu u mali "delta" bafer koji se pretražuje direktno, dok ne bude vreme za novo stablo.
+    """
+
+    def __init__(self, df):
+        self._postavi(self._pripremi(df))
+        self.potpis = None  # potpis_dataseta iz kog je indeks poslednji put usklađen
+
+    @staticmethod
+    def _pripremi(df):
+        df = ocisti(df, GEO_KOLONE).drop_duplicates('Link', keep='last')
+        # Kopije: _spoji menja nizove na mestu, a pandas (copy-on-write) može vratiti nizove samo za čitanje.
+        # Oglas bez dela grada ostaje (uporediv je po lokaciji), ali sa None, a ne kao lažni deo grada 'nan'
+        return {
+            'link': df['Link'].astype(str).to_numpy(),
+            'deo_grada': df['Deo_Grada'].astype('string').to_numpy(dtype=object, na_value=None),
+            'kvadratura': df['Kvadratura_m2'].to_numpy(dtype=float, copy=True),
+            'cena': df['Cena_EUR'].to_numpy(dtype=float, copy=True),
+            'cena_m2': (df['Cena_EUR'] / df['Kvadratura_m2']).to_numpy(dtype=float, copy=True),
+            'koordinate': _radijani(df['Latitude'], df['Longitude']),
+        }
+
+    def _postavi(self, podaci):
+        self.podaci = podaci
+        self.stablo = BallTree(podaci['koordinate'], metric='haversine')
+        self.u_stablu = len(podaci['link'])  # Oglasi [0, u_stablu) su u stablu, ostali su delta
+
+    def __len__(self):
+        return len(self.podaci['link'])
+
+    def dodaj(self, df):
+        """Dodaje nove oglase i osvežava postojeće (npr. nova cena); vraća (dodato, izmenjeno)."""
+        return self._spoji(self._pripremi(df))
+
+    def azuriraj(self, df):
+        """
+        Usklađuje indeks sa celim dataset-om `df`: novi oglasi se dodaju, promenjeni osvežavaju,
+        a oni kojih više nema se uklanjaju. Vraća (dodato, izmenjeno, uklonjeno).
+        """
+        novi = self._pripremi(df)
+        ostaje = np.isin(self.podaci['link'], novi['link'])
+        uklonjeno = int((~ostaje).sum())
+        if uklonjeno:
+            # Uklanjanje pomera pozicije oglasa, pa se stablo gradi iznova
+            self._postavi({kljuc: niz[ostaje] for kljuc, niz in self.podaci.items()})
+        return self._spoji(novi) + (uklonjeno,)
+
+    def _spoji(self, novi):
+        pozicije = pd.Index(self.podaci['link']).get_indexer(novi['link'])
+        postoji = pozicije >= 0
+        stari = pozicije[postoji]
+        izmenjeno = np.zeros(len(stari), dtype=bool)
+        for kljuc in ('deo_grada', 'kvadratura', 'cena', 'koordinate'):
+            razlika = self.podaci[kljuc][stari] != novi[kljuc][postoji]
+            izmenjeno |= razlika.any(axis=1) if razlika.ndim > 1 else razlika
+        # Oglas iz stabla koji je promenio lokaciju: stablo bi ga našlo na staroj, pa se gradi iznova
+        pomeren = (self.podaci['koordinate'][stari] != novi['koordinate'][postoji]).any(axis=1)
+        pomeren &= stari < self.u_stablu
+        for kljuc in self.podaci:
+            self.podaci[kljuc][stari] = novi[kljuc][postoji]
+
+        self.podaci = {kljuc: np.concatenate([self.podaci[kljuc], novi[kljuc][~postoji]]) for kljuc in self.podaci}
+        if pomeren.any() or len(self) - self.u_stablu > MAX_DELTA:
+            self._postavi(self.podaci)
+        return int((~postoji).sum()), int(izmenjeno.sum())
+
+    def najblizi(self, lat, lon, kvadratura=None, k=K, tolerancija=TOLERANCIJA_KVADRATURE):
+        """
+        k najbližih oglasa za svaku tačku upita (nizovi iste dužine).
+        Ako je data `kvadratura`, uzimaju se samo stanovi unutar ±tolerancija.
+        Vraća (udaljenosti_km, indeksi), oba oblika (broj_upita, k); nepopunjena mesta su inf / -1.
+        """
+        tacke = _radijani(lat, lon)
+        kandidata = min(self.u_stablu, k * PREKOBROJ if kvadratura is not None else k)
+        udaljenosti, indeksi = self.stablo.query(tacke, k=kandidata) if kandidata else (
+            np.empty((len(tacke), 0)), np.empty((len(tacke), 0), dtype=int))
+        udaljenosti = udaljenosti * ZEMLJA_KM
+
+        if len(self) > self.u_stablu:
+            # Delta bafer je mali, pa ga pretražujemo direktno
+            udaljenosti = np.hstack([udaljenosti, _haversine_km(tacke, self.podaci['koordinate'][self.u_stablu:])])
+            indeksi = np.hstack([indeksi, np.broadcast_to(np.arange(self.u_stablu, len(self)),
+                                                          (len(tacke), len(self) - self.u_stablu))])
+
+        if kvadratura is not None:
+            kvadratura = np.asarray(kvadratura, dtype=float)[:, None]
+            kv_kandidata = self.podaci['kvadratura'][indeksi]
+            van_opsega = np.abs(kv_kandidata - kvadratura) > tolerancija * kvadratura
+            udaljenosti = np.where(van_opsega, np.inf, udaljenosti)
+
+        redosled = np.argsort(udaljenosti, axis=1, kind='stable')[:, :k]
+        udaljenosti = np.take_along_axis(udaljenosti, redosled, axis=1)
+        indeksi = np.where(np.isinf(udaljenosti), -1, np.take_along_axis(indeksi, redosled, axis=1))
+        if udaljenosti.shape[1] < k:
+            dopuna = k - udaljenosti.shape[1]
+            udaljenosti = np.pad(udaljenosti, ((0, 0), (0, dopuna)), constant_values=np.inf)
+            indeksi = np.pad(indeksi, ((0, 0), (0, dopuna)), constant_values=-1)
+        return udaljenosti, indeksi
+
+    def procena_cene_m2(self, lat, lon, kvadratura=None, k=K, tolerancija=TOLERANCIJA_KVADRATURE):
+        """Cena po m² kao prosek uporedivih oglasa ponderisan sa 1/udaljenost; NaN ako ih nema."""
+        udaljenosti, indeksi = self.najblizi(lat, lon, kvadratura, k, tolerancija)
+        vazi = indeksi >= 0
+        tezine = np.where(vazi, 1.0 / np.maximum(udaljenosti, MIN_UDALJENOST_KM), 0.0)
+        cene = np.where(vazi, self.podaci['cena_m2'][np.maximum(indeksi, 0)], 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (tezine * cene).sum(axis=1) / tezine.sum(axis=1)
+
+    def komparabilni(self, upiti, k=K, tolerancija=TOLERANCIJA_KVADRATURE):
+        """
+        Tabela uporedivih oglasa za DataFrame upita (Latitude, Longitude i opciono Kvadratura_m2),
+        jedan red po paru (upit, oglas), najbliži prvi.
+        """
+        kvadratura = upiti['Kvadratura_m2'] if 'Kvadratura_m2' in upiti else None
+        udaljenosti, indeksi = self.najblizi(upiti['Latitude'], upiti['Longitude'], kvadratura, k, tolerancija)
+        red, rang = np.nonzero(indeksi >= 0)
+        i = indeksi[red, rang]
+        return pd.DataFrame({
+            'Upit': upiti.index.to_numpy()[red],
+            'Rang': rang + 1,
+            'Udaljenost_km': udaljenosti[red, rang].round(3),
+            'Deo_Grada': pd.array(self.podaci['deo_grada'][i], dtype='string'),  # <NA> za oglase bez dela grada
+            'Kvadratura_m2': self.podaci['kvadratura'][i],
+            'Cena_EUR': self.podaci['cena'][i],
+            'Cena_po_m2': self.podaci['cena_m2'][i].round(2),
+            'Link': self.podaci['link'][i],
+        })
+
+    def sacuvaj(self, putanja=INDEKS_FAJL):
+        joblib.dump(self, putanja)
+
+    @staticmethod
+    def ucitaj(putanja=INDEKS_FAJL):
+        return joblib.load(putanja)
+
+
+def ucitaj_ili_izgradi(putanja=INDEKS_FAJL):
+    """
+    Sačuvan indeks, ili nov ako ga još nema. Dataset se čita samo ako se promenio od poslednjeg
+    usklađivanja (potpis fajlova), i tada se indeks usklađuje sa njim (vidi azuriraj).
+    """
+    potpis = potpis_dataseta(ULAZNI_DATASET)
+    indeks = IndeksKomparabilnih.ucitaj(putanja) if os.path.exists(putanja) else None
+    if indeks is not None and potpis and getattr(indeks, 'potpis', None) == potpis:
+        print(f"Učitan indeks sa {len(indeks)} oglasa (dataset se nije menjao).")
+        return indeks
+
+    df = ucitaj_dataset(ULAZNI_DATASET, kolone=KOLONE)
+    if indeks is not None:
+        dodato, izmenjeno, uklonjeno = indeks.azuriraj(df)
+        print(f"Učitan indeks sa {len(indeks)} oglasa "
+              f"({dodato} novih, {izmenjeno} izmenjenih, {uklonjeno} uklonjenih).")
+    else:
+        indeks = IndeksKomparabilnih(df)
+        print(f"Napravljen indeks sa {len(indeks)} oglasa.")
+    indeks.potpis = potpis
+    indeks.sacuvaj(putanja)
+    return indeks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uporedivi oglasi u blizini tačke (kNN po udaljenosti)")
+    parser.add_argument("--lat", type=float, required=True)
+    parser.add_argument("--lon", type=float, required=True)
+    parser.add_argument("--kvadratura", type=float, help="Traži samo stanove slične kvadrature")
+    parser.add_argument("--k", type=int, default=K)
+    parser.add_argument("--iznova", action="store_true", help="Izgradi indeks iznova iz dataset-a")
+    args = parser.parse_args()
+
+    if args.iznova and os.path.exists(INDEKS_FAJL):
+        os.remove(INDEKS_FAJL)
+    try:
+        indeks = ucitaj_ili_izgradi()
+    except FileNotFoundError:
+        print(f"Nema dataset-a {ULAZNI_DATASET}! Prvo pokreni geokodiranje.")
+        return
+
+    upit = pd.DataFrame({'Latitude': [args.lat], 'Longitude': [args.lon]})
+    if args.kvadratura:
+        upit['Kvadratura_m2'] = args.kvadratura
+
+    pocetak = time.perf_counter()
+    tabela = indeks.komparabilni(upit, k=args.k)
+    procena = indeks.procena_cene_m2(upit['Latitude'], upit['Longitude'], upit.get('Kvadratura_m2'), k=args.k)
+    trajanje_ms = (time.perf_counter() - pocetak) * 1000
+
+    print(tabela.drop(columns=['Upit', 'Link']).to_string(index=False))
+    print(f"\nProcena cene po m² (ponderisano udaljenošću): {procena[0]:,.0f} EUR")
+    if args.kvadratura and not np.isnan(procena[0]):
+        print(f"Procena za {args.kvadratura:g} m²: {procena[0] * args.kvadratura:,.0f} EUR")
+    print(f"Upit je trajao {trajanje_ms:.2f} ms.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,81 +1,251 @@
-import folium
-import pandas as pd
-
-# --- KONFIGURACIJA ---
-ULAZNI_FAJL = "nekretnine_ns_geo.csv"
-IZLAZNI_FAJL = "mapa_nekretnina_ns.html"
-
-# Centar Novog Sada (da mapa zna gde da se fokusira na početku)
-NS_KOORDINATE = [45.25167, 19.83694]
-
-
-def get_marker_color(cena_po_m2):
-    """Određuje boju markera na osnovu cene po kvadratu."""
-    if cena_po_m2 < 1800:
-        return 'green'  # Povoljno
-    elif cena_po_m2 < 2500:
-        return 'orange'  # Srednja klasa
-    else:
-        return 'red'  # Skupo / Luksuz
-
-
-def main():
-    print("Učitavam podatke...")
-    try:
-        df = pd.read_csv(ULAZNI_FAJL)
-    except FileNotFoundError:
-        print(f"Nema fajla {ULAZNI_FAJL}! Prvo pokreni geokodiranje.")
-        return
-
-    # Čišćenje podataka (samo oni sa koordinatama i cenom)
-    df = df.dropna(subset=['Latitude', 'Longitude', 'Cena_EUR', 'Kvadratura_m2'])
-
-    # Kreiramo osnovnu mapu
-    mapa = folium.Map(location=NS_KOORDINATE, zoom_start=13, tiles="OpenStreetMap")
-
-    print(f"Dodajem {len(df)} stanova na mapu...")
-
-    for index, row in df.iterrows():
-        # Izračunavamo cenu po kvadratu
-        cena_m2 = row['Cena_EUR'] / row['Kvadratura_m2']
-
-        # Pripremamo tekst za popup (HTML format)
-        popup_text = f"""
-        <div style="width: 200px">
-            <h4>{row['Deo_Grada']}</h4>
-            <b>Cena:</b> {row['Cena_EUR']:,.0f} EUR<br>
-            <b>Kvadratura:</b> {row['Kvadratura_m2']} m²<br>
-            <b>Cena po m²:</b> {cena_m2:,.0f} EUR<br>
-        </div>
-        """
-
-        # Dodajemo marker
-        folium.Marker(
-            location=[row['Latitude'], row['Longitude']],
-            popup=folium.Popup(popup_text, max_width=250),
-            tooltip=f"{row['Deo_Grada']} ({row['Cena_EUR']}€)",
-            icon=folium.Icon(color=get_marker_color(cena_m2), icon="home", prefix="fa")
-        ).add_to(mapa)
-
-    # Dodajemo legendu (mali trik sa HTML-om u mapi)
-    legend_html = '''
-     <div style="position: fixed; 
-     bottom: 50px; left: 50px; width: 150px; height: 130px; 
-     border:2px solid grey; z-index:9999; font-size:14px;
-     background-color:white; opacity: 0.9; padding: 10px;">
-     <b>Legenda (Cena/m²)</b><br>
-     <i style="background:green; width:10px; height:10px; display:inline-block;"></i> < 1.800 €<br>
-     <i style="background:orange; width:10px; height:10px; display:inline-block;"></i> 1.800 - 2.500 €<br>
-     <i style="background:red; width:10px; height:10px; display:inline-block;"></i> > 2.500 €
-     </div>
-     '''
-    mapa.get_root().html.add_child(folium.Element(legend_html))
-
-    # Čuvanje mape
-    mapa.save(IZLAZNI_FAJL)
-    print(f"Uspeh! Mapa je sačuvana kao '{IZLAZNI_FAJL}'.")
-    print("Otvori taj fajl u svom internet pregledaču (Chrome, Firefox...).")
-
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import argparse
+import json
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import FastMarkerCluster
+
+import metrike
+from ciscenje import GEO_KOLONE, ocisti_delove
+from dataset_io import citaj_delove
+from model_artefakt import predict
+
+# --- KONFIGURACIJA ---
+ULAZNI_DATASET = "nekretnine_ns_geo"  # .parquet ili .csv, vidi dataset_io.py
+KOLONE = ['Deo_Grada', 'Cena_EUR', 'Kvadratura_m2', 'Latitude', 'Longitude', 'Preciznost_Lokacije']
+IZLAZNI_FAJL = "mapa_nekretnina_ns.html"
+
+# Centar Novog Sada (da mapa zna gde da se fokusira na početku)
+NS_KOORDINATE = [45.25167, 19.83694]
+
+PRAG_POVOLJNO = 1800  # EUR/m², ispod je zeleno
+PRAG_SKUPO = 2500  # EUR/m², iznad je crveno
+MAX_MARKERA = 300  # Preko ovoga "auto" režim prelazi na klastere (pojedinačni markeri zamrzavaju pregledač)
+KORAK_CELIJE = 0.0025  # Stepeni; ćelija sloja sa prosečnom cenom je oko 280 x 200 m
+
+# Marker se pravi u pregledaču iz kompaktnog reda [lat, lon, cena, kvadratura, deo, procena, preciznost],
+# a popup tek kad se klikne, pa HTML nije ugrađen za svaki oglas
+KLASTER_CALLBACK = """(function () {
+    var DELOVI = %(delovi)s;
+    function eur(x) { return Math.round(x).toLocaleString('en-US'); }
+    return function (row) {
+        var cenaM2 = row[2] / row[3];
+        var boja = cenaM2 < %(povoljno)d ? 'green' : (cenaM2 < %(skupo)d ? 'orange' : 'red');
+        var marker = L.marker(new L.LatLng(row[0], row[1]));
+        marker.setIcon(L.AwesomeMarkers.icon({icon: 'home', prefix: 'fa', markerColor: boja}));
+        marker.bindTooltip(function () { return DELOVI[row[4]] + ' (' + row[2] + '€)'; });
+        marker.bindPopup(function () {
+            return '<div style="width: 200px"><h4>' + DELOVI[row[4]] + '</h4>'
+                + '<b>Cena:</b> ' + eur(row[2]) + ' EUR<br>'
+                + '<b>Kvadratura:</b> ' + row[3] + ' m²<br>'
+                + '<b>Cena po m²:</b> ' + eur(cenaM2) + ' EUR<br>'
+                + (row[6] === null ? '' : '<b>Lokacija:</b> ' + row[6] + '<br>')
+                + (row[5] === null ? '' : '<b>Procena modela:</b> ' + eur(row[5]) + ' EUR<br>')
+                + '</div>';
+        }, {maxWidth: 250});
+        return marker;
+    };
+})()"""
+
+
+def get_marker_color(cena_po_m2):
+    """Određuje boju markera na osnovu cene po kvadratu."""
+    if cena_po_m2 < PRAG_POVOLJNO:
+        return 'green'  # Povoljno
+    elif cena_po_m2 < PRAG_SKUPO:
+        return 'orange'  # Srednja klasa
+    else:
+        return 'red'  # Skupo / Luksuz
+
+
+def procene_modela(df):
+    """Procena cene iz sačuvanog modela (ml_model.py) za svaki oglas, ili None ako model još ne postoji."""
+    try:
+        return pd.Series(predict(df), index=df.index)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"{e} Mapa se pravi bez procene cene.")
+        return None
+
+
+def dodaj_markere(mapa, df, procene):
+    """Jedan folium.Marker sa ugrađenim popup-om po oglasu; pregledno, ali samo za manji broj oglasa."""
+    for index, row in df.iterrows():
+        # Izračunavamo cenu po kvadratu
+        cena_m2 = row['Cena_EUR'] / row['Kvadratura_m2']
+
+        procena = ""
+        if procene is not None:
+            procena = f"<b>Procena modela:</b> {procene[index]:,.0f} EUR<br>"
+
+        # Pripremamo tekst za popup (HTML format)
+        popup_text = f"""
+        <div style="width: 200px">
+            <h4>{row['Deo_Grada']}</h4>
+            <b>Cena:</b> {row['Cena_EUR']:,.0f} EUR<br>
+            <b>Kvadratura:</b> {row['Kvadratura_m2']} m²<br>
+            <b>Cena po m²:</b> {cena_m2:,.0f} EUR<br>
+            <b>Lokacija:</b> {row.get('Preciznost_Lokacije', 'deo_grada')}<br>
+            {procena}
+        </div>
+        """
+
+        # Dodajemo marker
+        folium.Marker(
+            location=[row['Latitude'], row['Longitude']],
+            popup=folium.Popup(popup_text, max_width=250),
+            tooltip=f"{row['Deo_Grada']} ({row['Cena_EUR']}€)",
+            icon=folium.Icon(color=get_marker_color(cena_m2), icon="home", prefix="fa")
+        ).add_to(mapa)
+
+
+def kompaktni_redovi(df, procene, sifre_delova):
+    """
+    Redovi [lat, lon, cena, kvadratura, deo, procena, preciznost] za KLASTER_CALLBACK. Deo grada je
+    šifra iz `sifre_delova` (naziv -> redni broj), koji se dopunjuje, pa svi delovi dataset-a dele iste šifre.
+    """
+    delovi = df['Deo_Grada'].astype('string').fillna('Nepoznato')
+    sifre, nazivi = pd.factorize(delovi)
+    globalne = np.array([sifre_delova.setdefault(naziv, len(sifre_delova)) for naziv in nazivi], dtype='int64')
+    procena = procene.round() if procene is not None else pd.Series(np.nan, index=df.index)
+    preciznost = df['Preciznost_Lokacije'] if 'Preciznost_Lokacije' in df else pd.Series(None, index=df.index)
+    redovi = pd.DataFrame({
+        'lat': df['Latitude'].round(6), 'lon': df['Longitude'].round(6),
+        'cena': df['Cena_EUR'].astype('int64'), 'kv': df['Kvadratura_m2'].round(2),
+        'deo': globalne[sifre], 'procena': procena.astype('object').where(procena.notna(), None),
+        'preciznost': preciznost.astype('object').where(preciznost.notna(), None),
+    })
+    return redovi.values.tolist()
+
+
+def dodaj_klaster(mapa, redovi, nazivi):
+    """Svi oglasi kao jedan sloj sa klasterima u pregledaču; veličina fajla raste samo za par brojeva po oglasu."""
+    callback = KLASTER_CALLBACK % {'delovi': json.dumps(list(nazivi), ensure_ascii=False),
+                                   'povoljno': PRAG_POVOLJNO, 'skupo': PRAG_SKUPO}
+    FastMarkerCluster(redovi, callback=callback, name="Stanovi").add_to(mapa)
+
+
+def zbir_celija(df):
+    """Zbir cene po m² i broj oglasa po ćeliji mreže (indeks: red i kolona ćelije); zbirovi delova se sabiraju."""
+    cena_m2 = df['Cena_EUR'] / df['Kvadratura_m2']
+    celija = [np.floor(df['Latitude'] / KORAK_CELIJE).astype('int64').rename('red'),
+              np.floor(df['Longitude'] / KORAK_CELIJE).astype('int64').rename('kolona')]
+    return cena_m2.groupby(celija).agg(zbir='sum', broj='count')
+
+
+def dodaj_prosek_cena(mapa, celije):
+    """
+    Prosečna cena po m² po ćeliji mreže, u bojama markera. Toplotna mapa sa cenom kao težinom
+    sabira susedne oglase, pa je pokazivala gustinu oglasa puta cenu, a ne koliko je kraj skup.
+    """
+    if celije is None or celije.empty:
+        return
+    prosek = celije['zbir'] / celije['broj']
+    oblasti = []
+    for (red, kolona), cena_m2 in prosek.items():
+        jug, zapad = round(red * KORAK_CELIJE, 6), round(kolona * KORAK_CELIJE, 6)
+        sever, istok = round(jug + KORAK_CELIJE, 6), round(zapad + KORAK_CELIJE, 6)
+        oblasti.append({
+            'type': 'Feature',
+            'geometry': {'type': 'Polygon',
+                         'coordinates': [[[zapad, jug], [istok, jug], [istok, sever], [zapad, sever], [zapad, jug]]]},
+            'properties': {'cena_m2': f"{cena_m2:,.0f} EUR", 'oglasa': int(celije.at[(red, kolona), 'broj']),
+                           'boja': get_marker_color(cena_m2)},
+        })
+    folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': oblasti},
+        name="Prosečna cena po m² (mreža)", show=False,
+        style_function=lambda oblast: {'fillColor': oblast['properties']['boja'], 'fillOpacity': 0.45, 'weight': 0},
+        tooltip=folium.GeoJsonTooltip(['cena_m2', 'oglasa'], aliases=['Prosek po m²:', 'Oglasa:']),
+    ).add_to(mapa)
+
+
+class SlojeviMape:
+    """
+    Skuplja ono što ide na mapu deo po deo dataset-a, bez spajanja delova u jedan DataFrame:
+    kompaktne redove za klaster, zbirove cena po ćelijama mreže i, dok ih nema više od `max_markera`
+    (None = bez granice), same oglase za pojedinačne markere.
+    """
+
+    def __init__(self, max_markera=MAX_MARKERA):
+        self.max_markera = max_markera
+        self.ukupno = 0
+        self.redovi, self.sifre_delova = [], {}
+        self.celije = None  # zbir_celija svih delova
+        self.za_markere = []  # (deo, procene); None kad oglasa ima previše za markere
+
+    def dodaj(self, df, procene=None):
+        self.ukupno += len(df)
+        self.redovi.extend(kompaktni_redovi(df, procene, self.sifre_delova))
+        zbir = zbir_celija(df)
+        self.celije = zbir if self.celije is None else self.celije.add(zbir, fill_value=0)
+        if self.za_markere is not None:
+            if self.max_markera is None or self.ukupno <= self.max_markera:
+                self.za_markere.append((df, procene))
+            else:
+                self.za_markere = None  # "auto" ide na klaster; oglasi za markere više ne trebaju
+
+    def nacrtaj(self, mapa, rezim="auto"):
+        """Dodaje slojeve na mapu i vraća režim koji je upotrebljen (auto: markeri dok ih ima dovoljno malo)."""
+        if rezim == "auto":
+            rezim = "markeri" if self.za_markere is not None else "klaster"
+        if rezim == "markeri":
+            for df, procene in self.za_markere:
+                dodaj_markere(mapa, df, procene)
+        else:
+            dodaj_klaster(mapa, self.redovi, self.sifre_delova)
+            dodaj_prosek_cena(mapa, self.celije)
+            folium.LayerControl().add_to(mapa)
+        return rezim
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interaktivna mapa oglasa")
+    parser.add_argument("--rezim", choices=["auto", "markeri", "klaster"], default="auto",
+                        help=f"markeri: marker sa popup-om po oglasu, klaster: jedan sloj sa klasterima "
+                             f"i prosečnom cenom po m² po ćelijama mreže, auto: klaster preko {MAX_MARKERA} oglasa")
+    args = parser.parse_args()
+
+    print("Učitavam podatke...")
+    # Čišćenje podataka (samo oni sa koordinatama i cenom, bez grešaka u unosu), isto kao za model.
+    # Dataset se čita deo po deo, a od svakog dela ostaje samo ono što ide na mapu (vidi SlojeviMape)
+    slojevi = SlojeviMape({"auto": MAX_MARKERA, "markeri": None, "klaster": 0}[args.rezim])
+    sa_modelom = True
+    try:
+        for deo in ocisti_delove(lambda: citaj_delove(ULAZNI_DATASET, kolone=KOLONE), GEO_KOLONE):
+            procene = procene_modela(deo) if sa_modelom else None
+            sa_modelom = procene is not None  # Nema modela; ne pokušavamo ponovo za svaki deo
+            slojevi.dodaj(deo, procene)
+    except FileNotFoundError:
+        print(f"Nema dataset-a {ULAZNI_DATASET}! Prvo pokreni geokodiranje.")
+        return
+
+    # Kreiramo osnovnu mapu
+    mapa = folium.Map(location=NS_KOORDINATE, zoom_start=13, tiles="OpenStreetMap")
+
+    rezim = slojevi.nacrtaj(mapa, args.rezim)
+    print(f"Dodato {slojevi.ukupno} stanova na mapu (režim: {rezim}).")
+
+    # Dodajemo legendu (mali trik sa HTML-om u mapi)
+    legend_html = '''
+     <div style="position: fixed; 
+     bottom: 50px; left: 50px; width: 150px; height: 130px; 
+     border:2px solid grey; z-index:9999; font-size:14px;
+     background-color:white; opacity: 0.9; padding: 10px;">
+     <b>Legenda (Cena/m²)</b><br>
+     <i style="background:green; width:10px; height:10px; display:inline-block;"></i> < 1.800 €<br>
+     <i style="background:orange; width:10px; height:10px; display:inline-block;"></i> 1.800 - 2.500 €<br>
+     <i style="background:red; width:10px; height:10px; display:inline-block;"></i> > 2.500 €
+     </div>
+     '''
+    mapa.get_root().html.add_child(folium.Element(legend_html))
+
+    # Čuvanje mape
+    mapa.save(IZLAZNI_FAJL)
+    print(f"Uspeh! Mapa je sačuvana kao '{IZLAZNI_FAJL}'.")
+    print("Otvori taj fajl u svom internet pregledaču (Chrome, Firefox...).")
+
+
+if __name__ == "__main__":
+    with metrike.faza("mapa"):
+        main()
\ No newline at end of file
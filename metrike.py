@@ -0,0 +1,165 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# resource postoji samo na Unix-u; na Windows-u najveću memoriju daje psutil (ako je instaliran)
+try:
+    import resource
+except ImportError:
+    resource = None
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# --- KONFIGURACIJA ---
+# Putanje se mogu promeniti i spolja (npr. iz pipeline.py ili cron-a) preko promenljivih okruženja
+METRIKE_FAJL = os.environ.get("NS_METRIKE", "metrike.jsonl")  # Jedan JSON red po završenoj fazi
+PROMETHEUS_FOLDER = os.environ.get("NS_METRIKE_PROM")  # Folder za node_exporter textfile; None = ne piše se
+PROFIL = os.environ.get("NS_PROFIL", "")  # "sve" ili imena faza odvojena zarezom: cProfile -> profil_<faza>.prof
+PROFIL_ALAT = os.environ.get("NS_PROFIL_ALAT", "cprofile")  # "cprofile" ili "pyinstrument" (ako je instaliran)
+PREFIKS_PROMETHEUS = "nekretnine"
+# Brojači protoka: samo za njih se u sažetku dodaje i stopa po sekundi (<ime>_po_s);
+# za ostale (npr. odbaceno_*, greske_konekcije) stopa kroz ukupno trajanje faze ne znači ništa
+BROJACI_PROTOKA = {"zahtevi", "bajtovi", "stranice", "oglasi", "predikcije", "procene"}
+
+_lock = threading.Lock()
+_brojaci = {}  # ime -> zbir
+_vremena = {}  # ime -> [broj, ukupno_s, max_s]
+_vrednosti = {}  # ime -> poslednja zabeležena vrednost
+
+
+def uvecaj(ime, n=1):
+    """Brojač (zahtevi, bajtovi, redovi...); bezbedno i iz više niti."""
+    with _lock:
+        _brojaci[ime] = _brojaci.get(ime, 0) + n
+
+
+def zabelezi(ime, vrednost):
+    """Pojedinačna vrednost (npr. stopa pogodaka keša); poslednja upisana pobeđuje."""
+    with _lock:
+        _vrednosti[ime] = vrednost
+
+
+def dodaj_vreme(ime, sekunde):
+    with _lock:
+        broj, ukupno, najduze = _vremena.get(ime, (0, 0.0, 0.0))
+        _vremena[ime] = (broj + 1, ukupno + sekunde, max(najduze, sekunde))
+
+
+@contextmanager
+def izmeri(ime):
+    """Meri trajanje bloka; više merenja istog imena daje broj, prosek i maksimum."""
+    pocetak = time.perf_counter()
+    try:
+        yield
+    finally:
+        dodaj_vreme(ime, time.perf_counter() - pocetak)
+
+
+def max_rss_mb():
+    """Najveća zauzeta memorija procesa do sada (MB), ili None ako nema ni resource ni psutil."""
+    if resource is not None:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024  # Linux daje KB, macOS bajtove
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        # Windows pamti vrh (peak_wset); drugde psutil daje samo trenutnu memoriju
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    return None
+
+
+def _profilise(ime):
+    return PROFIL == "sve" or ime in PROFIL.split(",")
+
+
+@contextmanager
+def _profiler(ime):
+    if not _profilise(ime):
+        yield
+        return
+    if PROFIL_ALAT == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            Profiler = None
+        if Profiler is not None:
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(f"profil_{ime}.html", "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+            return
+
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(f"profil_{ime}.prof")  # python -m pstats profil_<faza>.prof
+
+
+def sazetak(ime, trajanje):
+    """Sve prikupljeno u fazi kao jedan rečnik; za brojače protoka dodaje i stopu po sekundi."""
+    rss = max_rss_mb()
+    with _lock:
+        zapis = {'faza': ime, 'vreme': time.strftime("%Y-%m-%dT%H:%M:%S"), 'trajanje_s': round(trajanje, 3),
+                 'max_rss_mb': round(rss, 1) if rss is not None else None}
+        for naziv, zbir in _brojaci.items():
+            zapis[naziv] = zbir
+            if naziv in BROJACI_PROTOKA:
+                zapis[f"{naziv}_po_s"] = round(zbir / trajanje, 2) if trajanje > 0 else None
+        for naziv, (broj, ukupno, najduze) in _vremena.items():
+            zapis[f"{naziv}_broj"] = broj
+            zapis[f"{naziv}_ukupno_s"] = round(ukupno, 4)
+            zapis[f"{naziv}_prosek_ms"] = round(ukupno / broj * 1000, 3)
+            zapis[f"{naziv}_max_ms"] = round(najduze * 1000, 3)
+        zapis.update(_vrednosti)
+    return zapis
+
+
+def upisi_jsonl(zapis, putanja=METRIKE_FAJL):
+    with open(putanja, "a", encoding="utf-8") as f:
+        f.write(json.dumps(zapis, ensure_ascii=False) + "\n")
+
+
+def upisi_prometheus(zapis, folder=PROMETHEUS_FOLDER):
+    """Prometheus textfile format, fajl po fazi; menja se atomski da node_exporter ne pročita pola."""
+    faza = zapis['faza']
+    putanja = os.path.join(folder, f"{PREFIKS_PROMETHEUS}_{faza}.prom")
+    redovi = [f'{PREFIKS_PROMETHEUS}_{naziv}{{faza="{faza}"}} {vrednost}'
+              for naziv, vrednost in zapis.items()
+              if isinstance(vrednost, (int, float)) and not isinstance(vrednost, bool)]
+    privremeni = putanja + ".tmp"
+    with open(privremeni, "w", encoding="utf-8") as f:
+        f.write("\n".join(redovi) + "\n")
+    os.replace(privremeni, putanja)
+
+
+@contextmanager
+def faza(ime):
+    """
+    Obuhvata jednu fazu pipeline-a (npr. ceo main() skripte): na kraju upisuje trajanje,
+    najveću memoriju i sve brojače i merenja iz faze u metrike.jsonl (i Prometheus textfile ako je zadat folder).
+    """
+    with _lock:
+        _brojaci.clear()
+        _vremena.clear()
+        _vrednosti.clear()
+    pocetak = time.perf_counter()
+    try:
+        with _profiler(ime):
+            yield
+    finally:
+        zapis = sazetak(ime, time.perf_counter() - pocetak)
+        upisi_jsonl(zapis)
+        if PROMETHEUS_FOLDER:
+            upisi_prometheus(zapis)
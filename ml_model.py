@@ -1,75 +1,131 @@
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_absolute_error, r2_score
-
-# --- KONFIGURACIJA ---
-ULAZNI_FAJL = "nekretnine_ns_geo.csv"
-
-
-def main():
-    # 1. Učitavanje podataka
-    print("Učitavam podatke...")
-    try:
-        df = pd.read_csv(ULAZNI_FAJL)
-    except FileNotFoundError:
-        print(f"Nema fajla {ULAZNI_FAJL}! Prvo pokreni geokodiranje.")
-        return
-
-    # 2. Čišćenje podataka
-    # Izbacujemo redove gde nemamo koordinate ili cenu
-    initial_len = len(df)
-    df = df.dropna(subset=['Latitude', 'Longitude', 'Cena_EUR', 'Kvadratura_m2'])
-    print(f"Obrisano {initial_len - len(df)} redova zbog nedostajućih podataka.")
-
-    # Opciono: Izbacivanje ekstremnih vrednosti (npr. greške u unosu, stanovi od 1€)
-    df = df[df['Cena_EUR'] > 10000]
-
-    # 3. Priprema za ML
-    # X su ulazni podaci (Kvadratura, Lat, Lon, Deo Grada)
-    # y je ono što predviđamo (Cena)
-
-    # "One-Hot Encoding": Pretvaramo "Deo_Grada" u kolone npr. "Deo_Grada_Grbavica" (0 ili 1)
-    # Ovo pomaže modelu da razume koliko lokacija utiče na cenu.
-    X = df[['Kvadratura_m2', 'Latitude', 'Longitude', 'Deo_Grada']]
-    X = pd.get_dummies(X, columns=['Deo_Grada'], drop_first=True)
-
-    y = df['Cena_EUR']
-
-    # 4. Podela na Trening i Test set (80% učimo, 20% testiramo)
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-    print(f"\nTreniram model na {len(X_train)} stanova...")
-
-    # 5. Kreiranje i treniranje modela (Random Forest)
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
-    model.fit(X_train, y_train)
-
-    print("Model je istreniran! Testiram na neviđenim podacima...")
-
-    # 6. Evaluacija (Testiranje)
-    predikcije = model.predict(X_test)
-
-    # Koliko prosečno grešimo u eurima?
-    mae = mean_absolute_error(y_test, predikcije)
-    # Koliko dobro model "objašnjava" varijaciju cena (od 0 do 1, gde je 1 savršeno)
-    r2 = r2_score(y_test, predikcije)
-
-    print(f"\n--- REZULTATI ---")
-    print(f"Prosečna greška (MAE): {mae:,.0f} EUR")
-    print(f"Preciznost modela (R2 Score): {r2:.2f} (što bliže 1.0 to bolje)")
-
-    # 7. Primeri predviđanja
-    print("\n--- PRIMERI IZ TEST SETA (Stvarno vs Predviđeno) ---")
-    results = pd.DataFrame({'Stvarna Cena': y_test, 'Predviđena': predikcije})
-    results['Razlika'] = results['Stvarna Cena'] - results['Predviđena']
-    print(results.head(5))
-
-    # --- BONUS: Koje osobine su najvažnije za cenu? ---
-    print("\n--- ŠTA NAJVIŠE UTIČE NA CENU? ---")
-    feature_importances = pd.Series(model.feature_importances_, index=X.columns)
-    print(feature_importances.nlargest(5))
-
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import time
+
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.metrics import mean_absolute_error, r2_score
+
+import metrike
+from ciscenje import GEO_KOLONE, ocisti
+from dataset_io import ucitaj_dataset
+from model_artefakt import KOLONE_ULAZA, MODELI_FOLDER, KoderDelova, sacuvaj_artefakt
+
+# --- KONFIGURACIJA ---
+ULAZNI_DATASET = "nekretnine_ns_geo"  # .parquet ili .csv, vidi dataset_io.py
+KOLONE = ['Cena_EUR', 'Kvadratura_m2', 'Latitude', 'Longitude', 'Deo_Grada', 'Link']
+MIN_OGLASA_PO_DELU = 2  # Ređi delovi grada (i oni kojih nije bilo u treningu) idu u zajedničku "ostalo" kolonu
+
+
+def ucitaj_podatke():
+    """Učitava i čisti geo dataset; vraća None ako dataset ne postoji."""
+    print("Učitavam podatke...")
+    try:
+        # Čitamo samo kolone koje model koristi
+        df = ucitaj_dataset(ULAZNI_DATASET, kolone=KOLONE)
+    except FileNotFoundError:
+        print(f"Nema dataset-a {ULAZNI_DATASET}! Prvo pokreni geokodiranje.")
+        return None
+
+    # 2. Čišćenje podataka (ciscenje.py): bez koordinata ili cene, nemoguće vrednosti
+    # (npr. greške u unosu, stanovi od 1€) i ekstremne cene po m² unutar dela grada
+    initial_len = len(df)
+    df = ocisti(df, GEO_KOLONE)
+    print(f"Obrisano {initial_len - len(df)} redova (nedostajući podaci ili odstupanja).")
+    return df
+
+
+def napravi_koder():
+    """
+    "One-Hot Encoding" za Deo_Grada, naučen jednom pri treningu i sačuvan uz model:
+    vokabular delova grada je fiksan, pa trening i predviđanje uvek dobijaju iste kolone.
+    Retki i nepoznati delovi grada padaju u zajedničku kolonu "Deo_Grada___ostalo__" (model_artefakt.KoderDelova).
+    """
+    return ColumnTransformer(
+        [('deo_grada', KoderDelova(MIN_OGLASA_PO_DELU), ['Deo_Grada'])],
+        remainder='passthrough',  # Kvadratura, Lat, Lon idu neizmenjeni
+        sparse_threshold=1.0,  # Uvek retka matrica, i sa stotinama delova grada ostaje mala
+        verbose_feature_names_out=False,
+    )
+
+
+def napravi_pipeline(model, memory=None):
+    """Koder + model u jednom objektu; to je ono što se čuva kao artefakt. `memory` kešira naučeni koder."""
+    return Pipeline([('koder', napravi_koder()), ('model', model)], memory=memory)
+
+
+def napravi_X_y(df):
+    # X su ulazni podaci (Kvadratura, Lat, Lon, Deo Grada), kodiranje radi pipeline
+    # y je ono što predviđamo (Cena)
+    X = df[KOLONE_ULAZA].astype({'Deo_Grada': 'object'})
+    y = df['Cena_EUR']
+    return X, y
+
+
+def podeli(X, y):
+    # 80% učimo, 20% testiramo; fiksan random_state da i vizualizacija dobije isti test set
+    return train_test_split(X, y, test_size=0.2, random_state=42)
+
+
+def main():
+    # 1. Učitavanje i čišćenje podataka
+    df = ucitaj_podatke()
+    if df is None:
+        return
+
+    # 3. Priprema za ML
+    X, y = napravi_X_y(df)
+
+    # 4. Podela na Trening i Test set
+    X_train, X_test, y_train, y_test = podeli(X, y)
+
+    print(f"\nTreniram model na {len(X_train)} stanova...")
+
+    # 5. Kreiranje i treniranje modela (Random Forest)
+    model = napravi_pipeline(RandomForestRegressor(n_estimators=100, random_state=42))
+    # Isto što i model.fit, ali u dva koraka, da se posebno vidi koliko traje pravljenje obeležja
+    pocetak = time.perf_counter()
+    X_train_kodirano = model['koder'].fit_transform(X_train)
+    metrike.zabelezi("obelezja_redova_po_s", round(len(X_train) / max(time.perf_counter() - pocetak, 1e-9)))
+    with metrike.izmeri("fit"):
+        model['model'].fit(X_train_kodirano, y_train)
+
+    print("Model je istreniran! Testiram na neviđenim podacima...")
+
+    # 6. Evaluacija (Testiranje)
+    with metrike.izmeri("predict"):
+        predikcije = model.predict(X_test)
+    metrike.uvecaj("predikcije", len(X_test))
+
+    # Koliko prosečno grešimo u eurima?
+    mae = mean_absolute_error(y_test, predikcije)
+    # Koliko dobro model "objašnjava" varijaciju cena (od 0 do 1, gde je 1 savršeno)
+    r2 = r2_score(y_test, predikcije)
+
+    print(f"\n--- REZULTATI ---")
+    print(f"Prosečna greška (MAE): {mae:,.0f} EUR")
+    print(f"Preciznost modela (R2 Score): {r2:.2f} (što bliže 1.0 to bolje)")
+
+    # 7. Primeri predviđanja
+    print("\n--- PRIMERI IZ TEST SETA (Stvarno vs Predviđeno) ---")
+    results = pd.DataFrame({'Stvarna Cena': y_test, 'Predviđena': predikcije})
+    results['Razlika'] = results['Stvarna Cena'] - results['Predviđena']
+    print(results.head(5))
+
+    # --- BONUS: Koje osobine su najvažnije za cenu? ---
+    print("\n--- ŠTA NAJVIŠE UTIČE NA CENU? ---")
+    feature_importances = pd.Series(model['model'].feature_importances_,
+                                    index=model['koder'].get_feature_names_out())
+    print(feature_importances.nlargest(5))
+
+    # 8. Čuvanje: koder + model i metrike kao verzionisani artefakt
+    verzija = sacuvaj_artefakt(model, {'mae': mae, 'r2': r2},
+                               meta={'broj_redova': len(df), 'broj_za_trening': len(X_train)},
+                               linkovi=df['Link'].dropna())
+    print(f"\nModel sačuvan kao verzija {verzija} (folder '{MODELI_FOLDER}').")
+
+
+if __name__ == "__main__":
+    with metrike.faza("trening"):
+        main()
\ No newline at end of file
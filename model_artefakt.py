@@ -0,0 +1,150 @@
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.preprocessing import OneHotEncoder
+
+import metrike
+
+# --- KONFIGURACIJA ---
+MODELI_FOLDER = "modeli"
+POSLEDNJI = "poslednji.json"  # Pokazivač na trenutno aktivnu verziju
+FORMAT_ARTEFAKTA = 2  # 2: pipeline sa naučenim koderom (1: model + kolone iz pd.get_dummies)
+KOLONE_ULAZA = ['Kvadratura_m2', 'Latitude', 'Longitude', 'Deo_Grada']
+OSTALO = "__ostalo__"  # Nivo za retke i nepoznate delove grada; kolona postoji uvek
+
+
+class KoderDelova(BaseEstimator, TransformerMixin):
+    """
+    One-hot za Deo_Grada sa uvek prisutnom kolonom OSTALO (koder iz ml_model.napravi_koder).
+    Delovi grada sa manje od `min_oglasa` oglasa u treningu, oni kojih u treningu nije bilo i oni bez
+    naziva dobijaju tu kolonu, a ne red samih nula (što bi dobili da su svi delovi u treningu česti).
+    Klasa je ovde, a ne u skripti ml_model.py, da bi se sačuvani model učitavao iz svakog procesa.
+    """
+
+    def __init__(self, min_oglasa=1):
+        self.min_oglasa = min_oglasa
+
+    @staticmethod
+    def _delovi(X):
+        return pd.Series(np.asarray(X, dtype=object).ravel())
+
+    def _spoji_retke(self, X):
+        delovi = self._delovi(X)
+        return delovi.where(delovi.isin(self.vokabular_), OSTALO).to_numpy(dtype=object).reshape(-1, 1)
+
+    def fit(self, X, y=None):
+        broj = self._delovi(X).dropna().value_counts()
+        self.kategorije_ = sorted(broj.index)  # Svi delovi grada iz treninga
+        self.vokabular_ = sorted(broj.index[broj >= self.min_oglasa])  # Oni sa svojom kolonom
+        self.koder_ = OneHotEncoder(categories=[self.vokabular_ + [OSTALO]], sparse_output=True)
+        self.koder_.fit(self._spoji_retke(X))
+        return self
+
+    def transform(self, X):
+        return self.koder_.transform(self._spoji_retke(X))
+
+    def get_feature_names_out(self, input_features=None):
+        return self.koder_.get_feature_names_out(['Deo_Grada'])
+
+
+def _putanje(verzija, folder=MODELI_FOLDER):
+    return (os.path.join(folder, f"cena_{verzija}.joblib"),
+            os.path.join(folder, f"cena_{verzija}.json"))
+
+
+def pripremi_X(df, kolone=KOLONE_ULAZA):
+    """Samo ulazne kolone; kodiranje delova grada radi koder sačuvan u pipeline-u."""
+    return df[kolone].astype({'Deo_Grada': 'object'})
+
+
+def _nova_verzija(folder=MODELI_FOLDER):
+    """
+    Ime nove verzije (vreme do sekunde, uz -2, -3... ako je ta sekunda zauzeta) i otvoren, tek
+    napravljen .json fajl: pravi se sa 'x', pa dva čuvanja iste sekunde ne mogu da pregaze jedno drugo.
+    """
+    osnova = datetime.now().strftime("%Y%m%d-%H%M%S")
+    redni = 1
+    while True:
+        verzija = osnova if redni == 1 else f"{osnova}-{redni}"
+        try:
+            return verzija, open(_putanje(verzija, folder)[1], "x", encoding="utf-8")
+        except FileExistsError:
+            redni += 1
+
+
+def sacuvaj_artefakt(model, rezultati, meta=None, linkovi=(), folder=MODELI_FOLDER):
+    """
+    Čuva pipeline (koder + model) i metrike (`rezultati`) kao novu verziju i postavlja je za aktivnu.
+    `linkovi` su oglasi koje je model već video; azuriranje_modela.py po njima prepoznaje nove.
+    """
+    os.makedirs(folder, exist_ok=True)
+    verzija, f = _nova_verzija(folder)
+    putanja_modela, _ = _putanje(verzija, folder)
+
+    koder = model['koder']
+    with f:
+        joblib.dump({'format': FORMAT_ARTEFAKTA, 'model': model, 'kolone': KOLONE_ULAZA,
+                     'linkovi': sorted(set(linkovi))}, putanja_modela)
+        json.dump({
+            'verzija': verzija,
+            'format': FORMAT_ARTEFAKTA,
+            'sklearn': sklearn.__version__,
+            'kolone': KOLONE_ULAZA,
+            'obelezja': list(koder.get_feature_names_out()),
+            'vokabular_delova': [str(d) for d in koder.named_transformers_['deo_grada'].kategorije_],
+            'metrike': rezultati,
+            **(meta or {}),
+        }, f, ensure_ascii=False, indent=2)
+
+    with open(os.path.join(folder, POSLEDNJI), "w", encoding="utf-8") as f:
+        json.dump({'verzija': verzija}, f)
+
+    ucitaj_artefakt.cache_clear()
+    return verzija
+
+
+def aktivna_verzija(folder=MODELI_FOLDER):
+    putanja = os.path.join(folder, POSLEDNJI)
+    if not os.path.exists(putanja):
+        raise FileNotFoundError(f"Nema sačuvanog modela u '{folder}'. Prvo pokreni ml_model.py.")
+    with open(putanja, encoding="utf-8") as f:
+        return json.load(f)['verzija']
+
+
+@lru_cache(maxsize=4)
+def ucitaj_artefakt(verzija=None, folder=MODELI_FOLDER):
+    """Vraća (pipeline, ulazne kolone, meta); isti artefakt se u procesu učitava samo jednom."""
+    verzija = verzija or aktivna_verzija(folder)
+    putanja_modela, putanja_meta = _putanje(verzija, folder)
+
+    # mmap_mode: veliki numpy nizovi stabala se mapiraju iz fajla umesto da se kopiraju u memoriju
+    artefakt = joblib.load(putanja_modela, mmap_mode='r')
+    if artefakt.get('format') != FORMAT_ARTEFAKTA:
+        raise ValueError(f"Model '{verzija}' je u starom formatu. Pokreni ponovo ml_model.py.")
+    with open(putanja_meta, encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get('sklearn') != sklearn.__version__:
+        print(f"UPOZORENJE: model je sačuvan sa sklearn {meta.get('sklearn')}, a koristi se {sklearn.__version__}.")
+    return artefakt['model'], artefakt['kolone'], meta
+
+
+def poznati_linkovi(verzija=None, folder=MODELI_FOLDER):
+    """Skup linkova oglasa koji su bili u podacima kad je verzija napravljena."""
+    putanja_modela, _ = _putanje(verzija or aktivna_verzija(folder), folder)
+    return set(joblib.load(putanja_modela, mmap_mode='r').get('linkovi', []))
+
+
+def predict(df, verzija=None):
+    """Predviđa cenu (EUR) za svaki red u `df` pomoću sačuvanog modela, bez ponovnog treniranja."""
+    model, kolone, _ = ucitaj_artefakt(verzija)
+    with metrike.izmeri("predict_artefakt"):
+        predikcije = model.predict(pripremi_X(df, kolone))
+    metrike.uvecaj("predikcije", len(df))
+    return predikcije
@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import aiohttp
+import numpy as np
+import pandas as pd
+
+from geokoderi import GAZETIR_FAJL
+
+# --- KONFIGURACIJA ---
+URL = "http://127.0.0.1:8080"  # Gde radi servis.py
+ZAHTEVA = 5000
+ISTOVREMENO = 50  # Koliko zahteva je istovremeno u letu
+OGLASA_PO_ZAHTEVU = 1  # >1 šalje batch-eve
+UDEO_PONOVLJENIH = 0.5  # Deo oglasa koji ponavlja nešto iz male grupe čestih upita (pogoci keša)
+CESTIH_UPITA = 200
+UDEO_SA_KOORDINATAMA = 0.5  # Ostali šalju samo deo grada, pa servis uzima centroid iz gazetira
+SEME = 42
+CEKANJE_SERVISA = 30  # s, za --pokreni
+FOLDER_SKRIPTI = os.path.dirname(os.path.abspath(__file__))
+
+
+def slucajni_oglasi(n, rng, delovi):
+    """Oglasi kao u zahtevu: kvadratura, deo grada i (ponekad) koordinate malo pomerene od centroida."""
+    izbor = delovi.iloc[rng.integers(0, len(delovi), n)].reset_index(drop=True)
+    oglasi = []
+    for i, red in izbor.iterrows():
+        oglas = {'Kvadratura_m2': float(rng.integers(25, 120)), 'Deo_Grada': red['Deo_Grada']}
+        if rng.random() < UDEO_SA_KOORDINATAMA:
+            oglas['Latitude'] = round(red['Latitude'] + rng.normal(0, 0.003), 6)
+            oglas['Longitude'] = round(red['Longitude'] + rng.normal(0, 0.003), 6)
+        oglasi.append(oglas)
+    return oglasi
+
+
+def napravi_zahteve(broj, po_zahtevu, seme=SEME):
+    """Tela zahteva: mešavina čestih (iz keša) i novih upita; isto seme daje iste zahteve."""
+    rng = np.random.default_rng(seme)
+    delovi = pd.read_csv(GAZETIR_FAJL, usecols=['Deo_Grada', 'Latitude', 'Longitude'])
+    cesti = slucajni_oglasi(CESTIH_UPITA, rng, delovi)
+    novi = iter(slucajni_oglasi(broj * po_zahtevu, rng, delovi))
+    zahtevi = []
+    for _ in range(broj):
+        oglasi = [cesti[rng.integers(len(cesti))] if rng.random() < UDEO_PONOVLJENIH else next(novi)
+                  for _ in range(po_zahtevu)]
+        zahtevi.append(oglasi[0] if po_zahtevu == 1 else {'oglasi': oglasi})
+    return zahtevi
+
+
+async def posalji_sve(url, zahtevi, istovremeno):
+    """Šalje zahteve sa najviše `istovremeno` u letu; vraća (trajanja u ms, statusi) po zahtevu."""
+    trajanja, statusi = [], []
+    red = asyncio.Queue()
+    for telo in zahtevi:
+        red.put_nowait(telo)
+
+    async def radnik(sesija):
+        while not red.empty():
+            telo = red.get_nowait()
+            pocetak = time.perf_counter()
+            try:
+                async with sesija.post(f"{url}/procena", json=telo) as odgovor:
+                    await odgovor.read()
+                    statusi.append(odgovor.status)
+            except aiohttp.ClientError:
+                statusi.append("greška veze")
+            trajanja.append((time.perf_counter() - pocetak) * 1000)
+
+    konektor = aiohttp.TCPConnector(limit=istovremeno)
+    async with aiohttp.ClientSession(connector=konektor) as sesija:
+        await asyncio.gather(*(radnik(sesija) for _ in range(istovremeno)))
+    return np.array(trajanja), statusi
+
+
+async def zdravlje(url):
+    async with aiohttp.ClientSession() as sesija:
+        async with sesija.get(f"{url}/zdravlje") as odgovor:
+            return await odgovor.json()
+
+
+def sacekaj_servis(url, proces, rok=CEKANJE_SERVISA):
+    kraj = time.monotonic() + rok
+    while time.monotonic() < kraj:
+        if proces.poll() is not None:
+            raise RuntimeError("servis.py se ugasio pri pokretanju (da li postoji sačuvan model?).")
+        try:
+            return asyncio.run(zdravlje(url))
+        except aiohttp.ClientError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Servis nije odgovorio za {rok} s.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test opterećenja servis.py (lokalno)")
+    parser.add_argument("--url", default=URL)
+    parser.add_argument("--zahteva", type=int, default=ZAHTEVA)
+    parser.add_argument("--istovremeno", type=int, default=ISTOVREMENO)
+    parser.add_argument("--batch", type=int, default=OGLASA_PO_ZAHTEVU, help="Oglasa po zahtevu")
+    parser.add_argument("--pokreni", action="store_true",
+                        help="Pokreni servis.py na portu iz --url za vreme testa (model iz ./modeli)")
+    args = parser.parse_args()
+
+    zahtevi = napravi_zahteve(args.zahteva, args.batch)
+    proces = None
+    if args.pokreni:
+        port = args.url.rsplit(":", 1)[-1].strip("/")
+        proces = subprocess.Popen([sys.executable, os.path.join(FOLDER_SKRIPTI, "servis.py"), "--port", port],
+                                  stdout=subprocess.DEVNULL)
+    try:
+        if proces is not None:
+            sacekaj_servis(args.url, proces)
+        pre = asyncio.run(zdravlje(args.url))
+        print(f"Servis: model {pre['verzija']}; šaljem {args.zahteva} zahteva "
+              f"({args.batch} oglasa po zahtevu, {args.istovremeno} istovremeno)...")
+
+        pocetak = time.perf_counter()
+        trajanja, statusi = asyncio.run(posalji_sve(args.url, zahtevi, args.istovremeno))
+        ukupno = time.perf_counter() - pocetak
+        posle = asyncio.run(zdravlje(args.url))
+    except (aiohttp.ClientError, RuntimeError) as e:
+        print(f"Servis nije dostupan na {args.url}: {e}")
+        sys.exit(1)
+    finally:
+        if proces is not None:
+            proces.terminate()
+            proces.wait()
+
+    pogoci = posle['kes']['pogoci'] - pre['kes']['pogoci']
+    promasaji = posle['kes']['promasaji'] - pre['kes']['promasaji']
+    p50, p95, p99 = np.percentile(trajanja, [50, 95, 99])
+    uspesnih = statusi.count(200)
+    print(json.dumps({
+        'zahteva_po_s': round(len(statusi) / ukupno, 1),
+        'oglasa_po_s': round(len(statusi) * args.batch / ukupno, 1),
+        'p50_ms': round(p50, 2), 'p95_ms': round(p95, 2), 'p99_ms': round(p99, 2), 'max_ms': round(trajanja.max(), 2),
+        'uspesnih': uspesnih, 'gresaka': len(statusi) - uspesnih,
+        'stopa_pogodaka_kesa': round(pogoci / (pogoci + promasaji), 3) if pogoci + promasaji else None,
+    }, ensure_ascii=False, indent=2))
+    if uspesnih < len(statusi):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
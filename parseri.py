@@ -0,0 +1,229 @@
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml i selectolax su opcioni; bez njih radi samo 'bs4' backend
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# --- KONFIGURACIJA ---
+FIKSTURA = "debug_page.html"  # Sačuvana stranica sa kojom svi backend-i moraju dati iste zapise
+SAJT = "https://www.nekretnine.rs"
+
+KOLONE = ['Naslov', 'Lokacija', 'Cena_Tekst', 'Kvadratura_Tekst', 'Link']  # Ključevi svakog zapisa
+
+
+def napravi_zapis(naslov, href, lokacija, cena_tekst, kvadratura_tekst):
+    """
+    Zajednički zapis za sve backend-e: cena i kvadratura ostaju tekst sa sajta ("66 950 €", "34 m²").
+    U brojeve ih za celu tabelu odjednom pretvara ciscenje.ocisti_oglase.
+    """
+    return {
+        'Naslov': naslov,
+        'Lokacija': lokacija,
+        'Cena_Tekst': cena_tekst,
+        'Kvadratura_Tekst': kvadratura_tekst,
+        'Link': SAJT + href if href is not None else "N/A"
+    }
+
+
+# --- BACKEND: BeautifulSoup ---
+
+def _parsiraj_bs4(html, features='html.parser', samo_oglasi=False):
+    # SoupStrainer gradi stablo samo za kontejnere oglasa umesto za celu stranicu
+    strainer = SoupStrainer('div', class_='row offer') if samo_oglasi else None
+    soup = BeautifulSoup(html, features, parse_only=strainer)
+
+    podaci = []
+    for oglas in soup.find_all('div', class_='row offer'):
+        naslov, href = "N/A", None
+        naslov_tag = oglas.find('h2', class_='offer-title')
+        if naslov_tag:
+            a_tag = naslov_tag.find('a')
+            if a_tag:
+                if not a_tag.has_attr('href'):
+                    continue
+                naslov, href = a_tag.get_text(strip=True), a_tag['href']
+
+        lokacija_tag = oglas.find('p', class_='offer-location')
+        lokacija = lokacija_tag.get_text(strip=True) if lokacija_tag else "N/A"
+
+        # Prvi 'offer-price' je cena, osim ako je to zapravo kvadratura ('offer-price--invert')
+        cena_tekst = None
+        cena_container = oglas.find('p', class_='offer-price')
+        if cena_container and 'offer-price--invert' not in cena_container.get('class', []):
+            span = cena_container.find('span')
+            cena_tekst = span.get_text(strip=True) if span else None
+
+        kvadratura_tekst = None
+        kvad_container = oglas.find('p', class_='offer-price--invert')
+        if kvad_container:
+            span = kvad_container.find('span')
+            kvadratura_tekst = span.get_text(strip=True) if span else None
+
+        podaci.append(napravi_zapis(naslov, href, lokacija, cena_tekst, kvadratura_tekst))
+
+    return podaci
+
+
+# --- BACKEND: lxml (XPath) ---
+
+def _klasa(ime):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {ime} ')"
+
+
+XP_OGLASI = "//div[@class='row offer']"
+XP_NASLOV = f".//h2[{_klasa('offer-title')}][1]"
+XP_LOKACIJA = f".//p[{_klasa('offer-location')}][1]"
+XP_CENA = f".//p[{_klasa('offer-price')}][1]"
+XP_KVADRATURA = f".//p[{_klasa('offer-price--invert')}][1]"
+
+
+def _tekst_lxml(el):
+    # Isto kao bs4 get_text(strip=True): svaki tekstualni čvor se skrati, pa se spoje bez razmaka
+    return ''.join(t.strip() for t in el.xpath('.//text()'))
+
+
+def _prvi(el, xpath):
+    nadjeni = el.xpath(xpath)
+    return nadjeni[0] if nadjeni else None
+
+
+def _parsiraj_lxml(html):
+    stablo = lxml.html.fromstring(html)
+
+    podaci = []
+    for oglas in stablo.xpath(XP_OGLASI):
+        naslov, href = "N/A", None
+        naslov_tag = _prvi(oglas, XP_NASLOV)
+        if naslov_tag is not None:
+            a_tag = _prvi(naslov_tag, './/a')
+            if a_tag is not None:
+                href = a_tag.get('href')
+                if href is None:
+                    continue
+                naslov = _tekst_lxml(a_tag)
+
+        lokacija_tag = _prvi(oglas, XP_LOKACIJA)
+        lokacija = _tekst_lxml(lokacija_tag) if lokacija_tag is not None else "N/A"
+
+        cena_tekst = None
+        cena_container = _prvi(oglas, XP_CENA)
+        if cena_container is not None and 'offer-price--invert' not in cena_container.get('class', '').split():
+            span = _prvi(cena_container, './/span')
+            cena_tekst = _tekst_lxml(span) if span is not None else None
+
+        kvadratura_tekst = None
+        kvad_container = _prvi(oglas, XP_KVADRATURA)
+        if kvad_container is not None:
+            span = _prvi(kvad_container, './/span')
+            kvadratura_tekst = _tekst_lxml(span) if span is not None else None
+
+        podaci.append(napravi_zapis(naslov, href, lokacija, cena_tekst, kvadratura_tekst))
+
+    return podaci
+
+
+# --- BACKEND: selectolax (lexbor, CSS selektori) ---
+
+def _parsiraj_selectolax(html):
+    stablo = LexborHTMLParser(html)
+
+    podaci = []
+    for oglas in stablo.css('div[class="row offer"]'):
+        naslov, href = "N/A", None
+        naslov_tag = oglas.css_first('h2.offer-title')
+        if naslov_tag is not None:
+            a_tag = naslov_tag.css_first('a')
+            if a_tag is not None:
+                href = a_tag.attributes.get('href')
+                if href is None:
+                    continue
+                naslov = a_tag.text(strip=True)
+
+        lokacija_tag = oglas.css_first('p.offer-location')
+        lokacija = lokacija_tag.text(strip=True) if lokacija_tag is not None else "N/A"
+
+        cena_tekst = None
+        cena_container = oglas.css_first('p.offer-price')
+        klase = (cena_container.attributes.get('class') or '').split() if cena_container is not None else []
+        if cena_container is not None and 'offer-price--invert' not in klase:
+            span = cena_container.css_first('span')
+            cena_tekst = span.text(strip=True) if span is not None else None
+
+        kvadratura_tekst = None
+        kvad_container = oglas.css_first('p.offer-price--invert')
+        if kvad_container is not None:
+            span = kvad_container.css_first('span')
+            kvadratura_tekst = span.text(strip=True) if span is not None else None
+
+        podaci.append(napravi_zapis(naslov, href, lokacija, cena_tekst, kvadratura_tekst))
+
+    return podaci
+
+
+def _parsiraj_bs4_oglasi(html):
+    return _parsiraj_bs4(html, 'lxml' if lxml else 'html.parser', samo_oglasi=True)
+
+
+BACKENDI = {
+    'bs4': _parsiraj_bs4,
+    'bs4-oglasi': _parsiraj_bs4_oglasi,
+}
+if lxml is not None:
+    BACKENDI['lxml'] = _parsiraj_lxml
+if LexborHTMLParser is not None:
+    BACKENDI['selectolax'] = _parsiraj_selectolax
+
+
+def podrazumevani_backend():
+    """Najbrži dostupni backend."""
+    for ime in ('selectolax', 'lxml', 'bs4-oglasi'):
+        if ime in BACKENDI:
+            return ime
+    return 'bs4'
+
+
+def parsiraj_html(html, backend=None):
+    backend = backend or podrazumevani_backend()
+    if backend not in BACKENDI:
+        raise ValueError(f"Nepoznat ili nedostupan parser '{backend}'. Dostupni: {', '.join(BACKENDI)}")
+    return BACKENDI[backend](html)
+
+
+def proveri_paritet(putanja=FIKSTURA, ponavljanja=20):
+    """Svi backend-i moraju dati iste zapise kao referentni 'bs4'; ispisuje i brzinu svakog."""
+    with open(putanja, encoding='utf-8') as f:
+        html = f.read()
+
+    referenca = parsiraj_html(html, 'bs4')
+    print(f"Referentni 'bs4' parser: {len(referenca)} oglasa u '{putanja}'.")
+
+    vremena = {}
+    ok = True
+    for ime in BACKENDI:
+        rezultat = parsiraj_html(html, ime)
+        if rezultat != referenca:
+            print(f"[GREŠKA] Backend '{ime}' vraća drugačije zapise!")
+            ok = False
+
+        pocetak = time.perf_counter()
+        for _ in range(ponavljanja):
+            parsiraj_html(html, ime)
+        vremena[ime] = (time.perf_counter() - pocetak) / ponavljanja
+
+    for ime, vreme in vremena.items():
+        print(f"{ime:>12}: {vreme * 1000:7.1f} ms/stranici  ({vremena['bs4'] / vreme:4.1f}x)")
+
+    return ok
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if proveri_paritet() else 1)
@@ -0,0 +1,243 @@
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from dataset_io import danasnji_datum, putanja_csv, putanja_parquet
+
+# --- KONFIGURACIJA ---
+STANJE_FAJL = "pipeline_stanje.json"  # Hash ulaza/izlaza svake uspešno završene faze
+PARALELNO = 2  # Koliko nezavisnih faza sme da radi istovremeno
+FOLDER_SKRIPTI = os.path.dirname(os.path.abspath(__file__))
+# Pokazivač na aktivnu verziju modela (model_artefakt.py); ulaz svake faze koja čita model
+AKTIVNI_MODEL = os.path.join("modeli", "poslednji.json")
+
+
+def dataset(ime):
+    """Dataset iz dataset_io.py je Parquet folder ili CSV fajl; pratimo oba."""
+    return [putanja_parquet(ime), putanja_csv(ime)]
+
+
+class Faza:
+    """Jedan korak pipeline-a: skripta sa argumentima, ulazni i izlazni fajlovi (ili folderi)."""
+
+    def __init__(self, ime, skripta, ulazi=(), izlazi=(), argumenti=(), kljuc=None):
+        self.ime = ime
+        self.skripta = skripta
+        self.ulazi = list(ulazi)
+        self.izlazi = list(izlazi)
+        self.argumenti = list(argumenti)
+        self.kljuc = kljuc  # Dodatni ulaz koji nije fajl (npr. datum za dnevni skraping)
+
+
+# Redosled je i redosled prikaza; zavisnosti se izvode iz toga čiji izlaz je čiji ulaz
+FAZE = [
+    Faza("skrapovanje", "scraper.py", izlazi=dataset("nekretnine_ns_final"), kljuc=danasnji_datum),
+    Faza("geokodiranje", "geocoder.py", ulazi=dataset("nekretnine_ns_final") + ["gazetir_ns.csv"],
+         izlazi=dataset("nekretnine_ns_geo")),
+    Faza("agregati", "agregati.py", ulazi=dataset("nekretnine_ns_final"), izlazi=dataset("nekretnine_ns_agregati")),
+    Faza("trening", "ml_model.py", ulazi=dataset("nekretnine_ns_geo"), izlazi=[AKTIVNI_MODEL]),
+    # Mapa prikazuje procene modela, pa posle novog treninga mora da se iscrta ponovo
+    Faza("mapa", "map_viz.py", ulazi=dataset("nekretnine_ns_geo") + [AKTIVNI_MODEL], izlazi=["mapa_nekretnina_ns.html"]),
+    Faza("izvestaj", "izvestaj.py",
+         ulazi=dataset("nekretnine_ns_geo") + dataset("nekretnine_ns_agregati") + [AKTIVNI_MODEL],
+         izlazi=[os.path.join("izvestaj", "index.html")]),
+]
+
+
+def hash_putanje(putanja, h):
+    """Dodaje sadržaj fajla (ili svih fajlova foldera, sortirano) u hash; nepostojeća putanja je prazna."""
+    h.update(putanja.encode())
+    if os.path.isdir(putanja):
+        for koren, folderi, fajlovi in os.walk(putanja):
+            folderi.sort()
+            for ime in sorted(fajlovi):
+                hash_putanje(os.path.join(koren, ime), h)
+    elif os.path.isfile(putanja):
+        with open(putanja, "rb") as f:
+            for blok in iter(lambda: f.read(1 << 20), b""):
+                h.update(blok)
+
+
+def lokalni_moduli(skripta, folder=FOLDER_SKRIPTI):
+    """
+    Skripta i svi moduli iz ovog foldera koje ona (posredno) uvozi, sortirano.
+    Uvozi se traže u celom kodu (i unutar funkcija), bez izvršavanja.
+    """
+    moduli, za_obradu = set(), [os.path.splitext(skripta)[0]]
+    while za_obradu:
+        ime = za_obradu.pop()
+        putanja = os.path.join(folder, f"{ime}.py")
+        if ime in moduli or not os.path.isfile(putanja):
+            continue
+        moduli.add(ime)
+        with open(putanja, encoding="utf-8") as f:
+            stablo = ast.parse(f.read(), filename=putanja)
+        for cvor in ast.walk(stablo):
+            if isinstance(cvor, ast.Import):
+                za_obradu.extend(alias.name.split(".")[0] for alias in cvor.names)
+            elif isinstance(cvor, ast.ImportFrom) and cvor.module and not cvor.level:
+                za_obradu.append(cvor.module.split(".")[0])
+    return [os.path.join(folder, f"{ime}.py") for ime in sorted(moduli)]
+
+
+def hash_ulaza(faza, argumenti):
+    h = hashlib.sha256()
+    # I promena koda (skripte ili modula koje uvozi) ili argumenata faze znači da rezultat više ne važi
+    for putanja in lokalni_moduli(faza.skripta):
+        hash_putanje(putanja, h)
+    h.update(json.dumps(argumenti).encode())
+    if faza.kljuc is not None:
+        h.update(str(faza.kljuc()).encode())
+    for putanja in faza.ulazi:
+        hash_putanje(putanja, h)
+    return h.hexdigest()
+
+
+def hash_izlaza(faza):
+    h = hashlib.sha256()
+    for putanja in faza.izlazi:
+        hash_putanje(putanja, h)
+    return h.hexdigest()
+
+
+def zavisnosti(faze):
+    """ime faze -> imena faza čiji izlaz ona čita."""
+    proizvodi = {putanja: faza.ime for faza in faze for putanja in faza.izlazi}
+    return {faza.ime: {proizvodi[u] for u in faza.ulazi if u in proizvodi and proizvodi[u] != faza.ime}
+            for faza in faze}
+
+
+def potrebne_faze(ciljevi, zavisi):
+    """Ciljevi i sve faze od kojih (posredno) zavise."""
+    potrebne, za_obradu = set(), list(ciljevi)
+    while za_obradu:
+        ime = za_obradu.pop()
+        if ime not in potrebne:
+            potrebne.add(ime)
+            za_obradu.extend(zavisi[ime])
+    return potrebne
+
+
+def ucitaj_stanje(putanja=STANJE_FAJL):
+    if not os.path.exists(putanja):
+        return {}
+    with open(putanja, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def sacuvaj_stanje(stanje, putanja=STANJE_FAJL):
+    privremeni = putanja + ".tmp"
+    with open(privremeni, "w", encoding="utf-8") as f:
+        json.dump(stanje, f, indent=2)
+    os.replace(privremeni, putanja)  # Prekid usred upisa ne ostavlja polovičan fajl
+
+
+def je_azurna(faza, argumenti, stanje):
+    zapis = stanje.get(faza.ime)
+    return (zapis is not None
+            and zapis['ulazi'] == hash_ulaza(faza, argumenti)
+            and zapis['izlazi'] == hash_izlaza(faza))
+
+
+def pokreni_fazu(faza, argumenti):
+    komanda = [sys.executable, os.path.join(FOLDER_SKRIPTI, faza.skripta)] + argumenti
+    pocetak = time.perf_counter()
+    with open(f"pipeline_{faza.ime}.log", "w", encoding="utf-8") as log:
+        rezultat = subprocess.run(komanda, stdout=log, stderr=subprocess.STDOUT)
+    return rezultat.returncode, time.perf_counter() - pocetak
+
+
+def pokreni(ciljevi=None, prisilno=(), dodatni_argumenti=None, paralelno=PARALELNO, suvo=False, faze=FAZE):
+    """
+    Pokreće potrebne faze po redosledu zavisnosti; nezavisne faze rade istovremeno.
+    Faza se preskače ako su joj ulazi (i kod) isti kao pri poslednjem uspešnom prolazu, a izlazi netaknuti.
+    Stanje se upisuje posle svake faze, pa posle greške sledeće pokretanje nastavlja od faze koja je pala.
+    """
+    po_imenu = {faza.ime: faza for faza in faze}
+    zavisi = zavisnosti(faze)
+    potrebne = potrebne_faze(ciljevi or list(po_imenu), zavisi)
+    argumenti = {ime: po_imenu[ime].argumenti + shlex.split((dodatni_argumenti or {}).get(ime, ""))
+                 for ime in po_imenu}
+    stanje = ucitaj_stanje()
+
+    zavrsene, neuspele, preskocene = set(), set(), set()
+    u_toku = {}
+    with ThreadPoolExecutor(max_workers=paralelno) as izvrsilac:
+        while True:
+            for faza in faze:
+                ime = faza.ime
+                if ime not in potrebne or ime in zavrsene | neuspele | preskocene or ime in u_toku.values():
+                    continue
+                if zavisi[ime] & (neuspele | preskocene):
+                    preskocene.add(ime)
+                    print(f"[{ime}] preskočeno, prethodna faza nije uspela")
+                    continue
+                if not (zavisi[ime] & potrebne) <= zavrsene:
+                    continue
+                # Ulazi se hešuju tek kad su sve prethodne faze gotove
+                if ime not in prisilno and je_azurna(faza, argumenti[ime], stanje):
+                    zavrsene.add(ime)
+                    print(f"[{ime}] ažurno, preskačem")
+                    continue
+                if suvo:
+                    zavrsene.add(ime)
+                    print(f"[{ime}] bi se pokrenulo: {faza.skripta} {' '.join(argumenti[ime])}")
+                    continue
+                print(f"[{ime}] pokrećem {faza.skripta} {' '.join(argumenti[ime])}")
+                u_toku[izvrsilac.submit(pokreni_fazu, faza, argumenti[ime])] = ime
+
+            if not u_toku:
+                break
+            gotovi, _ = wait(u_toku, return_when=FIRST_COMPLETED)
+            for posao in gotovi:
+                ime = u_toku.pop(posao)
+                kod, trajanje = posao.result()
+                faza = po_imenu[ime]
+                # Skripte za očekivane probleme (npr. nema ulaznog dataset-a) samo ispišu poruku i izađu sa 0
+                if kod == 0 and faza.izlazi and not any(os.path.exists(p) for p in faza.izlazi):
+                    kod = "bez izlaza"
+                if kod != 0:
+                    neuspele.add(ime)
+                    print(f"[{ime}] GREŠKA (kod {kod}, {trajanje:.1f} s), vidi pipeline_{ime}.log")
+                    continue
+                stanje[ime] = {'ulazi': hash_ulaza(faza, argumenti[ime]), 'izlazi': hash_izlaza(faza),
+                               'vreme': time.strftime("%Y-%m-%d %H:%M:%S"), 'trajanje_s': round(trajanje, 2)}
+                sacuvaj_stanje(stanje)
+                zavrsene.add(ime)
+                print(f"[{ime}] gotovo za {trajanje:.1f} s")
+
+    return not neuspele
+
+
+def main():
+    imena = [faza.ime for faza in FAZE]
+    parser = argparse.ArgumentParser(description="Ceo pipeline: skraping -> geokodiranje -> model/mapa/izveštaj")
+    parser.add_argument("ciljevi", nargs="*", metavar="FAZA",
+                        help=f"Faze koje treba dobiti (sa svim prethodnim): {', '.join(imena)}. Podrazumevano sve.")
+    parser.add_argument("--prisilno", nargs="+", default=[], choices=imena, help="Pokreni ove faze i ako su ažurne")
+    parser.add_argument("--argumenti", action="append", default=[], metavar="FAZA=ARGUMENTI",
+                        help='Dodatni argumenti skripte, npr. --argumenti "geokodiranje=--offline"')
+    parser.add_argument("--paralelno", type=int, default=PARALELNO)
+    parser.add_argument("--suvo", action="store_true", help="Samo prikaži šta bi se pokrenulo")
+    args = parser.parse_args()
+    dodatni = dict(a.split("=", 1) for a in args.argumenti if "=" in a)
+    nepoznate = (set(args.ciljevi) | set(dodatni)) - set(imena)
+    if nepoznate:
+        parser.error(f"nepoznate faze: {', '.join(sorted(nepoznate))}")
+
+    uspeh = pokreni(args.ciljevi or None, set(args.prisilno), dodatni, args.paralelno, args.suvo)
+    if not uspeh:
+        print("Pipeline nije završen. Ispravi grešku i pokreni ponovo: završene faze se neće ponavljati.")
+        sys.exit(1)
+    print("Pipeline je završen.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Memory, Parallel, delayed
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import GroupKFold, KFold
+
+from ml_model import napravi_pipeline, napravi_X_y, podeli, ucitaj_podatke
+from model_artefakt import MODELI_FOLDER, sacuvaj_artefakt
+
+# --- KONFIGURACIJA ---
+KES_FOLDER = os.path.join(MODELI_FOLDER, "kes")  # Istrenirani foldovi i kodirane matrice (joblib.Memory)
+BROJ_FOLDOVA = 5
+PARALELNO = -1  # Broj procesa za foldove; -1 = sva jezgra
+
+# (ime, klasa modela, parametri); random_state je fiksan da se rezultati iz keša slažu sa novim
+KONFIGURACIJE = [
+    ("rf_100", RandomForestRegressor, {'n_estimators': 100, 'random_state': 42}),
+    ("rf_300", RandomForestRegressor, {'n_estimators': 300, 'random_state': 42}),
+    ("rf_300_list5", RandomForestRegressor, {'n_estimators': 300, 'min_samples_leaf': 5, 'random_state': 42}),
+    ("rf_300_sqrt", RandomForestRegressor, {'n_estimators': 300, 'max_features': 'sqrt', 'random_state': 42}),
+    ("gbr_200", GradientBoostingRegressor, {'n_estimators': 200, 'learning_rate': 0.05, 'max_depth': 3,
+                                            'random_state': 42}),
+    ("gbr_500", GradientBoostingRegressor, {'n_estimators': 500, 'learning_rate': 0.03, 'max_depth': 4,
+                                            'subsample': 0.8, 'random_state': 42}),
+]
+
+
+def napravi_model(klasa, parametri, kes=None):
+    return napravi_pipeline(klasa(**parametri), memory=kes)
+
+
+def oceni_fold(klasa, parametri, X_train, y_train, X_test, y_test, kes_folder=None):
+    """Trenira jednu konfiguraciju na jednom foldu i vraća MAE na ostatku."""
+    # Keš kodera unutar pipeline-a: ista trening matrica se ne kodira ponovo za svaku konfiguraciju
+    kes = Memory(kes_folder, verbose=0) if kes_folder else None
+    model = napravi_model(klasa, parametri, kes)
+    model.fit(X_train, y_train)
+    return mean_absolute_error(y_test, model.predict(X_test))
+
+
+def podele(X, y, grupe, broj_foldova):
+    """Foldovi za obične (KFold) i prostorno grupisane (GroupKFold po delu grada) provere."""
+    foldovi = [("kfold", tr, te) for tr, te in
+               KFold(n_splits=broj_foldova, shuffle=True, random_state=42).split(X, y)]
+    # Svaki deo grada je ceo u test foldu: meri koliko model vredi za kraj koji nije video
+    broj_grupa = min(broj_foldova, grupe.nunique())
+    if broj_grupa >= 2:
+        foldovi += [("grupe", tr, te) for tr, te in GroupKFold(n_splits=broj_grupa).split(X, y, grupe)]
+    return foldovi
+
+
+def pretrazi(X, y, grupe, konfiguracije=KONFIGURACIJE, broj_foldova=BROJ_FOLDOVA,
+             paralelno=PARALELNO, kes_folder=KES_FOLDER):
+    """Unakrsna provera svih konfiguracija; vraća tabelu sa prosečnim MAE po konfiguraciji i vrsti podele."""
+    oceni = oceni_fold
+    if kes_folder:
+        # Završeni (konfiguracija, fold) parovi se ne treniraju ponovo pri sledećoj pretrazi
+        oceni = Memory(kes_folder, verbose=0).cache(oceni_fold, ignore=['kes_folder'])
+
+    zadaci = [(ime, vrsta, klasa, parametri, tr, te)
+              for ime, klasa, parametri in konfiguracije
+              for vrsta, tr, te in podele(X, y, grupe, broj_foldova)]
+    maes = Parallel(n_jobs=paralelno)(
+        delayed(oceni)(klasa, parametri, X.iloc[tr], y.iloc[tr], X.iloc[te], y.iloc[te], kes_folder)
+        for _, _, klasa, parametri, tr, te in zadaci
+    )
+
+    rezultati = pd.DataFrame({'konfiguracija': [z[0] for z in zadaci], 'podela': [z[1] for z in zadaci],
+                              'mae': maes})
+    tabela = rezultati.pivot_table(index='konfiguracija', columns='podela', values='mae', aggfunc=['mean', 'std'])
+    tabela.columns = [f"mae_{podela}" if agg == 'mean' else f"std_{podela}" for agg, podela in tabela.columns]
+    return tabela.sort_values('mae_kfold')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pretraga hiperparametara modela cene (unakrsna provera)")
+    parser.add_argument("--foldovi", type=int, default=BROJ_FOLDOVA, help="Broj foldova")
+    parser.add_argument("--paralelno", type=int, default=PARALELNO, help="Broj procesa (-1 = sva jezgra)")
+    parser.add_argument("--po-grupama", action="store_true",
+                        help="Najbolju konfiguraciju biraj po MAE prostorno grupisane provere")
+    parser.add_argument("--bez-kesa", action="store_true", help="Ne koristi i ne puni keš foldova")
+    args = parser.parse_args()
+
+    df = ucitaj_podatke()
+    if df is None:
+        return
+    X, y = napravi_X_y(df)
+    grupe = df['Deo_Grada'].astype('string').fillna('')
+
+    print(f"Unakrsna provera: {len(KONFIGURACIJE)} konfiguracija x {args.foldovi} foldova...")
+    pocetak = time.perf_counter()
+    tabela = pretrazi(X, y, grupe, broj_foldova=args.foldovi, paralelno=args.paralelno,
+                      kes_folder=None if args.bez_kesa else KES_FOLDER)
+    print(f"Gotovo za {time.perf_counter() - pocetak:.1f} s.\n")
+    print(tabela.round(0).to_string())
+
+    kriterijum = 'mae_grupe' if args.po_grupama and 'mae_grupe' in tabela else 'mae_kfold'
+    najbolja = tabela[kriterijum].idxmin()
+    _, klasa, parametri = next(k for k in KONFIGURACIJE if k[0] == najbolja)
+    print(f"\nNajbolja konfiguracija ({kriterijum}): {najbolja} {parametri}")
+
+    # Finalni model na istoj podeli kao ml_model.py, da metrike i vizualizacija ostanu uporedive
+    X_train, X_test, y_train, y_test = podeli(X, y)
+    model = napravi_model(klasa, parametri)
+    model.fit(X_train, y_train)
+    predikcije = model.predict(X_test)
+    mae = mean_absolute_error(y_test, predikcije)
+    r2 = r2_score(y_test, predikcije)
+    print(f"Test set: MAE {mae:,.0f} EUR, R2 {r2:.2f}")
+
+    cv = {kolona: float(vrednost) for kolona, vrednost in tabela.loc[najbolja].items() if not np.isnan(vrednost)}
+    verzija = sacuvaj_artefakt(model, {'mae': mae, 'r2': r2, **cv},
+                               meta={'broj_redova': len(df), 'broj_za_trening': len(X_train),
+                                     'konfiguracija': najbolja,
+                                     'parametri': parametri},
+                               linkovi=df['Link'].dropna())
+    print(f"Model sačuvan kao verzija {verzija} (folder '{MODELI_FOLDER}').")
+
+
+if __name__ == "__main__":
+    main()
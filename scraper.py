@@ -1,296 +1,383 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
-import random
-
-# --- KONFIGURACIJA ---
-BASE_URL = "https://www.nekretnine.rs/stambeni-objekti/stanovi/izdavanje-prodaja/prodaja/grad/novi-sad/"
-# Stavićemo samo 1 stranicu za testiranje dok ne proradi
-BROJ_STRANICA = 1
-HEADERS = {
-    # Koristimo noviji User-Agent da izgledamo kao pravi pregledač
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept-Language": "en-US,en;q=0.9,sr;q=0.8",
-    "Referer": "https://www.google.com/"
-}
-
-
-def parsiraj_stranicu(url):
-    print(f"Preuzimam: {url}")
-    time.sleep(random.uniform(2, 4))  # Malo duža pauza
-
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-    except Exception as e:
-        print(f"Greška u konekciji: {e}")
-        return []
-
-    print(f"Status koda: {response.status_code}")  # 200 je OK, 403 je Zabranjeno
-
-    if response.status_code != 200:
-        print("Sajt je odbio zahtev! Verovatno blokira botove.")
-        return []
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-
-    # --- DEBUG SEKCIJA ---
-    # Ovo će sačuvati ono što skripta "vidi" u fajl, da možemo da proverimo
-    with open("debug_page.html", "w", encoding="utf-8") as f:
-        f.write(response.text)
-    print("Sačuvao sam HTML stranice u 'debug_page.html'. Proveri taj fajl ako nema rezultata.")
-    # ---------------------
-
-    # Pokušavamo da nađemo oglase. Nekretnine.rs obično koristi klasu 'offer-body' ili 'row offer'
-    # Probaćemo širu pretragu
-    oglasi = soup.find_all('div', class_='offer-body')
-
-    if not oglasi:
-        print("UPOZORENJE: Nisam našao nijedan div sa klasom 'offer-body'. Pokušavam alternativni selektor...")
-        oglasi = soup.find_all('div', class_='row offer')
-
-    print(f"Broj potencijalnih oglasa na stranici: {len(oglasi)}")
-
-    podaci_sa_stranice = []
-
-    for oglas in oglasi:
-        try:
-            # Naslov
-            naslov_tag = oglas.find('h2', class_='offer-title')
-            # Ako ne nađe u h2, probaj u a tagu direktno
-            if not naslov_tag:
-                naslov_tag = oglas.find('a', class_='offer-title')
-
-            naslov = naslov_tag.get_text(strip=True) if naslov_tag else "N/A"
-            link = "https://www.nekretnine.rs" + naslov_tag.find('a')['href'] if naslov_tag and naslov_tag.find(
-                'a') else "N/A"
-
-            # Lokacija
-            lokacija_tag = oglas.find('p', class_='offer-location')
-            lokacija = lokacija_tag.get_text(strip=True) if lokacija_tag else "N/A"
-
-            # Cena
-            cena_tag = oglas.find('p', class_='offer-price')
-            cena = None
-            if cena_tag:
-                raw_cena = cena_tag.get_text(strip=True).replace("EUR", "").replace(" ", "").replace(".", "")
-                # Često piše "Dogovor", to preskačemo
-                if any(char.isdigit() for char in raw_cena):
-                    # Izvuci samo brojeve
-                    import re
-                    brojevi = re.findall(r'\d+', raw_cena)
-                    if brojevi:
-                        cena = int(''.join(brojevi))
-
-            # Kvadratura
-            kvadratura = None
-            meta_info = oglas.find('div', class_='offer-meta-info')
-            if meta_info:
-                tekst = meta_info.get_text(strip=True)
-                # Primer: "75 m2 | 3.0 sobe"
-                delovi = tekst.split('|')
-                for deo in delovi:
-                    if 'm2' in deo:
-                        kv_raw = deo.replace('m2', '').strip().replace(',', '.')
-                        try:
-                            kvadratura = float(kv_raw)
-                        except:
-                            pass
-
-            if cena and kvadratura:
-                podaci_sa_stranice.append({
-                    'Naslov': naslov,
-                    'Lokacija': lokacija,
-                    'Cena_EUR': cena,
-                    'Kvadratura_m2': kvadratura,
-                    'Link': link
-                })
-
-        except Exception as e:
-            continue
-
-    return podaci_sa_stranice
-
-
-def main():
-    print(f"Počinjem prikupljanje podataka sa {BASE_URL}...")
-    svi_stanovi = []
-
-    for i in range(1, BROJ_STRANICA + 1):
-        url = f"{BASE_URL}?p={i}"
-        print(f"Obrađujem stranicu {i}...")
-        novi_podaci = parsiraj_stranicu(url)
-        svi_stanovi.extend(novi_podaci)
-        print(f" -> Pronađeno {len(novi_podaci)} validnih stanova.")
-
-    # --- GLAVNA POPRAVKA: Provera da li ima podataka pre pravljenja DataFrame-a ---
-    if not svi_stanovi:
-        print("\n[GREŠKA] Nisu prikupljeni nikakvi podaci! Proveri 'debug_page.html'.")
-        print("Mogući razlozi: IP blokada ili promena HTML strukture sajta.")
-        return
-
-    df = pd.DataFrame(svi_stanovi)
-
-    # Sigurnija obrada lokacije
-    try:
-        df[['Grad', 'Deo_Grada']] = df['Lokacija'].str.split(',', n=1, expand=True)
-    except:
-        print("Upozorenje: Nisam uspeo lepo da podelim lokaciju, ostavljam original.")
-        df['Deo_Grada'] = df['Lokacija']
-
-    # Dodajemo cenu po m2
-    df['Cena_po_m2'] = (df['Cena_EUR'] / df['Kvadratura_m2']).round(2)
-
-    file_name = "nekretnine_ns_dataset.csv"
-    df.to_csv(file_name, index=False, encoding='utf-8')
-    print(f"\nUspešno završeno! Podaci sačuvani u '{file_name}'.")
-    print(df.head())
-
-
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
-import random
-import re
-
-# --- KONFIGURACIJA ---
-BASE_URL = "https://www.nekretnine.rs/stambeni-objekti/stanovi/izdavanje-prodaja/prodaja/grad/novi-sad/"
-BROJ_STRANICA = 3  # Možeš povećati na 50+ kasnije
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept-Language": "sr-RS,sr;q=0.9,en-US;q=0.8,en;q=0.7",
-}
-
-
-def parsiraj_stranicu(url):
-    print(f"Preuzimam: {url}")
-    time.sleep(random.uniform(1.5, 3.5))  # Pauza da budemo pristojni
-
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-    except Exception as e:
-        print(f"Greška u konekciji: {e}")
-        return []
-
-    if response.status_code != 200:
-        print(f"Status greška: {response.status_code}")
-        return []
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-
-    # Glavni kontejner za svaki oglas
-    oglasi = soup.find_all('div', class_='row offer')
-
-    podaci_sa_stranice = []
-
-    for oglas in oglasi:
-        try:
-            # 1. Naslov i Link
-            naslov_tag = oglas.find('h2', class_='offer-title')
-            naslov = "N/A"
-            link = "N/A"
-
-            if naslov_tag:
-                a_tag = naslov_tag.find('a')
-                if a_tag:
-                    naslov = a_tag.get_text(strip=True)
-                    link = "https://www.nekretnine.rs" + a_tag['href']
-
-            # 2. Lokacija
-            lokacija_tag = oglas.find('p', class_='offer-location')
-            lokacija = lokacija_tag.get_text(strip=True) if lokacija_tag else "N/A"
-
-            # 3. Cena
-            # U HTML-u cena je u <p class="offer-price"><span>66 950 €</span>...</p>
-            # Moramo paziti da ne uzmemo "offer-price--invert" (to je kvadratura)
-            cena = None
-            # Trazimo sve p tagove sa klasom offer-price, ali filtriramo onaj koji NEMA klasu invert
-            cena_container = oglas.find('p', class_='offer-price')
-
-            # Provera da li smo slučajno uhvatili kvadraturu (koja ima klasu 'offer-price--invert')
-            # Klasa 'offer-price' je zajednička, ali cena je obično prva u DOM-u unutar tog bloka
-            if cena_container and 'offer-price--invert' not in cena_container.get('class', []):
-                span_cena = cena_container.find('span')
-                if span_cena:
-                    raw_cena = span_cena.get_text(strip=True)
-                    # Čišćenje: skloni "€", razmake, tačke
-                    clean_cena = re.sub(r'[^\d]', '', raw_cena)
-                    if clean_cena:
-                        cena = int(clean_cena)
-
-            # 4. Kvadratura
-            # Nalazi se u <p class="offer-price offer-price--invert"><span>34 m²</span></p>
-            kvadratura = None
-            kvad_container = oglas.find('p', class_='offer-price--invert')
-            if kvad_container:
-                span_kvad = kvad_container.find('span')
-                if span_kvad:
-                    raw_kvad = span_kvad.get_text(strip=True)
-                    # Uzmi samo broj pre "m2"
-                    clean_kvad = raw_kvad.lower().replace('m²', '').replace('m2', '').replace(' ', '').replace(',', '.')
-                    try:
-                        kvadratura = float(clean_kvad)
-                    except:
-                        pass
-
-            # Dodajemo samo ako imamo cenu i kvadraturu (bitno za statistiku)
-            if cena and kvadratura:
-                podaci_sa_stranice.append({
-                    'Naslov': naslov,
-                    'Lokacija': lokacija,
-                    'Cena_EUR': cena,
-                    'Kvadratura_m2': kvadratura,
-                    'Link': link
-                })
-
-        except Exception as e:
-            # print(f"Greška na oglasu: {e}") # Otkomentariši za detaljniji debug
-            continue
-
-    return podaci_sa_stranice
-
-
-def main():
-    print(f"--- POČETAK SKRAPINGA ---")
-    svi_stanovi = []
-
-    for i in range(1, BROJ_STRANICA + 1):
-        url = f"{BASE_URL}?p={i}"
-        print(f"Obrađujem stranicu {i}...")
-        novi_podaci = parsiraj_stranicu(url)
-        svi_stanovi.extend(novi_podaci)
-        print(f" -> Pronađeno {len(novi_podaci)} stanova na ovoj stranici.")
-
-    if not svi_stanovi:
-        print("\n[GREŠKA] Opet nisam našao podatke. Da li je sajt promenio strukturu?")
-        return
-
-    # Kreiranje tabele
-    df = pd.DataFrame(svi_stanovi)
-
-    # Obrada lokacije (Grad, Deo Grada)
-    try:
-        # Lokacija je obično: "Deo Grada, Novi Sad, Srbija"
-        # Uzimamo prvi deo pre prvog zareza kao deo grada
-        df['Deo_Grada'] = df['Lokacija'].apply(lambda x: x.split(',')[0].strip())
-    except:
-        df['Deo_Grada'] = df['Lokacija']
-
-    # Računanje cene po m2
-    df['Cena_po_m2'] = (df['Cena_EUR'] / df['Kvadratura_m2']).round(2)
-
-    # Čuvanje
-    file_name = "nekretnine_ns_final.csv"
-    df.to_csv(file_name, index=False, encoding='utf-8')
-    print(f"\nUspešno! Ukupno prikupljeno {len(df)} stanova.")
-    print(f"Podaci sačuvani u: {file_name}")
-    print("\nPrvih 5 redova:")
-    print(df[['Deo_Grada', 'Cena_EUR', 'Kvadratura_m2', 'Cena_po_m2']].head())
-
-
-if __name__ == "__main__":
-    main()
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import requests
+from requests.adapters import HTTPAdapter
+import pandas as pd
+import time
+import random
+import argparse
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import metrike
+import parseri
+from ciscenje import ocisti_oglase
+from dataset_io import FORMAT, KOLONA_PARTICIJE, danasnji_datum, sacuvaj_dataset
+from arhiva import ARHIVA_FOLDER, ArhivaStranica
+from indeks_oglasa import IndeksOglasa
+
+# --- KONFIGURACIJA ---
+BASE_URL = "https://www.nekretnine.rs/stambeni-objekti/stanovi/izdavanje-prodaja/prodaja/grad/novi-sad/"
+BROJ_STRANICA = 3  # Možeš povećati na 50+ kasnije
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Language": "sr-RS,sr;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+# Paralelno preuzimanje (umesto fiksne pauze između stranica)
+PARALELNO = 4  # Koliko stranica se preuzima istovremeno
+ZAHTEVA_U_SEKUNDI = 0.5  # Prosečan broj zahteva po sekundi ka jednom hostu
+NALET = 2  # Koliko zahteva sme da ode odjednom pre nego što limiter počne da čeka
+MAX_POKUSAJA = 4  # Ukupan broj pokušaja za 429/5xx odgovore i prekinute/istekle konekcije
+STATUSI_ZA_PONOVO = {429, 500, 502, 503, 504}
+IZLAZNI_DATASET = "nekretnine_ns_final"  # .parquet (particije po danu) ili .csv, vidi dataset_io.py
+PARSER = None  # None = najbrži dostupni ('selectolax' > 'lxml' > 'bs4-oglasi'), vidi parseri.py
+ARHIVA = None  # ArhivaStranica; postavlja se u main() preko --arhiva / --replay
+MAX_STRANICA_INKREMENTALNO = 100  # Gornja granica; inkrementalni režim obično staje mnogo ranije
+VELICINA_SERIJE = 1000  # Oglasi se upisuju u dataset na svakih ~toliko, pa pad usred skrapinga ne gubi sve
+
+
+class OgranicivacBrzine:
+    """Token bucket po hostu: najviše `nalet` zahteva odjednom, zatim `po_sekundi` u proseku."""
+
+    def __init__(self, po_sekundi=ZAHTEVA_U_SEKUNDI, nalet=NALET):
+        self.po_sekundi = po_sekundi
+        self.nalet = nalet
+        self._kofe = {}  # host -> [tokeni, vreme poslednjeg punjenja]
+        self._lock = threading.Lock()
+
+    def sacekaj(self, url):
+        host = urlparse(url).netloc
+        while True:
+            with self._lock:
+                sada = time.monotonic()
+                tokeni, poslednje = self._kofe.get(host, (self.nalet, sada))
+                tokeni = min(self.nalet, tokeni + (sada - poslednje) * self.po_sekundi)
+                if tokeni >= 1:
+                    self._kofe[host] = (tokeni - 1, sada)
+                    return
+                self._kofe[host] = (tokeni, sada)
+                cekanje = (1 - tokeni) / self.po_sekundi
+            time.sleep(cekanje)
+
+
+def napravi_sesiju(paralelno=PARALELNO):
+    """Jedna keep-alive sesija sa pool-om konekcija dovoljnim za sve niti."""
+    sesija = requests.Session()
+    sesija.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=paralelno, pool_maxsize=paralelno)
+    sesija.mount("http://", adapter)
+    sesija.mount("https://", adapter)
+    return sesija
+
+
+def _pauza(pokusaj, retry_after=""):
+    """Eksponencijalni backoff; ako server pošalje Retry-After, poštujemo ga."""
+    pauza = 2 ** pokusaj + random.uniform(0, 1)
+    if retry_after.isdigit():
+        pauza = max(pauza, int(retry_after))
+    return pauza
+
+
+def preuzmi_html(url, sesija=None, ogranicivac=None):
+    """Preuzima stranicu i vraća HTML (ili None), sa ponavljanjem i backoff-om na 429/5xx i greške konekcije."""
+    if ARHIVA is not None and ARHIVA.replay:
+        # Replay: sve iz arhive, bez ijednog mrežnog zahteva
+        html = ARHIVA.ucitaj(url)
+        if html is None:
+            print(f"Nema u arhivi: {url}")
+        return html
+
+    sesija = sesija or requests
+    zaglavlja = dict(HEADERS)
+    if ARHIVA is not None:
+        zaglavlja.update(ARHIVA.uslovna_zaglavlja(url))
+
+    for pokusaj in range(MAX_POKUSAJA):
+        if ogranicivac:
+            ogranicivac.sacekaj(url)
+
+        try:
+            with metrike.izmeri("zahtev"):
+                response = sesija.get(url, headers=zaglavlja, timeout=10)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            metrike.uvecaj("greske_konekcije")
+            if pokusaj == MAX_POKUSAJA - 1:
+                print(f"Greška u konekciji: {e}")
+                return None
+            pauza = _pauza(pokusaj)
+            print(f"Greška u konekciji za {url}, pokušavam ponovo za {pauza:.1f}s...")
+            metrike.uvecaj("ponovljeni_zahtevi")
+            time.sleep(pauza)
+            continue
+        except Exception as e:
+            print(f"Greška u konekciji: {e}")
+            metrike.uvecaj("greske_konekcije")
+            return None
+        metrike.uvecaj("zahtevi")
+        metrike.uvecaj("bajtovi", len(response.content))
+
+        if response.status_code == 304 and ARHIVA is not None:
+            metrike.uvecaj("nepromenjene_304")
+            # Stranica se nije promenila od poslednjeg preuzimanja
+            sha, etag, last_modified = ARHIVA.poslednje(url)
+            ARHIVA.zabelezi(url, sha, response.headers.get("ETag", etag),
+                            response.headers.get("Last-Modified", last_modified))
+            return ARHIVA.ucitaj_objekat(sha)
+
+        if response.status_code == 200:
+            # Bez charset-a u zaglavlju requests pretpostavlja ISO-8859-1 i kvari "m²"
+            if "charset" not in response.headers.get("Content-Type", ""):
+                response.encoding = "utf-8"
+            if ARHIVA is not None:
+                ARHIVA.sacuvaj(url, response.text, response.headers.get("ETag"),
+                               response.headers.get("Last-Modified"))
+            return response.text
+
+        if response.status_code not in STATUSI_ZA_PONOVO or pokusaj == MAX_POKUSAJA - 1:
+            print(f"Status greška: {response.status_code}")
+            return None
+
+        pauza = _pauza(pokusaj, response.headers.get("Retry-After", ""))
+        print(f"Status {response.status_code} za {url}, pokušavam ponovo za {pauza:.1f}s...")
+        metrike.uvecaj("ponovljeni_zahtevi")
+        time.sleep(pauza)
+
+    return None
+
+
+def parsiraj_html(html):
+    # Samo parsiranje je u parseri.py (bs4 / lxml / selectolax daju iste zapise)
+    with metrike.izmeri("parsiranje"):
+        zapisi = parseri.parsiraj_html(html, PARSER)
+    metrike.uvecaj("stranice")
+    metrike.uvecaj("oglasi", len(zapisi))
+    return zapisi
+
+
+def parsiraj_stranicu(url, sesija=None, ogranicivac=None):
+    """Zapisi sa stranice; [] za stranicu bez oglasa (kraj paginacije), None ako preuzimanje nije uspelo."""
+    if ogranicivac is None and not (ARHIVA is not None and ARHIVA.replay):
+        time.sleep(random.uniform(1.5, 3.5))  # Pauza da budemo pristojni
+
+    html = preuzmi_html(url, sesija, ogranicivac)
+    if html is None:
+        metrike.uvecaj("neuspele_stranice")
+        return None
+
+    return parsiraj_html(html)
+
+
+def preuzmi_stranice(urls, paralelno=PARALELNO, po_sekundi=ZAHTEVA_U_SEKUNDI):
+    """
+    Paralelno obrađuje listu URL-ova i daje rezultate (generator) istim redosledom kao `urls`,
+    čim koja stranica bude gotova, pa pozivalac može da upisuje usput.
+    """
+    sesija = napravi_sesiju(paralelno)
+    ogranicivac = OgranicivacBrzine(po_sekundi)
+    with sesija, ThreadPoolExecutor(max_workers=paralelno) as executor:
+        yield from executor.map(lambda url: parsiraj_stranicu(url, sesija, ogranicivac), urls)
+
+
+def napravi_tabelu(zapisi, datum=None):
+    """
+    Pravi DataFrame od sirovih zapisa parsera: cene i kvadrature u brojeve, Deo_Grada i Cena_po_m2.
+    `datum` je dan preuzimanja stranica (podrazumevano danas, a za stare sačuvane stranice njihov dan).
+    """
+    # Čišćenje je vektorsko nad celom tabelom (ciscenje.py), a ne po oglasu
+    df = ocisti_oglase(pd.DataFrame(zapisi, columns=parseri.KOLONE))
+
+    # Datum skrapinga; po njemu se Parquet dataset deli na dnevne particije
+    df[KOLONA_PARTICIJE] = datum or danasnji_datum()
+    return df
+
+
+class SerijskiUpis:
+    """
+    Upisuje tabele oglasa u dataset u serijama od najmanje `velicina` redova, umesto svega na kraju.
+    Prva serija koristi `rezim`, ostale se dopisuju; kod "dan" se svaki dan zamenjuje u prvoj seriji
+    koja ga sadrži (npr. današnji snimak, ili dani ponovo parsiranih starih stranica).
+    Kao context manager upisuje i ostatak kad skraping pukne, pa se gubi najviše stranica u letu.
+    """
+
+    def __init__(self, rezim, velicina=VELICINA_SERIJE, indeks=None, ime=IZLAZNI_DATASET):
+        self.rezim = rezim
+        self.ime = ime
+        self.velicina = velicina
+        self.indeks = indeks  # Indeks oglasa se menja tek posle upisa serije, da pad ne ostavi "viđene" a neupisane
+        self._serija = []
+        self._redova = 0
+        self.ukupno = 0
+        self.putanja = None
+        self.pocetak = None  # Prvih nekoliko upisanih redova, za prikaz na kraju
+        self._zamenjeni_dani = set()
+
+    def dodaj(self, df):
+        self._serija.append(df)
+        self._redova += len(df)
+        if self._redova >= self.velicina:
+            self.isprazni()
+
+    def isprazni(self):
+        if not self._redova:
+            return
+        df = pd.concat(self._serija, ignore_index=True)
+        self._serija, self._redova = [], 0
+        self.putanja = self._sacuvaj(df)
+        if self.indeks is not None:
+            self.indeks.obradi(df.to_dict('records'))
+        self.ukupno += len(df)
+        if self.pocetak is None:
+            self.pocetak = df.head()
+        metrike.uvecaj("serije_upisane")
+        print(f"Upisano {len(df)} stanova (ukupno {self.ukupno}).")
+
+    def _sacuvaj(self, df):
+        if self.rezim != "dan" or FORMAT == "csv":
+            # CSV nema particije: "dan" tamo piše ceo fajl iznova, pa se posle prve serije samo dopisuje
+            putanja = sacuvaj_dataset(df, self.ime, rezim=self.rezim)
+            self.rezim = "dopuni"
+            return putanja
+        # Kasnija serija istog dana ne sme da obriše ono što je prethodna upisala
+        dani = df[KOLONA_PARTICIJE].astype(str)
+        novi = ~dani.isin(self._zamenjeni_dani).to_numpy()
+        self._zamenjeni_dani.update(dani[novi])
+        for deo, rezim in ((df[novi], "dan"), (df[~novi], "dopuni")):
+            if len(deo):
+                putanja = sacuvaj_dataset(deo, self.ime, rezim=rezim)
+        return putanja
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.isprazni()
+
+
+def prikupi_inkrementalno(base_url, max_stranica, indeks, pisac, paralelno=PARALELNO, po_sekundi=ZAHTEVA_U_SEKUNDI):
+    """
+    Ide stranicu po stranicu (u talasima od `paralelno`) i samo nove ili promenjene oglase predaje `pisac`-u,
+    koji ih upisuje u indeks tek kad ih sačuva u dataset; ovde se indeks samo čita.
+    Staje čim naiđe na stranicu na kojoj su svi oglasi već viđeni. Vraća False ako neka stranica
+    nije preuzeta: tada se ne zna da li iza nje ima novih oglasa, pa to nije kraj paginacije.
+    """
+    sesija = napravi_sesiju(paralelno)
+    ogranicivac = OgranicivacBrzine(po_sekundi)
+
+    with sesija, ThreadPoolExecutor(max_workers=paralelno) as executor:
+        for pocetak in range(1, max_stranica + 1, paralelno):
+            brojevi = range(pocetak, min(pocetak + paralelno, max_stranica + 1))
+            urls = [f"{base_url}?p={i}" for i in brojevi]
+            rezultati = executor.map(lambda url: parsiraj_stranicu(url, sesija, ogranicivac), urls)
+
+            for i, podaci in zip(brojevi, rezultati):
+                if podaci is None:
+                    print(f"[GREŠKA] Stranica {i} nije preuzeta, prekidam.")
+                    return False
+                if not podaci:
+                    print(f"Stranica {i} je prazna, kraj paginacije.")
+                    return True
+
+                # Indeks poredi cene, pa mu trebaju već očišćeni zapisi
+                stanovi = napravi_tabelu(podaci).to_dict('records')
+                za_upis, nepromenjeni = indeks.uporedi(stanovi)
+                if za_upis:
+                    pisac.dodaj(pd.DataFrame(za_upis))
+                # Nepromenjeni su već u dataset-u, njima se odmah beleži da su viđeni i danas
+                indeks.obradi(nepromenjeni)
+                print(f"Stranica {i}: {len(za_upis)} novih ili promenjenih od {len(stanovi)} stanova.")
+
+                if stanovi and not za_upis:
+                    print(f"Svi oglasi na stranici {i} su već viđeni, prekidam.")
+                    return True
+    return True
+
+
+def main():
+    global PARSER, ARHIVA
+    parser = argparse.ArgumentParser(description="Prikupljanje oglasa sa nekretnine.rs")
+    parser.add_argument("--stranice", type=int, default=None,
+                        help=f"Broj stranica za obradu (podrazumevano {BROJ_STRANICA}, "
+                             f"a {MAX_STRANICA_INKREMENTALNO} kao gornja granica za --inkrementalno)")
+    parser.add_argument("--paralelno", type=int, default=PARALELNO,
+                        help="Broj istovremenih preuzimanja (1 = stari sekvencijalni režim)")
+    parser.add_argument("--rps", type=float, default=ZAHTEVA_U_SEKUNDI, help="Zahteva u sekundi po hostu")
+    parser.add_argument("--base-url", default=BASE_URL, help="Npr. lokalni server za testiranje")
+    parser.add_argument("--inkrementalno", action="store_true",
+                        help="Dopisuje samo nove/promenjene oglase i staje na prvoj već viđenoj stranici")
+    parser.add_argument("--parser", choices=sorted(parseri.BACKENDI), default=PARSER,
+                        help="HTML parser backend (podrazumevano najbrži dostupni)")
+    parser.add_argument("--arhiva", nargs="?", const=ARHIVA_FOLDER, default=None,
+                        help="Čuvaj sirove stranice u kompresovanu arhivu i koristi uslovne zahteve (ETag)")
+    parser.add_argument("--replay", nargs="?", const=ARHIVA_FOLDER, default=None,
+                        help="Pokreni ceo postupak iz arhive, bez pristupa mreži")
+    parser.add_argument("--serija", type=int, default=VELICINA_SERIJE,
+                        help="Na koliko oglasa se upisuje u dataset tokom skrapinga")
+    args = parser.parse_args()
+    PARSER = args.parser
+    if args.stranice is None:
+        args.stranice = MAX_STRANICA_INKREMENTALNO if args.inkrementalno else BROJ_STRANICA
+    if args.replay:
+        ARHIVA = ArhivaStranica(args.replay, replay=True)
+    elif args.arhiva:
+        ARHIVA = ArhivaStranica(args.arhiva)
+
+    print(f"--- POČETAK SKRAPINGA ---")
+    # Čuvanje: pun prolaz zamenjuje današnji snimak, inkrementalni dopisuje na postojeće
+    with IndeksOglasa() as indeks:
+        if args.inkrementalno:
+            with SerijskiUpis("dopuni", args.serija, indeks) as pisac:
+                kompletno = prikupi_inkrementalno(args.base_url, args.stranice, indeks, pisac,
+                                                  max(args.paralelno, 1), args.rps)
+            if not kompletno:
+                # Ono što je upisano ostaje (i u indeksu), sledeći prolaz nastavlja odatle
+                print(f"\n[GREŠKA] Skraping je prekinut posle {pisac.ukupno} novih oglasa.")
+                sys.exit(1)
+            if not pisac.ukupno:
+                print("\nNema novih ni promenjenih oglasa.")
+                return
+        else:
+            if args.replay:
+                # U replay režimu obrađujemo sve arhivirane stranice ove pretrage
+                urls = ARHIVA.urls(args.base_url)
+            else:
+                urls = [f"{args.base_url}?p={i}" for i in range(1, args.stranice + 1)]
+
+            if args.paralelno > 1:
+                rezultati = preuzmi_stranice(urls, args.paralelno, args.rps)
+            else:
+                rezultati = (parsiraj_stranicu(url) for url in urls)
+
+            # I pun prolaz puni indeks (posle upisa svake serije), da sledeći inkrementalni prolaz krene od ovog stanja.
+            # Sirovi zapisi se čiste u serijama (vektorski), ne stranicu po stranicu
+            with SerijskiUpis("dan", args.serija, indeks) as pisac:
+                zapisi, neuspele = [], 0
+                for i, novi_podaci in enumerate(rezultati, start=1):
+                    if novi_podaci is None:
+                        neuspele += 1
+                        print(f"Stranica {i}: nije preuzeta.")
+                        continue
+                    zapisi.extend(novi_podaci)
+                    print(f"Stranica {i}: pronađeno {len(novi_podaci)} stanova.")
+                    if len(zapisi) >= pisac.velicina:
+                        pisac.dodaj(napravi_tabelu(zapisi))
+                        zapisi = []
+                if zapisi:
+                    pisac.dodaj(napravi_tabelu(zapisi))
+            if neuspele:
+                print(f"\n[UPOZORENJE] {neuspele} od {len(urls)} stranica nije preuzeto.")
+
+    if not pisac.ukupno:
+        print("\n[GREŠKA] Opet nisam našao podatke. Da li je sajt promenio strukturu?")
+        # Kod != 0, da pipeline ne pokrene sledeće faze nad starim podacima
+        sys.exit(1)
+
+    print(f"\nUspešno! Ukupno {'dopisano' if args.inkrementalno else 'prikupljeno'} {pisac.ukupno} stanova.")
+    print(f"Podaci sačuvani u: {pisac.putanja}")
+    print("\nPrvih 5 redova:")
+    print(pisac.pocetak[['Deo_Grada', 'Cena_EUR', 'Kvadratura_m2', 'Cena_po_m2']])
+
+
+if __name__ == "__main__":
+    with metrike.faza("skrapovanje"):
+        main()
@@ -0,0 +1,200 @@
+import argparse
+import contextlib
+import glob
+import gzip
+import os
+import queue
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+
+import parseri
+import scraper
+from indeks_oglasa import IndeksOglasa
+
+# --- KONFIGURACIJA ---
+IZLAZNI_DATASET = scraper.IZLAZNI_DATASET  # .parquet (particije po danu) ili .csv, vidi dataset_io.py
+SPOOL_FOLDER = "spool"
+PROCESA = os.cpu_count() or 2
+VELICINA_REDA = 16  # Koliko preuzetih, a još neparsiranih stranica sme da čeka u memoriji
+
+_KRAJ = object()
+
+
+def _spool_putanja(spool_folder, broj):
+    return os.path.join(spool_folder, f"stranica_{broj:05d}.html.gz")
+
+
+def _parsiraj_stavku(stavka, backend):
+    """Radi u procesu-radniku: stavka je ('html', tekst) ili ('fajl', putanja do .html.gz)."""
+    vrsta, sadrzaj = stavka
+    if vrsta == 'fajl':
+        with gzip.open(sadrzaj, 'rt', encoding='utf-8') as f:
+            sadrzaj = f.read()
+    return parseri.parsiraj_html(sadrzaj, backend)
+
+
+def _datum_stavke(stavka):
+    """Dan preuzimanja stranice: za spool fajl dan kad je snimljen, za upravo preuzetu stranicu danas (None)."""
+    vrsta, sadrzaj = stavka
+    if vrsta == 'fajl':
+        return date.fromtimestamp(os.path.getmtime(sadrzaj)).isoformat()
+    return None
+
+
+class PisacZapisa(scraper.SerijskiUpis):
+    """
+    Jedini pisac: sirove zapise skuplja u serije od scraper.VELICINA_SERIJE, čisti ih vektorski
+    i upisuje preko dataset_io kao i scraper.py (iste dnevne particije, isti dataset za ostale faze).
+    Zapisi se grupišu po danu preuzimanja stranice, pa stare stranice iz spool-a idu u svoj dan.
+    """
+
+    def __init__(self, ime=IZLAZNI_DATASET, rezim="dan", velicina=scraper.VELICINA_SERIJE, indeks=None):
+        super().__init__(rezim, velicina, indeks, ime=ime)
+        self._po_danu = {}  # dan preuzimanja (None = danas) -> sirovi zapisi
+        self._zapisa = 0
+
+    def upisi(self, zapisi, datum=None):
+        self._po_danu.setdefault(datum, []).extend(zapisi)
+        self._zapisa += len(zapisi)
+        if self._zapisa >= self.velicina:
+            self._predaj()
+
+    def _predaj(self):
+        for datum, zapisi in self._po_danu.items():
+            self.dodaj(scraper.napravi_tabelu(zapisi, datum))
+        self._po_danu, self._zapisa = {}, 0
+
+    def zatvori(self):
+        self._predaj()
+        self.isprazni()
+
+
+def _preuzimaj(urls, red, paralelno, po_sekundi, spool_folder):
+    """Nit-proizvođač: preuzima stranice i stavlja ih u ograničeni red (blokira kad je pun)."""
+    sesija = scraper.napravi_sesiju(paralelno)
+    ogranicivac = scraper.OgranicivacBrzine(po_sekundi)
+
+    def preuzmi(broj_url):
+        broj, url = broj_url
+        html = scraper.preuzmi_html(url, sesija, ogranicivac)
+        if html is None:
+            return None
+        if spool_folder is None:
+            return ('html', html)
+        putanja = _spool_putanja(spool_folder, broj)
+        with gzip.open(putanja, 'wt', encoding='utf-8') as f:
+            f.write(html)
+        return ('fajl', putanja)
+
+    try:
+        with sesija, ThreadPoolExecutor(max_workers=paralelno) as executor:
+            for stavka in executor.map(preuzmi, enumerate(urls, start=1)):
+                if stavka is not None:
+                    red.put(stavka)
+    finally:
+        red.put(_KRAJ)
+
+
+def obradi_tok(stavke, pisac, procesa=PROCESA, backend=None):
+    """Šalje stavke procesima na parsiranje i upisuje rezultate redom kojim su stavke stigle."""
+    backend = backend or parseri.podrazumevani_backend()
+    u_toku = deque()
+
+    with ProcessPoolExecutor(max_workers=procesa) as executor:
+        for stavka in stavke:
+            u_toku.append((executor.submit(_parsiraj_stavku, stavka, backend), _datum_stavke(stavka)))
+            # Ograničavamo broj poslova u letu da memorija ne raste sa veličinom skrapinga
+            while len(u_toku) > 2 * procesa:
+                posao, datum = u_toku.popleft()
+                pisac.upisi(posao.result(), datum)
+
+        while u_toku:
+            posao, datum = u_toku.popleft()
+            pisac.upisi(posao.result(), datum)
+
+
+def _iz_reda(red):
+    while True:
+        stavka = red.get()
+        if stavka is _KRAJ:
+            return
+        yield stavka
+
+
+def pokreni(urls, izlaz=IZLAZNI_DATASET, paralelno=scraper.PARALELNO, po_sekundi=scraper.ZAHTEVA_U_SEKUNDI,
+            procesa=PROCESA, spool_folder=None, backend=None):
+    """
+    Preuzimanje (niti) -> ograničeni red -> parsiranje (procesi) -> jedan pisac.
+    Kao i pun prolaz scraper.py, puni i indeks oglasa (samo za glavni dataset), da sledeći
+    --inkrementalno krene od ovog stanja.
+    """
+    if spool_folder:
+        os.makedirs(spool_folder, exist_ok=True)
+
+    red = queue.Queue(maxsize=VELICINA_REDA)
+    proizvodjac = threading.Thread(target=_preuzimaj, args=(urls, red, paralelno, po_sekundi, spool_folder),
+                                   daemon=True)
+    proizvodjac.start()
+
+    # Indeks prati samo glavni dataset; upis u drugi (--izlaz) ne sme da označi oglase kao viđene
+    with IndeksOglasa() if izlaz == scraper.IZLAZNI_DATASET else contextlib.nullcontext() as indeks:
+        pisac = PisacZapisa(izlaz, indeks=indeks)
+        try:
+            obradi_tok(_iz_reda(red), pisac, procesa, backend)
+        finally:
+            pisac.zatvori()
+    proizvodjac.join()
+    return pisac.ukupno
+
+
+def reparsiraj_spool(spool_folder=SPOOL_FOLDER, izlaz=IZLAZNI_DATASET, procesa=PROCESA, backend=None):
+    """
+    Ponovo parsira sačuvane stranice (npr. posle promene selektora) bez ijednog zahteva ka sajtu.
+    Oglasi idu u dan kad je stranica preuzeta (vreme izmene spool fajla), pa se menjaju samo ti dani.
+    Indeks oglasa se ne menja: stare cene bi pregazile novije.
+    """
+    fajlovi = sorted(glob.glob(os.path.join(spool_folder, "stranica_*.html.gz")))
+    pisac = PisacZapisa(izlaz)
+    try:
+        obradi_tok((('fajl', f) for f in fajlovi), pisac, procesa, backend)
+    finally:
+        pisac.zatvori()
+    print(f"Reparsirano {len(fajlovi)} stranica iz '{spool_folder}'.")
+    return pisac.ukupno
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline skraping: preuzimanje, paralelno parsiranje, upis")
+    parser.add_argument("--stranice", type=int, default=scraper.BROJ_STRANICA)
+    parser.add_argument("--paralelno", type=int, default=scraper.PARALELNO, help="Niti za preuzimanje")
+    parser.add_argument("--rps", type=float, default=scraper.ZAHTEVA_U_SEKUNDI)
+    parser.add_argument("--procesa", type=int, default=PROCESA, help="Procesi za parsiranje")
+    parser.add_argument("--base-url", default=scraper.BASE_URL)
+    parser.add_argument("--izlaz", default=IZLAZNI_DATASET, help="Ime izlaznog dataset-a (vidi dataset_io.py)")
+    parser.add_argument("--spool", nargs="?", const=SPOOL_FOLDER, default=None,
+                        help="Čuvaj sirove stranice (gzip) u ovaj folder")
+    parser.add_argument("--iz-spoola", nargs="?", const=SPOOL_FOLDER, default=None,
+                        help="Ne preuzimaj ništa, samo ponovo parsiraj stranice iz spool foldera "
+                             "(u dane kad su preuzete; indeks oglasa za --inkrementalno se ne menja)")
+    parser.add_argument("--parser", choices=sorted(parseri.BACKENDI), default=scraper.PARSER)
+    args = parser.parse_args()
+
+    print(f"--- POČETAK SKRAPINGA (pipeline) ---")
+    if args.iz_spoola:
+        ukupno = reparsiraj_spool(args.iz_spoola, args.izlaz, args.procesa, args.parser)
+    else:
+        urls = [f"{args.base_url}?p={i}" for i in range(1, args.stranice + 1)]
+        ukupno = pokreni(urls, args.izlaz, args.paralelno, args.rps, args.procesa, args.spool, args.parser)
+
+    if not ukupno:
+        print("\n[GREŠKA] Nisam našao podatke. Da li je sajt promenio strukturu?")
+        # Kod != 0, da pipeline ne pokrene sledeće faze nad starim podacima
+        sys.exit(1)
+    print(f"\nUspešno! Ukupno upisano {ukupno} stanova u dataset '{args.izlaz}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import argparse
+import asyncio
+import math
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+from scipy import sparse
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+
+import metrike
+from ciscenje import normalizuj_delove_grada
+from geokoderi import GazetirGeokoder, normalizuj_naziv
+from model_artefakt import pripremi_X, ucitaj_artefakt
+
+# --- KONFIGURACIJA ---
+HOST = "127.0.0.1"
+PORT = 8080
+VELICINA_KESA = 10000  # Koliko različitih upita pamtimo (LRU)
+MAX_OGLASA = 1000  # Najviše oglasa u jednom zahtevu
+INTERVAL = (10, 90)  # Percentili predviđanja pojedinačnih stabala: 80% interval
+DECIMALE_KOORDINATA = 5  # ~1 m; bliži upiti dele isti ključ keša
+MIN_KVADRATURA, MAX_KVADRATURA = 10, 1000  # Isti opseg kao ciscenje.py
+
+
+class GreskaUlaza(ValueError):
+    """Oglas iz zahteva koji ne može da se proceni (fali kvadratura, nepoznat deo grada bez koordinata...)."""
+
+
+class LRUKes:
+    """Mali LRU keš; koristi ga samo nit event loop-a, pa nema zaključavanja."""
+
+    def __init__(self, velicina=VELICINA_KESA):
+        self.velicina = velicina
+        self._stavke = OrderedDict()
+        self.pogoci = 0
+        self.promasaji = 0
+
+    def uzmi(self, kljuc):
+        if kljuc in self._stavke:
+            self._stavke.move_to_end(kljuc)
+            self.pogoci += 1
+            return self._stavke[kljuc]
+        self.promasaji += 1
+        return None
+
+    def stavi(self, kljuc, vrednost):
+        self._stavke[kljuc] = vrednost
+        self._stavke.move_to_end(kljuc)
+        while len(self._stavke) > self.velicina:
+            self._stavke.popitem(last=False)
+
+    def __len__(self):
+        return len(self._stavke)
+
+
+class Procenjivac:
+    """
+    Sačuvan model (model_artefakt.py) učitan jednom, plus gazetir za delove grada bez koordinata.
+    Interval je iz raspodele predviđanja pojedinačnih stabala šume; za modele bez šume ga nema.
+    """
+
+    def __init__(self, verzija=None, velicina_kesa=VELICINA_KESA):
+        self.model, self.kolone, self.meta = ucitaj_artefakt(verzija)
+        suma = self.model['model']
+        self.stabla = suma.estimators_ if isinstance(suma, (RandomForestRegressor, ExtraTreesRegressor)) else None
+        # Nepoznati delovi u treningu zadržavaju najčešće pisanje; ovde se isti ključ vraća na to pisanje
+        self.vokabular = {normalizuj_naziv(deo): deo for deo in self.meta.get('vokabular_delova', [])}
+        self.naziv_dela = lru_cache(maxsize=1024)(self._naziv_dela)
+        self.centroid = lru_cache(maxsize=1024)(GazetirGeokoder().pronadji)
+        self.kes = LRUKes(velicina_kesa)
+        self._na_cekanju = []  # (redovi, future) promašaja koji čekaju sledeći prolaz kroz model
+        self._model_radi = False
+
+    def pripremi(self, oglas):
+        """JSON oglas -> (ključ keša, red za model, izvor koordinata); ključ je tačno ono što model vidi."""
+        if not isinstance(oglas, dict):
+            raise GreskaUlaza("Oglas mora biti JSON objekat.")
+        try:
+            kvadratura = float(oglas['Kvadratura_m2'])
+        except (KeyError, TypeError, ValueError):
+            raise GreskaUlaza("Nedostaje ili nije broj: Kvadratura_m2.")
+        if not MIN_KVADRATURA <= kvadratura <= MAX_KVADRATURA:
+            raise GreskaUlaza(f"Kvadratura_m2 mora biti između {MIN_KVADRATURA} i {MAX_KVADRATURA}.")
+
+        deo = self.naziv_dela(str(oglas.get('Deo_Grada') or ''))
+        lat, lon = oglas.get('Latitude'), oglas.get('Longitude')
+        izvor = "oglas"
+        try:
+            lat, lon = (float(lat), float(lon)) if lat is not None and lon is not None else (None, None)
+        except (TypeError, ValueError):
+            raise GreskaUlaza("Latitude i Longitude moraju biti brojevi.")
+        if lat is None or not (math.isfinite(lat) and math.isfinite(lon)):
+            koordinate = self.centroid(deo) if deo else None
+            if koordinate is None:
+                raise GreskaUlaza("Potrebne su koordinate ili deo grada iz gazetira.")
+            lat, lon = koordinate
+            izvor = "deo_grada"
+
+        red = {'Kvadratura_m2': round(kvadratura, 1), 'Latitude': round(lat, DECIMALE_KOORDINATA),
+               'Longitude': round(lon, DECIMALE_KOORDINATA), 'Deo_Grada': deo or 'Nepoznato'}
+        return tuple(red[k] for k in self.kolone), red, izvor
+
+    def _naziv_dela(self, deo):
+        """
+        Ista normalizacija kao za trening (ciscenje.normalizuj_delove_grada), da 'liman 4' i 'LIMAN 4'
+        budu isti deo grada za model i za keš; '' ako naziva nema.
+        """
+        naziv = normalizuj_delove_grada(pd.Series([deo])).iloc[0]
+        if pd.isna(naziv):
+            return ''
+        return self.vokabular.get(normalizuj_naziv(naziv), naziv)
+
+    def predvidi(self, redovi):
+        """(cena, donja, gornja) za listu redova; jedan prolaz kroz koder i stabla za ceo zahtev."""
+        X = pripremi_X(pd.DataFrame(redovi), self.kolone)
+        with metrike.izmeri("servis_predict"):
+            if self.stabla is None:
+                cena = self.model.predict(X)
+                return cena, np.full(len(cena), np.nan), np.full(len(cena), np.nan)
+            Xk = self.model['koder'].transform(X)
+            Xk = np.ascontiguousarray(Xk.toarray() if sparse.issparse(Xk) else Xk, dtype=np.float32)
+            # Isto što šuma radi interno: float32 ulaz jednom, bez ponovne provere za svako stablo
+            po_stablima = np.stack([stablo.predict(Xk, check_input=False) for stablo in self.stabla])
+        # Prosek stabala je upravo predviđanje šume
+        donja, gornja = np.percentile(po_stablima, INTERVAL, axis=0)
+        return po_stablima.mean(axis=0), donja, gornja
+
+    async def _predvidi_zajedno(self, redovi):
+        """
+        Promašaji istovremenih zahteva idu kroz model zajedno: poziv za 1 i za 100 redova traje skoro isto.
+        Dok jedan prolaz radi (u niti), novi promašaji se skupljaju za sledeći.
+        """
+        buducnost = asyncio.get_running_loop().create_future()
+        self._na_cekanju.append((redovi, buducnost))
+        if not self._model_radi:
+            self._model_radi = True
+            asyncio.create_task(self._obradi_na_cekanju())
+        return await buducnost
+
+    async def _obradi_na_cekanju(self):
+        petlja = asyncio.get_running_loop()
+        try:
+            while self._na_cekanju:
+                grupa, self._na_cekanju = self._na_cekanju, []
+                redovi = [red for redovi, _ in grupa for red in redovi]
+                metrike.uvecaj("servis_prolazi_modela")
+                try:
+                    rezultat = await petlja.run_in_executor(None, self.predvidi, redovi)
+                except Exception as e:
+                    for _, buducnost in grupa:
+                        if not buducnost.done():
+                            buducnost.set_exception(e)
+                    continue
+                pocetak = 0
+                for redovi_zahteva, buducnost in grupa:
+                    kraj = pocetak + len(redovi_zahteva)
+                    if not buducnost.done():  # Klijent je možda već otišao
+                        buducnost.set_result([niz[pocetak:kraj] for niz in rezultat])
+                    pocetak = kraj
+        finally:
+            self._model_radi = False
+
+    async def proceni(self, oglasi):
+        """Procena za listu JSON oglasa; pogoci iz keša ne idu u model, ostali idu zajedno (vidi _predvidi_zajedno)."""
+        rezultati, za_model = [None] * len(oglasi), {}
+        for i, oglas in enumerate(oglasi):
+            try:
+                kljuc, red, izvor = self.pripremi(oglas)
+            except GreskaUlaza as e:
+                rezultati[i] = {'greska': str(e)}
+                continue
+            procena = self.kes.uzmi(kljuc)
+            if procena is not None:
+                rezultati[i] = {**procena, 'Izvor_Koordinata': izvor, 'Iz_Kesa': True}
+            else:
+                za_model.setdefault(kljuc, (red, []))[1].append((i, izvor))
+
+        if za_model:
+            redovi = [red for red, _ in za_model.values()]
+            cene, donje, gornje = await self._predvidi_zajedno(redovi)
+            for (kljuc, (red, mesta)), cena, donja, gornja in zip(za_model.items(), cene, donje, gornje):
+                procena = opis_procene(red, cena, donja, gornja)
+                self.kes.stavi(kljuc, procena)
+                for i, izvor in mesta:
+                    rezultati[i] = {**procena, 'Izvor_Koordinata': izvor, 'Iz_Kesa': False}
+
+        metrike.uvecaj("procene", len(oglasi))
+        return rezultati
+
+
+def opis_procene(red, cena, donja, gornja):
+    kvadratura = red['Kvadratura_m2']
+    interval = None if np.isnan(donja) else [round(float(donja)), round(float(gornja))]
+    return {
+        'Deo_Grada': red['Deo_Grada'],
+        'Kvadratura_m2': kvadratura,
+        'Latitude': red['Latitude'],
+        'Longitude': red['Longitude'],
+        'Cena_EUR': round(float(cena)),
+        'Cena_po_m2': round(float(cena) / kvadratura, 2),
+        'Interval_Cena_EUR': interval,
+        'Interval_Cena_po_m2': None if interval is None else [round(v / kvadratura, 2) for v in interval],
+    }
+
+
+async def procena(request):
+    """
+    POST /procena sa jednim oglasom {"Kvadratura_m2": 54, "Deo_Grada": "Liman 3"} (koordinate opciono)
+    ili listom oglasa (ili {"oglasi": [...]}); GET /procena?Kvadratura_m2=54&Deo_Grada=Liman+3 za jedan.
+    """
+    procenjivac = request.app['procenjivac']
+    if request.method == "GET":
+        telo = dict(request.query)
+    else:
+        try:
+            telo = await request.json()
+        except ValueError:
+            return web.json_response({'greska': "Telo zahteva nije ispravan JSON."}, status=400)
+
+    batch = isinstance(telo, list) or (isinstance(telo, dict) and 'oglasi' in telo)
+    oglasi = (telo['oglasi'] if isinstance(telo, dict) else telo) if batch else [telo]
+    if not isinstance(oglasi, list) or not oglasi or len(oglasi) > MAX_OGLASA:
+        return web.json_response({'greska': f"Očekuje se 1 do {MAX_OGLASA} oglasa."}, status=400)
+
+    rezultati = await procenjivac.proceni(oglasi)
+    if batch:
+        return web.json_response({'verzija': procenjivac.meta['verzija'], 'procene': rezultati})
+    status = 400 if 'greska' in rezultati[0] else 200
+    return web.json_response({'verzija': procenjivac.meta['verzija'], **rezultati[0]}, status=status)
+
+
+async def zdravlje(request):
+    procenjivac = request.app['procenjivac']
+    kes = procenjivac.kes
+    return web.json_response({
+        'verzija': procenjivac.meta['verzija'],
+        'stabala': len(procenjivac.stabla) if procenjivac.stabla is not None else None,
+        'metrike_modela': procenjivac.meta.get('metrike'),
+        'kes': {'velicina': len(kes), 'pogoci': kes.pogoci, 'promasaji': kes.promasaji},
+    })
+
+
+def napravi_aplikaciju(procenjivac):
+    app = web.Application(client_max_size=4 * 1024 * 1024)
+    app['procenjivac'] = procenjivac
+    app.router.add_get("/procena", procena)
+    app.router.add_post("/procena", procena)
+    app.router.add_get("/zdravlje", zdravlje)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP servis za procenu cene stana iz sačuvanog modela")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--verzija", help="Verzija modela (podrazumevano aktivna, vidi modeli/poslednji.json)")
+    parser.add_argument("--kes", type=int, default=VELICINA_KESA, help="Veličina LRU keša procena")
+    args = parser.parse_args()
+
+    try:
+        procenjivac = Procenjivac(args.verzija, args.kes)
+    except (FileNotFoundError, ValueError) as e:
+        print(e)
+        return
+    print(f"Model {procenjivac.meta['verzija']} je učitan; servis radi na http://{args.host}:{args.port}/procena")
+    web.run_app(napravi_aplikaciju(procenjivac), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    with metrike.faza("servis"):
+        main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+# Moduli su ravni fajlovi u korenu repozitorijuma
+KOREN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, KOREN)
+
+from benchmark import sinteticka_stranica  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """?p=N: sintetička stranica N (prazna posle poslednje), osim ako je za N zakazan drugi odgovor."""
+
+    def do_GET(self):
+        broj = int(parse_qs(urlparse(self.path).query).get('p', ['1'])[0])
+        self.server.zahtevi.append(broj)
+        zakazani = self.server.odgovori.get(broj)
+        if zakazani:
+            status, zaglavlja = zakazani.pop(0)
+            self.send_response(status)
+            for ime, vrednost in zaglavlja.items():
+                self.send_header(ime, vrednost)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        telo = sinteticka_stranica(broj if broj <= self.server.broj_stranica else 0).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(telo)))
+        self.end_headers()
+        self.wfile.write(telo)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.broj_stranica = 3
+    server.odgovori = {}  # broj stranice -> [(status, zaglavlja), ...] pre prave stranice
+    server.zahtevi = []
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    nit = threading.Thread(target=server.serve_forever, daemon=True)
+    nit.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def u_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from adrese import PRECIZNOST_DEO_GRADA, PRECIZNOST_GRAD, PRECIZNOST_ULICA, adrese_oglasa, izaberi_lokaciju, izvuci_ulicu
+
+
+def _oglasi():
+    return pd.DataFrame({
+        'Naslov': ["Stan ul. Narodnog fronta 12", "Stan na Detelinari", "Stan", "Stan"],
+        'Deo_Grada': pd.Series(["Novi Sad", np.nan, "Liman 1", np.nan], dtype='category'),
+        'Ulica': ["Narodnog Fronta 12", None, None, None],
+        'Deo_Grada_Nagovestaj': [None, "Detelinara", None, None],
+    })
+
+
+def test_izvuci_ulicu():
+    assert izvuci_ulicu("Prodajem stan, ul. Narodnog fronta br. 12 u centru") == "Narodnog Fronta 12"
+    assert izvuci_ulicu("Bul. oslobođenja 76") == "Bulevar Oslobođenja 76"
+    assert izvuci_ulicu(np.nan) is None
+
+
+def test_adrese_oglasa_bez_dela_grada():
+    adrese_ulica, adrese_delova = adrese_oglasa(_oglasi())
+    assert adrese_ulica.iloc[0] == "Narodnog Fronta 12, Novi Sad, Srbija"
+    # Bez dela grada sa sajta važi deo grada iz naslova; bez oba nema adrese
+    assert adrese_delova.iloc[1] == "Detelinara, Novi Sad, Srbija"
+    assert adrese_delova.iloc[2] == "Liman 1, Novi Sad, Srbija"
+    assert pd.isna(adrese_delova.iloc[3])
+
+
+def test_izaberi_lokaciju_bez_dela_grada():
+    df = izaberi_lokaciju(_oglasi(), {"Narodnog Fronta 12, Novi Sad, Srbija": (45.25, 19.84)},
+                          {"Detelinara, Novi Sad, Srbija": (45.26, 19.81), "Liman 1, Novi Sad, Srbija": (45.24, 19.85),
+                           "Novi Sad, Novi Sad, Srbija": (45.25, 19.83)})
+    assert df['Preciznost_Lokacije'].iloc[:3].tolist() == [PRECIZNOST_ULICA, PRECIZNOST_DEO_GRADA, PRECIZNOST_DEO_GRADA]
+    assert pd.isna(df['Preciznost_Lokacije'].iloc[3]) and np.isnan(df['Latitude'].iloc[3])
+    assert PRECIZNOST_GRAD not in df['Preciznost_Lokacije'].tolist()
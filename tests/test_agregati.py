@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from agregati import KLJUC, KOLONE_HISTOGRAMA, KORAK_HISTOGRAMA, izracunaj_kocku, kvantil_iz_histograma, sazmi, spoji_kocke
+from dataset_io import KOLONA_PARTICIJE
+
+
+def _oglasi(n=300, seme=0):
+    rng = np.random.default_rng(seme)
+    kvadratura = rng.uniform(25, 120, n).round(1)
+    return pd.DataFrame({
+        'Deo_Grada': rng.choice(["Liman 1", "Centar", "Detelinara"], n),
+        'Cena_EUR': (kvadratura * rng.uniform(1500, 3500, n)).round(),
+        'Kvadratura_m2': kvadratura,
+        KOLONA_PARTICIJE: rng.choice(["2024-01-01", "2024-01-02"], n),
+    })
+
+
+def test_spoji_kocke_isto_kao_cela_tabela():
+    df = _oglasi()
+    cela = izracunaj_kocku(df)
+    spojena = spoji_kocke([izracunaj_kocku(df.iloc[:100]), izracunaj_kocku(df.iloc[100:250]),
+                           izracunaj_kocku(df.iloc[250:])])
+    pd.testing.assert_frame_equal(spojena.astype({k: 'string' for k in KLJUC}), cela.astype({k: 'string' for k in KLJUC}),
+                                  check_dtype=False)
+    assert cela['Broj'].sum() == len(df)
+
+
+def test_spoji_kocke_bez_delova():
+    assert len(spoji_kocke([])) == 0
+
+
+def test_kvantil_iz_histograma():
+    histogram = np.zeros((3, 4))
+    histogram[0, 1] = 10  # Sve u korpi [100, 200)
+    histogram[1] = [1, 1, 1, 1]
+    kvantili = kvantil_iz_histograma(histogram, 0.5)
+    assert kvantili[0] == 1.5 * KORAK_HISTOGRAMA
+    assert kvantili[1] == 2 * KORAK_HISTOGRAMA
+    assert np.isnan(kvantili[2])  # Prazan histogram
+
+
+def test_sazmi_medijana_blizu_tacne():
+    df = _oglasi(2000)
+    sazetak = sazmi(izracunaj_kocku(df))
+    tacna = (df['Cena_EUR'] / df['Kvadratura_m2']).groupby(df['Deo_Grada']).median()
+    razlika = (sazetak['Medijana_Cena_po_m2'] - tacna.reindex(sazetak.index)).abs()
+    assert (razlika <= KORAK_HISTOGRAMA).all()
+    assert sazetak['Broj'].sum() == len(df)
+    assert len(KOLONE_HISTOGRAMA) > 0
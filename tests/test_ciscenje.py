@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from adrese import adrese_oglasa, dodaj_nagovestaje
+from ciscenje import GEO_KOLONE, KURS_RSD, normalizuj_delove_grada, ocisti, ocisti_oglase, tekst_u_cenu, tekst_u_kvadraturu
+from geokoderi import GazetirGeokoder
+
+
+def test_tekst_u_cenu():
+    cene = tekst_u_cenu(pd.Series(["66 950 €", "1.200.000 €", "7.800.000 din", "Cena na upit", None]))
+    assert cene.iloc[0] == 66950
+    assert cene.iloc[1] == 1_200_000
+    assert cene.iloc[2] == 7_800_000 / KURS_RSD
+    assert cene.iloc[3:].isna().all()
+
+
+def test_tekst_u_kvadraturu():
+    kvadrature = tekst_u_kvadraturu(pd.Series(["54 m²", "54,5m2", "5 ari", "N/A"]))
+    assert kvadrature.iloc[:3].tolist() == [54.0, 54.5, 500.0]
+    assert np.isnan(kvadrature.iloc[3])
+
+
+def test_ocisti_oglase_odbacuje_bez_cene():
+    sirovi = pd.DataFrame({
+        'Naslov': ["Stan", "Stan bez cene"],
+        'Lokacija': ["Liman 1, Novi Sad, Srbija", "Centar, Novi Sad, Srbija"],
+        'Cena_Tekst': ["100 000 €", None],
+        'Kvadratura_Tekst': ["50 m²", "40 m²"],
+        'Link': ["a", "b"],
+    })
+    oglasi = ocisti_oglase(sirovi)
+    assert oglasi['Link'].tolist() == ["a"]
+    assert oglasi['Deo_Grada'].iloc[0] == "Liman 1"
+    assert oglasi['Cena_po_m2'].iloc[0] == 2000.0
+
+
+def _oglasi(n=40):
+    rng = np.random.default_rng(0)
+    kvadratura = rng.uniform(40, 80, n)
+    return pd.DataFrame({
+        'Deo_Grada': ["Liman 1"] * n,
+        'Cena_EUR': (kvadratura * rng.uniform(2000, 2500, n)).round(),
+        'Kvadratura_m2': kvadratura,
+        'Latitude': np.full(n, 45.24),
+        'Longitude': np.full(n, 19.84),
+        'Link': [f"l{i}" for i in range(n)],
+    })
+
+
+def test_ocisti_izbacuje_nemoguce_vrednosti():
+    df = _oglasi()
+    df.loc[0, 'Cena_EUR'] = np.nan
+    df.loc[1, 'Cena_EUR'] = 2200  # Cena po m² umesto cene
+    df.loc[2, 'Kvadratura_m2'] = 5000
+    df.loc[3, 'Latitude'] = 44.8  # Beograd
+    ocisceni = ocisti(df, GEO_KOLONE, odstupanja=False)
+    assert set(ocisceni['Link']) == set(df['Link'][4:])
+    # Bez koordinata u potrebnim kolonama, tačka van grada ostaje
+    assert "l3" in set(ocisti(df, odstupanja=False)['Link'])
+
+
+def test_ocisti_izbacuje_odstupanja_po_delu_grada():
+    df = _oglasi()
+    df.loc[0, 'Cena_EUR'] = df.loc[0, 'Kvadratura_m2'] * 20000
+    assert "l0" not in set(ocisti(df, GEO_KOLONE)['Link'])
+    assert "l0" in set(ocisti(df, GEO_KOLONE, odstupanja=False)['Link'])
+
+
+def test_ocisti_tekst_u_brojcanoj_koloni():
+    df = _oglasi().astype({'Cena_EUR': object})
+    df.loc[0, 'Cena_EUR'] = "dogovor"
+    assert "l0" not in set(ocisti(df, GEO_KOLONE, odstupanja=False)['Link'])
+
+
+def test_normalizuj_delove_grada():
+    delovi = pd.Series(["Liman 1", "LIMAN  1", " liman 1", "Zeleznicka stanica", "Železnička stanica", None])
+    nazivi = normalizuj_delove_grada(delovi)
+    assert nazivi.iloc[:3].tolist() == ["Liman 1"] * 3
+    assert nazivi.iloc[3:5].tolist() == ["Železnička stanica"] * 2
+    assert pd.isna(nazivi.iloc[5])
+
+
+def test_prazna_lokacija_do_adrese():
+    sirovi = pd.DataFrame({
+        'Naslov': ["Stan na Detelinari", "Stan bez lokacije"],
+        'Lokacija': ["", None],
+        'Cena_Tekst': ["100 000 €", "90 000 €"],
+        'Kvadratura_Tekst': ["50 m²", "45 m²"],
+        'Link': ["a", "b"],
+    })
+    oglasi = ocisti_oglase(sirovi)
+    assert oglasi['Deo_Grada'].isna().all()
+    oglasi = dodaj_nagovestaje(ocisti(oglasi, odstupanja=False), GazetirGeokoder())
+    _, adrese_delova = adrese_oglasa(oglasi)
+    assert adrese_delova.iloc[0] == "Detelinara, Novi Sad, Srbija"
+    assert pd.isna(adrese_delova.iloc[1])
@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+import dataset_io
+from dataset_io import KOLONA_PARTICIJE, citaj_delove, postavi_tipove, sacuvaj_dataset, ucitaj_dataset
+
+FORMATI = ["csv"] + (["parquet"] if dataset_io.pa is not None else [])
+
+
+def _oglasi(dan, cene):
+    return pd.DataFrame({
+        'Link': [f"{dan}-{i}" for i in range(len(cene))],
+        'Deo_Grada': ["Liman 1", "Centar", "Detelinara"][:len(cene)],
+        'Cena_EUR': cene,
+        'Kvadratura_m2': [50.0, 60.5, 70.0][:len(cene)],
+        KOLONA_PARTICIJE: dan,
+    })
+
+
+def test_postavi_tipove_cena_bez_vrednosti_i_tekst():
+    df = postavi_tipove(pd.DataFrame({'Cena_EUR': ["100000", None, "po dogovoru", 120000.4],
+                                      'Deo_Grada': ["Liman 1"] * 4}))
+    assert str(df['Cena_EUR'].dtype) == 'Int64'
+    assert df['Cena_EUR'].tolist()[0] == 100000
+    assert df['Cena_EUR'].isna().tolist() == [False, True, True, False]
+    assert df['Cena_EUR'].iloc[3] == 120000
+    assert isinstance(df['Deo_Grada'].dtype, pd.CategoricalDtype)
+
+
+@pytest.mark.parametrize("format", FORMATI)
+def test_sacuvaj_i_ucitaj(tmp_path, monkeypatch, format):
+    monkeypatch.chdir(tmp_path)
+    df = _oglasi("2024-01-01", [100000, None, 150000])
+    sacuvaj_dataset(df, "ds", format=format)
+    ucitan = ucitaj_dataset("ds")
+    assert ucitan['Link'].tolist() == df['Link'].tolist()
+    assert str(ucitan['Cena_EUR'].dtype) == 'Int64'
+    assert ucitan['Cena_EUR'].isna().tolist() == [False, True, False]
+    assert ucitan['Kvadratura_m2'].tolist() == df['Kvadratura_m2'].tolist()
+
+    delovi = list(citaj_delove("ds", velicina=2))
+    assert [len(d) for d in delovi] == [2, 1]
+    # Delovi imaju različite kategorije, pa ih concat spaja kao tekst
+    spojeni = pd.concat(delovi, ignore_index=True)
+    pd.testing.assert_frame_equal(spojeni.astype({'Deo_Grada': 'string'}), ucitan.astype({'Deo_Grada': 'string'}))
+
+
+@pytest.mark.parametrize("format", FORMATI)
+def test_kolone_i_filteri(tmp_path, monkeypatch, format):
+    monkeypatch.chdir(tmp_path)
+    sacuvaj_dataset(_oglasi("2024-01-01", [100000, 110000, 150000]), "ds", format=format)
+    ucitan = ucitaj_dataset("ds", kolone=['Link', 'Cena_EUR'], filteri=[('Cena_EUR', '>', 105000)])
+    assert list(ucitan.columns) == ['Link', 'Cena_EUR']
+    assert ucitan['Link'].tolist() == ["2024-01-01-1", "2024-01-01-2"]
+
+
+@pytest.mark.skipif(dataset_io.pa is None, reason="pyarrow nije instaliran")
+def test_rezimi_upisa_po_danima(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sacuvaj_dataset(_oglasi("2024-01-01", [100000, 110000]), "ds")
+    sacuvaj_dataset(_oglasi("2024-01-02", [120000]), "ds", rezim="dopuni")
+    assert len(ucitaj_dataset("ds")) == 3
+
+    # "dan" menja samo dane iz novog upisa
+    sacuvaj_dataset(_oglasi("2024-01-02", [130000, 140000]), "ds", rezim="dan")
+    ucitan = ucitaj_dataset("ds")
+    assert ucitan[KOLONA_PARTICIJE].tolist() == ["2024-01-01"] * 2 + ["2024-01-02"] * 2
+    assert ucitan['Cena_EUR'].tolist() == [100000, 110000, 130000, 140000]
+
+    sacuvaj_dataset(_oglasi("2024-01-03", [90000]), "ds")
+    assert ucitaj_dataset("ds")['Link'].tolist() == ["2024-01-03-0"]
+
+
+def test_dopuni_csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sacuvaj_dataset(_oglasi("2024-01-01", [100000]), "ds", format="csv")
+    sacuvaj_dataset(_oglasi("2024-01-02", [120000]).assign(Nova_Kolona=1), "ds", rezim="dopuni", format="csv")
+    ucitan = ucitaj_dataset("ds")
+    assert ucitan['Cena_EUR'].tolist() == [100000, 120000]
+    assert 'Nova_Kolona' not in ucitan.columns
+
+
+def test_potpis_se_menja_sa_upisom(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert dataset_io.potpis_dataseta("ds") == []
+    sacuvaj_dataset(_oglasi("2024-01-01", [100000]), "ds")
+    potpis = dataset_io.potpis_dataseta("ds")
+    assert potpis == dataset_io.potpis_dataseta("ds")
+    sacuvaj_dataset(_oglasi("2024-01-02", [120000]), "ds", rezim="dopuni")
+    assert dataset_io.potpis_dataseta("ds") != potpis
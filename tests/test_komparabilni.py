@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from komparabilni import IndeksKomparabilnih
+
+
+def _oglasi(n=200, seme=0, prefiks="l"):
+    rng = np.random.default_rng(seme)
+    kvadratura = rng.uniform(30, 100, n).round(1)
+    return pd.DataFrame({
+        'Link': [f"{prefiks}{i}" for i in range(n)],
+        'Deo_Grada': ["Liman 1"] * n,
+        'Cena_EUR': (kvadratura * rng.uniform(2000, 2400, n)).round(),
+        'Kvadratura_m2': kvadratura,
+        'Latitude': 45.25 + rng.normal(0, 0.01, n),
+        'Longitude': 19.84 + rng.normal(0, 0.01, n),
+    })
+
+
+def _tacni_najblizi(df, lat, lon, k):
+    dlat = np.radians(df['Latitude'] - lat)
+    dlon = np.radians(df['Longitude'] - lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(np.radians(lat)) * np.cos(np.radians(df['Latitude'])) * np.sin(dlon / 2) ** 2
+    return set(df['Link'].to_numpy()[np.argsort(np.arcsin(np.sqrt(a)).to_numpy())[:k]])
+
+
+def test_najblizi_kao_gruba_sila():
+    df = _oglasi()
+    indeks = IndeksKomparabilnih(df)
+    udaljenosti, indeksi = indeks.najblizi([45.25], [19.84], k=5)
+    assert set(indeks.podaci['link'][indeksi[0]]) == _tacni_najblizi(df, 45.25, 19.84, 5)
+    assert (np.diff(udaljenosti[0]) >= 0).all()
+
+
+def test_najblizi_po_kvadraturi():
+    indeks = IndeksKomparabilnih(_oglasi())
+    _, indeksi = indeks.najblizi([45.25], [19.84], kvadratura=[50.0], k=5, tolerancija=0.1)
+    nadjeni = indeksi[0][indeksi[0] >= 0]
+    assert len(nadjeni)
+    assert (np.abs(indeks.podaci['kvadratura'][nadjeni] - 50) <= 5).all()
+
+
+def test_nepopunjena_mesta():
+    indeks = IndeksKomparabilnih(_oglasi(3))
+    udaljenosti, indeksi = indeks.najblizi([45.25], [19.84], k=5)
+    assert (indeksi[0, 3:] == -1).all() and np.isinf(udaljenosti[0, 3:]).all()
+
+
+def test_delta_i_azuriranje_kao_nov_indeks():
+    stari, novi = _oglasi(), _oglasi(50, seme=1, prefiks="n")
+    indeks = IndeksKomparabilnih(stari)
+    assert indeks.dodaj(novi) == (50, 0)
+
+    ceo = pd.concat([stari.iloc[10:], novi], ignore_index=True)
+    ceo.loc[0, 'Cena_EUR'] += 1000
+    assert indeks.azuriraj(ceo) == (0, 1, 10)
+
+    svez = IndeksKomparabilnih(ceo)
+    upiti = (np.full(3, 45.25), np.array([19.83, 19.84, 19.85]))
+    _, indeksi = indeks.najblizi(*upiti, k=5)
+    _, sveze = svez.najblizi(*upiti, k=5)
+    assert (indeks.podaci['link'][indeksi] == svez.podaci['link'][sveze]).all()
+    np.testing.assert_allclose(indeks.procena_cene_m2(*upiti), svez.procena_cene_m2(*upiti))
+
+
+def test_oglas_bez_dela_grada():
+    df = _oglasi(20)
+    df['Deo_Grada'] = df['Deo_Grada'].astype('category')
+    df.loc[0, 'Deo_Grada'] = None
+    indeks = IndeksKomparabilnih(df)
+    assert "nan" not in set(indeks.podaci['deo_grada'])
+
+    tabela = indeks.komparabilni(df.loc[[0], ['Latitude', 'Longitude']], k=3)
+    assert pd.isna(tabela['Deo_Grada'].iloc[0])  # Sam oglas je najbliži
+    assert (tabela['Deo_Grada'].iloc[1:] == "Liman 1").all()
+    assert indeks.azuriraj(df) == (0, 0, 0)
@@ -0,0 +1,62 @@
+import folium
+import numpy as np
+import pandas as pd
+
+from map_viz import SlojeviMape, dodaj_prosek_cena
+
+
+def _oglasi(delovi, seme=0):
+    rng = np.random.default_rng(seme)
+    n = len(delovi)
+    return pd.DataFrame({
+        'Deo_Grada': pd.Series(delovi, dtype='category'),
+        'Cena_EUR': rng.uniform(60000, 200000, n).round(),
+        'Kvadratura_m2': rng.uniform(30, 90, n).round(1),
+        'Latitude': rng.uniform(45.24, 45.26, n),
+        'Longitude': rng.uniform(19.82, 19.85, n),
+        'Preciznost_Lokacije': "ulica",
+    })
+
+
+def test_delovi_dele_sifre_delova_grada():
+    slojevi = SlojeviMape()
+    slojevi.dodaj(_oglasi(["Centar", "Liman 1"]))
+    slojevi.dodaj(_oglasi(["Liman 1", None, "Detelinara"]))  # Drugi deo, druge kategorije
+    nazivi = list(slojevi.sifre_delova)
+    assert [nazivi[red[4]] for red in slojevi.redovi] == ["Centar", "Liman 1", "Liman 1", "Nepoznato", "Detelinara"]
+    assert slojevi.ukupno == slojevi.celije['broj'].sum() == 5
+
+
+def test_auto_prelazi_na_klaster_i_pusta_oglase_za_markere():
+    slojevi = SlojeviMape(max_markera=3)
+    slojevi.dodaj(_oglasi(["Centar", "Centar"]))
+    assert len(slojevi.za_markere) == 1
+    slojevi.dodaj(_oglasi(["Centar", "Centar"]))
+    assert slojevi.za_markere is None
+    assert slojevi.nacrtaj(folium.Map()) == "klaster"
+
+
+def test_bez_granice_markeri_ostaju():
+    slojevi = SlojeviMape(max_markera=None)
+    for seme in range(3):
+        slojevi.dodaj(_oglasi(["Centar", "Centar"], seme))
+    assert len(slojevi.za_markere) == 3
+
+
+def test_prosek_cene_ne_zavisi_od_broja_oglasa():
+    # Deset jeftinih stanova u jednoj ćeliji i jedan skup u drugoj: skuplja ćelija mora biti skuplja
+    jeftini = pd.DataFrame({'Deo_Grada': "Liman 1", 'Cena_EUR': 50000.0, 'Kvadratura_m2': 50.0,
+                            'Latitude': 45.2451, 'Longitude': 19.8201}, index=range(10))
+    skup = pd.DataFrame({'Deo_Grada': ["Centar"], 'Cena_EUR': [150000.0], 'Kvadratura_m2': [50.0],
+                         'Latitude': [45.2551], 'Longitude': [19.8451]})
+    slojevi = SlojeviMape()
+    slojevi.dodaj(jeftini.iloc[:4])
+    slojevi.dodaj(jeftini.iloc[4:])
+    slojevi.dodaj(skup)
+    prosek = slojevi.celije['zbir'] / slojevi.celije['broj']
+    assert sorted(prosek) == [1000, 3000]
+    assert sorted(slojevi.celije['broj']) == [1, 10]
+
+    mapa = folium.Map()
+    dodaj_prosek_cena(mapa, slojevi.celije)
+    assert "3,000 EUR" in mapa.get_root().render()
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from ml_model import napravi_pipeline, napravi_X_y
+from model_artefakt import OSTALO, sacuvaj_artefakt, ucitaj_artefakt
+
+
+def _oglasi(delovi, po_delu=20, seme=0):
+    rng = np.random.default_rng(seme)
+    n = len(delovi) * po_delu
+    kvadratura = rng.uniform(30, 100, n)
+    deo = np.repeat(delovi, po_delu)
+    cena_m2 = np.select([deo == d for d in delovi], [1500 + 500 * i for i in range(len(delovi))])
+    return pd.DataFrame({
+        'Deo_Grada': deo,
+        'Kvadratura_m2': kvadratura,
+        'Latitude': 45.25 + rng.normal(0, 0.01, n),
+        'Longitude': 19.84 + rng.normal(0, 0.01, n),
+        'Cena_EUR': (kvadratura * cena_m2).round(),
+    })
+
+
+def _istreniran(df):
+    model = napravi_pipeline(RandomForestRegressor(n_estimators=10, random_state=0))
+    return model.fit(*napravi_X_y(df))
+
+
+def _kolone_delova(model, df):
+    imena = model['koder'].get_feature_names_out()
+    X = model['koder'].transform(napravi_X_y(df)[0]).toarray()
+    return pd.DataFrame(X, columns=imena).filter(like='Deo_Grada_')
+
+
+def test_nepoznat_deo_grada_ide_u_ostalo():
+    # Svi delovi grada u treningu su česti, pa "retkih" nema; kolona OSTALO ipak postoji
+    model = _istreniran(_oglasi(["Liman 1", "Centar", "Detelinara"]))
+    nepoznat = _oglasi(["Nepoznato Naselje"], po_delu=1).assign(Deo_Grada=["Nepoznato Naselje"])
+    kolone = _kolone_delova(model, pd.concat([nepoznat, nepoznat.assign(Deo_Grada=np.nan)]))
+    assert f"Deo_Grada_{OSTALO}" in kolone.columns
+    assert (kolone[f"Deo_Grada_{OSTALO}"] == 1).all() and (kolone.sum(axis=1) == 1).all()
+    assert np.isfinite(model.predict(napravi_X_y(nepoznat)[0])).all()
+
+
+def test_redak_deo_grada_deli_kolonu_sa_nepoznatim():
+    df = pd.concat([_oglasi(["Liman 1", "Centar"]), _oglasi(["Klisa"], po_delu=1)], ignore_index=True)
+    model = _istreniran(df)
+    assert "Deo_Grada_Klisa" not in model['koder'].get_feature_names_out()
+    redak, nepoznat = df.tail(1), df.tail(1).assign(Deo_Grada="Nepoznato Naselje")
+    assert model.predict(napravi_X_y(redak)[0]) == pytest.approx(model.predict(napravi_X_y(nepoznat)[0]))
+
+
+def test_artefakt_predvidja_nepoznat_deo_grada(tmp_path):
+    df = _oglasi(["Liman 1", "Centar"])
+    verzija = sacuvaj_artefakt(_istreniran(df), {'mae': 0.0, 'r2': 1.0}, folder=str(tmp_path))
+    model, _, meta = ucitaj_artefakt(verzija, folder=str(tmp_path))
+    assert sorted(meta['vokabular_delova']) == ["Centar", "Liman 1"]
+    upit = df.head(2).assign(Deo_Grada=["Nepoznato Naselje", "Liman 1"])
+    assert np.isfinite(model.predict(napravi_X_y(upit)[0])).all()
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+import parseri
+from conftest import KOREN
+
+
+@pytest.fixture(scope="module")
+def stranica():
+    with open(os.path.join(KOREN, parseri.FIKSTURA), encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def referenca(stranica):
+    return parseri.parsiraj_html(stranica, 'bs4')
+
+
+def test_referentni_zapisi(referenca):
+    assert referenca
+    for zapis in referenca:
+        assert list(zapis) == parseri.KOLONE
+        assert zapis['Link'].startswith(parseri.SAJT)
+
+
+@pytest.mark.parametrize("backend", list(parseri.BACKENDI))
+def test_backend_daje_iste_zapise(stranica, referenca, backend):
+    assert parseri.parsiraj_html(stranica, backend) == referenca
+
+
+def test_prazna_stranica():
+    for backend in parseri.BACKENDI:
+        assert parseri.parsiraj_html("<html><body></body></html>", backend) == []
+
+
+def test_nepoznat_backend():
+    with pytest.raises(ValueError):
+        parseri.parsiraj_html("", "nepostojeci")
@@ -0,0 +1,122 @@
+import sqlite3
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import scraper
+from benchmark import OGLASA_PO_STRANICI
+from indeks_oglasa import IndeksOglasa
+
+
+def _inkrementalno(server, indeks, max_stranica=10):
+    with scraper.SerijskiUpis("dopuni", 1000, indeks) as pisac:
+        kompletno = scraper.prikupi_inkrementalno(server.base_url, max_stranica, indeks, pisac, 1, 1000)
+    return kompletno, pisac.ukupno
+
+
+def _u_indeksu(putanja):
+    with sqlite3.connect(putanja) as conn:
+        return conn.execute("SELECT COUNT(*) FROM oglasi").fetchone()[0]
+
+
+def test_inkrementalno_staje_na_vidjenoj_stranici(server, u_tmp):
+    with IndeksOglasa(u_tmp / "indeks.db") as indeks:
+        assert _inkrementalno(server, indeks) == (True, 3 * OGLASA_PO_STRANICI)
+        server.zahtevi.clear()
+        assert _inkrementalno(server, indeks) == (True, 0)
+    assert server.zahtevi == [1]
+
+
+def test_indeks_se_menja_tek_posle_upisa(server, u_tmp, monkeypatch):
+    def pad(*args, **kwargs):
+        raise RuntimeError("pad pre upisa")
+
+    with IndeksOglasa(u_tmp / "indeks.db") as indeks:
+        with monkeypatch.context() as m:
+            m.setattr(scraper, "sacuvaj_dataset", pad)
+            with pytest.raises(RuntimeError):
+                _inkrementalno(server, indeks)
+        assert _u_indeksu(u_tmp / "indeks.db") == 0
+        # Sledeći prolaz ne misli da su oglasi već viđeni
+        assert _inkrementalno(server, indeks) == (True, 3 * OGLASA_PO_STRANICI)
+    assert _u_indeksu(u_tmp / "indeks.db") == 3 * OGLASA_PO_STRANICI
+
+
+def test_stranice_ogranicava_inkrementalni_rezim(server, u_tmp, monkeypatch):
+    server.broj_stranica = 5
+    monkeypatch.setattr(sys, "argv", ["scraper.py", "--inkrementalno", "--stranice", "2", "--paralelno", "1",
+                                      "--rps", "1000", "--base-url", server.base_url])
+    scraper.main()
+    assert server.zahtevi == [1, 2]
+    assert _u_indeksu(u_tmp / "nekretnine_ns_indeks.db") == 2 * OGLASA_PO_STRANICI
+
+
+@pytest.fixture
+def pauze(monkeypatch):
+    """Backoff pauze scraper-a se beleže umesto da se čeka."""
+    zabelezene = []
+    monkeypatch.setattr(scraper, "time", SimpleNamespace(sleep=zabelezene.append, monotonic=time.monotonic))
+    return zabelezene
+
+
+def test_ponavlja_429_i_5xx_i_postuje_retry_after(server, pauze):
+    server.odgovori[1] = [(429, {"Retry-After": "7"}), (503, {})]
+    zapisi = scraper.parsiraj_stranicu(f"{server.base_url}?p=1", ogranicivac=scraper.OgranicivacBrzine(1000))
+    assert len(zapisi) == OGLASA_PO_STRANICI
+    assert server.zahtevi == [1, 1, 1]
+    # Retry-After (7 s) je duži od backoff-a prvog pokušaja (1-2 s); drugi pokušaj čeka 2-3 s
+    assert pauze[0] == 7 and 2 <= pauze[1] < 3
+
+
+def test_odustaje_posle_max_pokusaja(server, pauze):
+    server.odgovori[1] = [(500, {})] * scraper.MAX_POKUSAJA
+    assert scraper.preuzmi_html(f"{server.base_url}?p=1") is None
+    assert len(server.zahtevi) == scraper.MAX_POKUSAJA
+    assert len(pauze) == scraper.MAX_POKUSAJA - 1
+    assert all(b > a for a, b in zip(pauze, pauze[1:]))  # Eksponencijalni backoff
+
+
+def test_ne_ponavlja_404(server, pauze):
+    server.odgovori[1] = [(404, {})]
+    assert scraper.preuzmi_html(f"{server.base_url}?p=1") is None
+    assert server.zahtevi == [1] and not pauze
+
+
+def test_ponavlja_odbijenu_konekciju(server, pauze):
+    url = f"{server.base_url}?p=1"
+    server.shutdown()
+    server.server_close()
+    assert scraper.preuzmi_html(url) is None
+    assert len(pauze) == scraper.MAX_POKUSAJA - 1
+
+
+def test_prazna_stranica_nije_neuspela(server, pauze):
+    ogranicivac = scraper.OgranicivacBrzine(1000)
+    assert scraper.parsiraj_stranicu(f"{server.base_url}?p=4", ogranicivac=ogranicivac) == []
+    server.odgovori[2] = [(503, {})] * scraper.MAX_POKUSAJA
+    assert scraper.parsiraj_stranicu(f"{server.base_url}?p=2", ogranicivac=ogranicivac) is None
+
+
+def test_neuspela_stranica_prekida_inkrementalni_prolaz(server, pauze, u_tmp, monkeypatch):
+    server.odgovori[2] = [(503, {})] * scraper.MAX_POKUSAJA
+    monkeypatch.setattr(sys, "argv", ["scraper.py", "--inkrementalno", "--paralelno", "1", "--rps", "1000",
+                                      "--base-url", server.base_url])
+    with pytest.raises(SystemExit) as izlaz:
+        scraper.main()
+    assert izlaz.value.code == 1
+    # Upisana je samo prva stranica; druga nije kraj paginacije, pa treća nije ni tražena
+    assert 3 not in server.zahtevi
+    assert _u_indeksu(u_tmp / "nekretnine_ns_indeks.db") == OGLASA_PO_STRANICI
+
+
+def test_ogranicivac_brzine(server):
+    server.broj_stranica = 6
+    urls = [f"{server.base_url}?p={i}" for i in range(1, 7)]
+    pocetak = time.monotonic()
+    rezultati = list(scraper.preuzmi_stranice(urls, paralelno=4, po_sekundi=10))
+    trajanje = time.monotonic() - pocetak
+    assert [len(r) for r in rezultati] == [OGLASA_PO_STRANICI] * 6
+    # Nalet od NALET zahteva odmah, ostali po 10 u sekundi
+    assert trajanje >= (6 - scraper.NALET) / 10 - 0.02
@@ -0,0 +1,62 @@
+import gzip
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+
+import scraper_pipeline
+from benchmark import OGLASA_PO_STRANICI, sinteticka_stranica
+from dataset_io import KOLONA_PARTICIJE, danasnji_datum, ucitaj_dataset
+
+
+def _spool(folder, broj, datum):
+    os.makedirs(folder, exist_ok=True)
+    putanja = os.path.join(folder, f"stranica_{broj:05d}.html.gz")
+    with gzip.open(putanja, 'wt', encoding='utf-8') as f:
+        f.write(sinteticka_stranica(broj))
+    vreme = time.mktime(time.strptime(datum, "%Y-%m-%d")) + 12 * 3600
+    os.utime(putanja, (vreme, vreme))
+
+
+def test_pokreni_puni_dataset_i_indeks(server, u_tmp):
+    urls = [f"{server.base_url}?p={i}" for i in range(1, 4)]
+    assert scraper_pipeline.pokreni(urls, po_sekundi=1000, procesa=2) == 3 * OGLASA_PO_STRANICI
+    df = ucitaj_dataset(scraper_pipeline.IZLAZNI_DATASET)
+    assert set(df[KOLONA_PARTICIJE]) == {danasnji_datum()}
+    with sqlite3.connect(u_tmp / "nekretnine_ns_indeks.db") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM oglasi").fetchone()[0] == 3 * OGLASA_PO_STRANICI
+
+
+def test_reparsiranje_ne_dira_druge_dane(server, u_tmp):
+    urls = [f"{server.base_url}?p={i}" for i in range(1, 3)]
+    scraper_pipeline.pokreni(urls, po_sekundi=1000, procesa=2)
+    _spool("spool", 1, "2024-03-01")
+    _spool("spool", 2, "2024-03-02")
+    assert scraper_pipeline.reparsiraj_spool("spool", procesa=2) == 2 * OGLASA_PO_STRANICI
+    po_danu = ucitaj_dataset(scraper_pipeline.IZLAZNI_DATASET)[KOLONA_PARTICIJE].value_counts().to_dict()
+    assert po_danu == {danasnji_datum(): 2 * OGLASA_PO_STRANICI, "2024-03-01": OGLASA_PO_STRANICI,
+                       "2024-03-02": OGLASA_PO_STRANICI}
+
+
+def test_dani_u_vise_serija(u_tmp):
+    for broj, datum in ((1, "2024-03-01"), (2, "2024-03-01"), (3, "2024-03-02")):
+        _spool("spool", broj, datum)
+    # Serije od 5 zapisa: svaki dan stiže u više serija, a "dan" ga menja samo u prvoj
+    pisac = scraper_pipeline.PisacZapisa(velicina=5)
+    stavke = [('fajl', os.path.join("spool", f"stranica_{broj:05d}.html.gz")) for broj in (1, 2, 3)]
+    try:
+        scraper_pipeline.obradi_tok(stavke, pisac, procesa=2)
+    finally:
+        pisac.zatvori()
+    po_danu = ucitaj_dataset(scraper_pipeline.IZLAZNI_DATASET)[KOLONA_PARTICIJE].value_counts().to_dict()
+    assert po_danu == {"2024-03-01": 2 * OGLASA_PO_STRANICI, "2024-03-02": OGLASA_PO_STRANICI}
+
+
+def test_bez_podataka_izlazi_sa_greskom(u_tmp, monkeypatch):
+    os.makedirs("prazan")
+    monkeypatch.setattr(sys, "argv", ["scraper_pipeline.py", "--iz-spoola", "prazan", "--procesa", "1"])
+    with pytest.raises(SystemExit) as izlaz:
+        scraper_pipeline.main()
+    assert izlaz.value.code == 1
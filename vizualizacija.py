@@ -1,43 +1,67 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-
-# --- UČITAVANJE I PRIPREMA (Isto kao malopre) ---
-df = pd.read_csv("nekretnine_ns_geo.csv")
-df = df.dropna(subset=['Latitude', 'Longitude', 'Cena_EUR', 'Kvadratura_m2'])
-df = df[df['Cena_EUR'] > 10000]
-
-X = df[['Kvadratura_m2', 'Latitude', 'Longitude', 'Deo_Grada']]
-X = pd.get_dummies(X, columns=['Deo_Grada'], drop_first=True)
-y = df['Cena_EUR']
-
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-model = RandomForestRegressor(n_estimators=100, random_state=42)
-model.fit(X_train, y_train)
-predikcije = model.predict(X_test)
-
-# --- VIZUELIZACIJA ---
-plt.figure(figsize=(15, 6))
-
-# GRAFIKON 1: Stvarna vs Predviđena cena
-plt.subplot(1, 2, 1)
-sns.scatterplot(x=y_test, y=predikcije, color='blue', alpha=0.6)
-# Idealna linija (gde bi tačkice bile da je model savršen)
-plt.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], 'r--', lw=2)
-plt.xlabel("Stvarna Cena (EUR)")
-plt.ylabel("Predviđena Cena (EUR)")
-plt.title(f"Preciznost Modela (R2: {model.score(X_test, y_test):.2f})")
-plt.grid(True)
-
-# GRAFIKON 2: Šta najviše utiče na cenu?
-plt.subplot(1, 2, 2)
-importances = pd.Series(model.feature_importances_, index=X.columns).sort_values(ascending=False).head(10)
-sns.barplot(x=importances, y=importances.index, palette="viridis")
-plt.xlabel("Uticaj na cenu (0-1)")
-plt.title("Top faktori koji određuju cenu")
-
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from ml_model import napravi_X_y, podeli, ucitaj_podatke
+from model_artefakt import predict, ucitaj_artefakt
+
+
+def podaci_modela():
+    """
+    Isti podaci i isti test set kao u ml_model.py, ali bez treniranja: model se učitava iz artefakta.
+    Vraća (y_test, predikcije, r2, uticaji obeležja) ili None ako nema podataka.
+    """
+    df = ucitaj_podatke()
+    if df is None:
+        return None
+    X, y = napravi_X_y(df)
+    X_train, X_test, y_train, y_test = podeli(X, y)
+
+    model, _, meta = ucitaj_artefakt()
+    if meta.get('broj_redova') != len(df):
+        print("UPOZORENJE: dataset se promenio od treniranja, test set nije isti. Pokreni ponovo ml_model.py.")
+    if meta.get('metrike_od', meta['verzija']) != meta['verzija']:
+        # azuriranje_modela.py ne ponavlja pun test, pa je R2 onaj sa poslednjeg punog treninga
+        mae_novi = meta['metrike'].get('mae_novi_posle')
+        print(f"UPOZORENJE: model je dopunjen novim stablima; R2 je sa treninga verzije {meta['metrike_od']}"
+              + (f", MAE na izdvojenim novim oglasima je {mae_novi:,.0f} EUR." if mae_novi is not None else "."))
+    predikcije = predict(df.loc[X_test.index])
+    uticaji = pd.Series(model['model'].feature_importances_, index=meta['obelezja'])
+    return y_test, predikcije, meta['metrike']['r2'], uticaji
+
+
+def nacrtaj_preciznost(ax, y_test, predikcije, r2):
+    """GRAFIKON 1: Stvarna vs Predviđena cena"""
+    sns.scatterplot(x=y_test, y=predikcije, color='blue', alpha=0.6, ax=ax)
+    # Idealna linija (gde bi tačkice bile da je model savršen)
+    ax.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], 'r--', lw=2)
+    ax.set_xlabel("Stvarna Cena (EUR)")
+    ax.set_ylabel("Predviđena Cena (EUR)")
+    ax.set_title(f"Preciznost Modela (R2: {r2:.2f})")
+    ax.grid(True)
+
+
+def nacrtaj_faktore(ax, uticaji):
+    """GRAFIKON 2: Šta najviše utiče na cenu?"""
+    uticaji = uticaji.sort_values(ascending=False).head(10)
+    sns.barplot(x=uticaji.values, y=uticaji.index, hue=uticaji.index, palette="viridis", legend=False, ax=ax)
+    ax.set_xlabel("Uticaj na cenu (0-1)")
+    ax.set_title("Top faktori koji određuju cenu")
+
+
+def main():
+    podaci = podaci_modela()
+    if podaci is None:
+        return
+    y_test, predikcije, r2, uticaji = podaci
+
+    # --- VIZUELIZACIJA ---
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    nacrtaj_preciznost(ax1, y_test, predikcije, r2)
+    nacrtaj_faktore(ax2, uticaji)
+    fig.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()